@@ -0,0 +1,96 @@
+"""AQI computation throughput: per-row ``Series.apply`` vs ``delhi_aq.aqi``.
+
+* before: the notebook's ``compute_aqi_pm25`` / ``aqi_category`` via ``Series.apply``
+  (timed on a sample and extrapolated; a full 10M-row run takes minutes)
+* after:  ``sub_index`` + ``aqi_category``, and ``compute_aqi`` over all seven pollutants
+
+Checks that both give identical AQI and categories on the sample first.
+
+Usage:
+    python benchmarks/bench_aqi.py [--rows 10000000] [--sample 200000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.aqi import BREAKPOINTS, POLLUTANTS, aqi_category, compute_aqi, sub_index
+
+
+def compute_aqi_pm25(pm25):
+    if pd.isna(pm25):
+        return np.nan
+    breakpoints = [
+        (0,   30,   0,   50),
+        (30,  60,   51,  100),
+        (60,  90,   101, 200),
+        (90,  120,  201, 300),
+        (120, 250,  301, 400),
+        (250, 500,  401, 500),
+    ]
+    for bp_lo, bp_hi, aqi_lo, aqi_hi in breakpoints:
+        if bp_lo <= pm25 <= bp_hi:
+            return round(((aqi_hi - aqi_lo) / (bp_hi - bp_lo)) * (pm25 - bp_lo) + aqi_lo)
+    return 500
+
+
+def aqi_category_row(aqi):
+    if pd.isna(aqi):   return np.nan
+    if aqi <= 50:      return "Good"
+    if aqi <= 100:     return "Satisfactory"
+    if aqi <= 200:     return "Moderate"
+    if aqi <= 300:     return "Poor"
+    if aqi <= 400:     return "Very Poor"
+    return "Severe"
+
+
+def synthetic(n, pollutant, rng):
+    top = BREAKPOINTS[pollutant][-1]
+    values = rng.gamma(2.0, top / 8, n)
+    values[rng.random(n) < 0.02] = np.nan
+    return values
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--sample", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    pm25 = pd.Series(synthetic(args.rows, "pm25", rng))
+    sample = pm25[:args.sample]
+
+    before_aqi, t_aqi = timed(lambda: sample.apply(compute_aqi_pm25))
+    before_cat, t_cat = timed(lambda: before_aqi.apply(aqi_category_row))
+    after_aqi = sub_index(sample)
+    assert np.array_equal(before_aqi.to_numpy("float64"), after_aqi.to_numpy(), equal_nan=True)
+    assert (before_cat.fillna("").to_numpy(object) == aqi_category(after_aqi).astype(object).fillna("").to_numpy()).all()
+    before = (t_aqi + t_cat) * args.rows / args.sample
+
+    aqi, t_sub = timed(lambda: sub_index(pm25))
+    _, t_vcat = timed(lambda: aqi_category(aqi))
+
+    frame = pd.DataFrame({p: synthetic(args.rows, p, rng) for p in POLLUTANTS})
+    _, t_all = timed(lambda: compute_aqi(frame, min_pollutants=3))
+
+    print(f"{args.rows:,} rows (identical results on a {args.sample:,}-row sample)\n")
+    print(f"before  apply (PM2.5 AQI + category, extrapolated)   {before:8.2f} s")
+    print(f"after   sub_index + aqi_category (PM2.5)             {t_sub + t_vcat:8.2f} s"
+          f"   ({before / (t_sub + t_vcat):,.0f}x)")
+    print(f"after   compute_aqi, 7 pollutants + max + category   {t_all:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
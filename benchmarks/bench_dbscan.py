@@ -0,0 +1,89 @@
+"""DBSCAN parameter grid: one ``DBSCAN.fit`` per setting vs ``delhi_aq.clustering.dbscan_grid``.
+
+The six standardized notebook features from ``master_daily``, optionally
+repeated ``--scale`` times with small jitter to mimic station-level data.
+
+* before: ``DBSCAN(eps, min_samples).fit_predict`` + silhouette/Davies-Bouldin
+  per setting (timed on ``--sample-settings`` settings and extrapolated)
+* after:  ``dbscan_grid`` over the full grid from one shared neighbor index
+
+Usage:
+    python benchmarks/bench_dbscan.py [--scale 1] [--eps-min 0.3] [--eps-max 2.5] [--eps-step 0.1]
+    python benchmarks/bench_dbscan.py --scale 100 --eps-min 0.1 --eps-max 0.5 --eps-step 0.02
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from sklearn.cluster import DBSCAN
+from sklearn.metrics import davies_bouldin_score, silhouette_score
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.aggregates import KMEANS_FEATURES
+from delhi_aq.clustering import DBSCAN_SILHOUETTE_SAMPLE, NeighborIndex, dbscan_grid, feature_matrix
+from delhi_aq.paths import DATA_DIR
+from delhi_aq.storage import read_dataset
+
+
+def features(scale, seed=0):
+    X = feature_matrix(read_dataset("master_daily", DATA_DIR), KMEANS_FEATURES).values
+    if scale > 1:
+        rng = np.random.default_rng(seed)
+        X = np.repeat(X, scale, axis=0) + rng.normal(0, 0.05, (len(X) * scale, X.shape[1]))
+    return X
+
+
+def before(X, eps, min_samples, seed=0):
+    labels = DBSCAN(eps=eps, min_samples=min_samples).fit_predict(X)
+    mask = labels != -1
+    if len(np.unique(labels[mask])) > 1:
+        sample = min(mask.sum(), DBSCAN_SILHOUETTE_SAMPLE) if len(X) > DBSCAN_SILHOUETTE_SAMPLE else None
+        silhouette_score(X[mask], labels[mask], sample_size=sample, random_state=seed)
+        davies_bouldin_score(X[mask], labels[mask])
+    return labels
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--eps-min", type=float, default=0.3)
+    parser.add_argument("--eps-max", type=float, default=2.5)
+    parser.add_argument("--eps-step", type=float, default=0.1)
+    parser.add_argument("--min-samples", type=int, nargs=2, default=(3, 20), metavar=("LO", "HI"))
+    parser.add_argument("--sample-settings", type=int, default=6)
+    args = parser.parse_args()
+
+    X = features(args.scale)
+    eps_values = np.round(np.arange(args.eps_min, args.eps_max + args.eps_step / 2, args.eps_step), 4)
+    ms_values = range(args.min_samples[0], args.min_samples[1] + 1)
+    settings = [(e, m) for e in eps_values for m in ms_values]
+    print(f"{len(X):,} rows x {X.shape[1]} features, {len(settings)} settings "
+          f"(eps {eps_values[0]}..{eps_values[-1]}, min_samples {ms_values.start}..{ms_values.stop - 1})\n")
+
+    rng = np.random.default_rng(1)
+    picked = [settings[i] for i in rng.choice(len(settings), args.sample_settings, replace=False)]
+    t0 = time.perf_counter()
+    refs = [before(X, e, m) for e, m in picked]
+    per_fit = (time.perf_counter() - t0) / len(picked)
+
+    t0 = time.perf_counter()
+    index = NeighborIndex(X, max(ms_values))
+    grid = dbscan_grid(X, eps_values, ms_values, index=index)
+    t_grid = time.perf_counter() - t0
+
+    same = all(np.array_equal(ref, index.labels(e, m)) for ref, (e, m) in zip(refs, picked))
+    print(f"{'run':<36}{'seconds':>10}")
+    print(f"{'one DBSCAN fit + scores (mean)':<36}{per_fit:10.3f}")
+    print(f"{'all settings, one fit each (extrap.)':<36}{per_fit * len(settings):10.1f}")
+    print(f"{'dbscan_grid (shared index)':<36}{t_grid:10.1f}")
+    print(f"\nper setting: {t_grid / len(settings) * 1000:.1f} ms; "
+          f"labels identical to DBSCAN on sampled settings: {'yes' if same else 'NO'}")
+    best = grid.dropna(subset=["silhouette"]).sort_values("silhouette", ascending=False).head(3)
+    print(f"\ntop settings by silhouette:\n{best.to_string(index=False)}")
+
+
+if __name__ == "__main__":
+    main()
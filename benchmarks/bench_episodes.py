@@ -0,0 +1,98 @@
+"""Streaming episode detection: replay throughput, per-update latency, and the batch alternative.
+
+* replay: ``delhi_aq.episodes.replay`` over the city AQI (``master_daily``)
+  and over every station's PM2.5 AQI (``station_daily``), the latter
+  repeated ``--copies`` times as extra stations; readings/s and events
+* latency: one ``EpisodeDetector.update`` per new day (p50/p99 µs)
+  vs what a new day costs today: a ``DBSCAN(eps=1.5, min_samples=5)`` refit
+  over the whole history, as in ``Model_implementation.ipynb``
+* check: with ``min_readings=1, end_after=1`` and no gap limit, the replayed
+  episodes must be exactly the runs of consecutive readings >= Very Poor
+  found by a vectorized pandas pass
+
+Usage:
+    python benchmarks/bench_episodes.py [--copies 1 10 100]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.aggregates import KMEANS_FEATURES
+from delhi_aq.aqi import sub_index
+from delhi_aq.clustering import feature_matrix
+from delhi_aq.episodes import VERY_POOR, EpisodeDetector, replay
+from delhi_aq.paths import DATA_DIR, DATA_DIR_PROCESSED
+from delhi_aq.storage import read_dataset
+
+
+def station_aqi(copies):
+    daily = read_dataset("station_daily", DATA_DIR_PROCESSED, columns=["location_id", "parameter", "date", "value"])
+    pm25 = daily[daily["parameter"] == "pm25"]
+    frame = pd.DataFrame({"location_id": pm25["location_id"], "date": pm25["date"],
+                          "aqi": sub_index(pm25["value"], "pm25")})
+    offset = 10 ** len(str(frame["location_id"].max()))
+    return pd.concat([frame.assign(location_id=frame["location_id"] + k * offset) for k in range(copies)],
+                     ignore_index=True)
+
+
+def batch_runs(frame, value_col="aqi"):
+    """Runs of consecutive non-missing readings >= VERY_POOR: (start, end, readings, peak)."""
+    readings = frame.dropna(subset=[value_col]).sort_values("date")
+    above = readings[value_col] >= VERY_POOR
+    run_id = (above != above.shift()).cumsum()[above]
+    runs = readings[above].groupby(run_id).agg(start=("date", "first"), end=("date", "last"),
+                                               readings=("date", "size"), peak_aqi=(value_col, "max"))
+    return runs.reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    master = read_dataset("master_daily", DATA_DIR)
+
+    print(f"{'stream':<26}{'readings':>11}{'ms':>9}{'readings/s':>13}{'starts':>8}{'ends':>7}{'spikes':>8}")
+    streams = [("city AQI", master, None)] + [(f"station PM2.5 AQI x{c}", station_aqi(c), "location_id")
+                                              for c in args.copies]
+    for name, frame, key_col in streams:
+        result = replay(frame, key_col=key_col)
+        kinds = result.events["kind"].value_counts()
+        print(f"{name:<26}{result.readings:>11,}{result.seconds * 1000:9.1f}{result.readings_per_second:13,.0f}"
+              f"{kinds.get('start', 0):>8}{kinds.get('end', 0):>7}{kinds.get('spike', 0):>8}")
+
+    detector = EpisodeDetector()
+    latencies = []
+    for when, aqi in zip(master["date"].tolist(), master["aqi"].to_numpy(dtype="float64").tolist()):
+        t0 = time.perf_counter()
+        detector.update(when, aqi)
+        latencies.append(time.perf_counter() - t0)
+    p50, p99 = np.percentile(np.array(latencies) * 1e6, [50, 99])
+
+    from sklearn.cluster import DBSCAN
+
+    X = feature_matrix(master, KMEANS_FEATURES).values
+    refits = []
+    for _ in range(5):
+        t0 = time.perf_counter()
+        DBSCAN(eps=1.5, min_samples=5).fit(X)
+        refits.append(time.perf_counter() - t0)
+    print(f"\nper new day: detector update p50 {p50:.1f} µs, p99 {p99:.1f} µs; "
+          f"DBSCAN refit over {len(X):,} days {np.median(refits) * 1000:.1f} ms")
+
+    strict = replay(master, detector=EpisodeDetector(min_readings=1, end_after=1, max_gap=pd.Timedelta.max))
+    streamed = strict.episodes[["start", "end", "readings", "peak_aqi"]]
+    # The history may end inside an episode; only closed ones are compared.
+    reference = batch_runs(master).iloc[:len(streamed)]
+    same = streamed.astype({"peak_aqi": "float64"}).equals(reference.astype({"peak_aqi": "float64"}))
+    print(f"streamed episodes == vectorized runs ({len(streamed)} closed episodes): {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Rain-event recovery (VIZ 9): per-(event, offset) table scans vs ``delhi_aq.events``.
+
+* before: the notebook loop, ``master[master["date"] == target]`` per event and offset
+* after:  ``threshold_events`` + ``event_study`` on master, then a station-level
+  run on synthetic data and a multi-threshold ``threshold_sweep``
+
+Usage:
+    python benchmarks/bench_events.py [--stations 200] [--years 10] [--thresholds 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.events import event_study, threshold_events, threshold_sweep
+from delhi_aq.loader import load_master
+
+
+def before(master):
+    rain_days = master[master["precipitation"] > 5]["date"].values
+    before_after = []
+    for rain_date in rain_days:
+        for offset in range(-5, 6):
+            target = pd.Timestamp(rain_date) + pd.Timedelta(days=offset)
+            row    = master[master["date"] == target]
+            if not row.empty:
+                before_after.append({"offset": offset, "aqi": row["aqi"].values[0]})
+    return pd.DataFrame(before_after).groupby("offset")["aqi"].agg(["mean", "std"]).reset_index()
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stations", type=int, default=200)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--thresholds", type=int, default=50)
+    args = parser.parse_args()
+
+    master = load_master()
+    ref, t_before = timed(lambda: before(master))
+    curve, t_after = timed(lambda: event_study(master, "aqi", threshold_events(master, "precipitation", 5)))
+    diff = np.abs(ref["mean"].to_numpy() - curve["mean"].to_numpy()).max()
+    print(f"master ({len(master)} days), rain > 5 mm, ±5 days")
+    print(f"  before  {t_before * 1000:9.1f} ms")
+    print(f"  after   {t_after * 1000:9.1f} ms   ({t_before / t_after:,.0f}x, max |Δmean| {diff:.1e})\n")
+
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2016-01-01", periods=args.years * 365, freq="D")
+    stations = pd.DataFrame({
+        "date":       np.tile(days.to_numpy(), args.stations),
+        "station_id": np.repeat(np.arange(args.stations), len(days)),
+        "pm25":       rng.gamma(2.0, 60.0, args.stations * len(days)),
+    }).sample(frac=0.9, random_state=0)                  # ~10% missing station-days
+    weather = pd.DataFrame({"date": days, "precipitation": rng.exponential(3.0, len(days))})
+
+    events = threshold_events(weather, "precipitation", 5)
+    _, t_station = timed(lambda: event_study(stations, "pm25", events, by="station_id"))
+    print(f"station-level: {args.stations} stations x {len(days)} days ({len(stations):,} rows), "
+          f"{len(events)} events x {args.stations} stations")
+    print(f"  event_study           {t_station * 1000:9.1f} ms")
+
+    thresholds = np.linspace(1, 30, args.thresholds)
+    merged = stations.merge(weather, on="date")
+    _, t_sweep = timed(lambda: threshold_sweep(merged, "pm25", "precipitation", thresholds, by="station_id"))
+    print(f"  threshold_sweep x{args.thresholds:<3} {t_sweep * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Page payload and server time of the Data Exploration figures: HTML embeds vs JSON specs.
+
+Expects a figures directory holding both ``<name>.html`` (old ``write_html``
+output) and ``<name>.json`` (``export_figure`` output) for the figures in the
+app, e.g. produced by running the notebook's visualization cells.
+
+* payload: bytes pushed to the browser per page view. Each standalone HTML
+  file inlines plotly.js; JSON specs are drawn by the frontend's single,
+  browser-cached plotly.js bundle.
+* server:  time to produce the figure payloads for one rerun (old: read each
+  HTML file; new: memoized ``load_figure`` + the JSON encoding
+  ``st.plotly_chart`` performs).
+
+Usage:
+    python benchmarks/bench_figures.py [--figures-dir data/figures] [--reruns 20]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.figures import load_figure
+from delhi_aq.paths import FIGURES_DIR
+
+
+def rerun_html(names, figures_dir):
+    total = 0
+    for name in names:
+        with open(os.path.join(figures_dir, f"{name}.html"), encoding="utf-8") as f:
+            total += len(f.read().encode("utf-8"))
+    return total
+
+
+def rerun_json(names, figures_dir):
+    total = 0
+    for name in names:
+        total += len(json.dumps(load_figure(name, figures_dir)).encode("utf-8"))
+    return total
+
+
+def timed(fn, reruns):
+    timings = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        payload = fn()
+        timings.append(time.perf_counter() - t0)
+    return payload, statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--figures-dir", default=FIGURES_DIR)
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    names = sorted(
+        f[:-5] for f in os.listdir(args.figures_dir)
+        if f.endswith(".json") and os.path.exists(os.path.join(args.figures_dir, f[:-5] + ".html"))
+    )
+    if not names:
+        sys.exit(f"No figures with both .html and .json in {args.figures_dir}")
+
+    html_bytes, html_ms = timed(lambda: rerun_html(names, args.figures_dir), args.reruns)
+    json_bytes, json_ms = timed(lambda: rerun_json(names, args.figures_dir), args.reruns)
+
+    print(f"{len(names)} figures")
+    print(f"html embeds: {html_bytes / 1e6:8.2f} MB per page view | {html_ms:7.2f} ms server per rerun")
+    print(f"json specs:  {json_bytes / 1e6:8.2f} MB per page view | {json_ms:7.2f} ms server per rerun")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""AQI forecasting: walk-forward backtest time, forecast skill and inference latency.
+
+* backtest: ``delhi_aq.forecast.backtest`` over yearly folds 2018..2025 on
+  ``master_daily``, inline (``--workers 1``) and in the process pool (default:
+  one worker per core)
+* skill: MAE per horizon vs. persistence (every horizon = today's AQI)
+* inference: ``Forecaster.predict`` (features for the last ``LOOKBACK_DAYS``)
+  vs. rebuilding features over the full history for the same origin
+
+Usage:
+    python benchmarks/bench_forecast.py [--workers N] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.forecast import backtest, daily_calendar, fit_forecaster, forecast_features, horizon_matrix
+from delhi_aq.paths import DATA_DIR
+from delhi_aq.storage import read_dataset
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def full_history_predict(model, frame):
+    """The forecast from the last day, with features rebuilt over every day of ``frame``."""
+    row = forecast_features(daily_calendar(frame)).iloc[[-1]]
+    return np.array([row["level"].iloc[0] + model.models[h].predict(horizon_matrix(row, h).to_numpy())[0]
+                     for h in sorted(model.models)])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    master = read_dataset("master_daily", DATA_DIR)
+    print(f"{len(master):,} days, {master['date'].min():%Y-%m-%d}..{master['date'].max():%Y-%m-%d}, "
+          f"{os.cpu_count()} CPU(s)\n")
+
+    inline, t_inline = timed(lambda: backtest(master, max_workers=1))
+    pooled, t_pool = timed(lambda: backtest(master, max_workers=args.workers))
+    model, t_fit = timed(lambda: fit_forecaster(master))
+    print(f"{'run':<36}{'seconds':>9}")
+    print(f"{'backtest, folds inline':<36}{t_inline:9.1f}")
+    print(f"{'backtest, folds in process pool':<36}{t_pool:9.1f}")
+    print(f"{'fit_forecaster (all history)':<36}{t_fit:9.1f}")
+    print(f"identical predictions: {'yes' if inline.predictions.equals(pooled.predictions) else 'NO'}\n")
+
+    print(pooled.metrics.round(3).to_string(index=False))
+
+    tail = [timed(lambda: model.predict(master))[1] for _ in range(args.repeat)]
+    full = [timed(lambda: full_history_predict(model, master))[1] for _ in range(args.repeat)]
+    same = np.allclose(model.predict(master)["aqi"], full_history_predict(model, master))
+    print(f"\n7-horizon forecast latency (median of {args.repeat}): "
+          f"tail window {np.median(tail) * 1000:.1f} ms, full history {np.median(full) * 1000:.1f} ms; "
+          f"same forecast: {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Gap-filling on synthetic station-level hourly data: notebook idioms vs ``delhi_aq.impute``.
+
+* before: ``groupby(...).transform(lambda ...)`` for per-sensor interpolation and
+  mean, ``DataFrame.apply(axis=1)`` for the same-month median (timed on a
+  sample and extrapolated)
+* after:  the matching ``delhi_aq.impute`` strategies
+
+Usage:
+    python benchmarks/bench_impute.py [--sensors 200] [--years 10] [--missing 0.05]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.impute import climatology, group_mean, interpolate, seasonal_median
+
+
+def synthetic(sensors, years, missing, seed=0):
+    rng = np.random.default_rng(seed)
+    hours = pd.date_range("2016-01-01", periods=years * 8760, freq="h")
+    n = sensors * len(hours)
+    value = rng.gamma(2.0, 60.0, n)
+    value[rng.random(n) < missing] = np.nan
+    for start in rng.integers(0, n, n // 5000):        # multi-day outages
+        value[start:start + rng.integers(24, 24 * 14)] = np.nan
+    return pd.DataFrame({
+        "date":      np.tile(hours.to_numpy(), sensors),
+        "sensor_id": np.repeat(np.arange(sensors), len(hours)),
+        "value":     value,
+    })
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def before_month_median(df):
+    df = df.assign(month=df["date"].dt.month)
+    monthly = df.groupby("month")["value"].median()
+    return df.apply(lambda row: monthly[row["month"]] if pd.isna(row["value"]) else row["value"], axis=1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sensors", type=int, default=200)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--missing", type=float, default=0.05)
+    parser.add_argument("--sample", type=int, default=200_000)
+    args = parser.parse_args()
+
+    df = synthetic(args.sensors, args.years, args.missing)
+    sample = df[:args.sample]
+    print(f"{len(df):,} hourly rows, {args.sensors} sensors, {df['value'].isna().mean():.1%} missing\n")
+    print(f"{'strategy':<34}{'before s':>10}{'after s':>10}{'same':>6}")
+
+    by_sensor_month = [df["sensor_id"], df["date"].dt.month]
+    cases = [
+        ("interpolate(limit=6, by=sensor)",
+         lambda: df.groupby("sensor_id")["value"].transform(lambda x: x.interpolate(method="linear", limit=6)),
+         lambda: interpolate(df, "value", limit=6, by="sensor_id")),
+        ("group_mean(by=sensor)",
+         lambda: df.groupby("sensor_id")["value"].transform(lambda x: x.fillna(x.mean())),
+         lambda: group_mean(df, "value", "sensor_id")),
+        ("climatology(by=sensor, month)",
+         lambda: df.groupby(by_sensor_month)["value"].transform(lambda x: x.fillna(x.mean())),
+         lambda: climatology(df, "value", by="sensor_id", period="month")),
+    ]
+    for label, before, after in cases:
+        ref, t_before = timed(before)
+        out, t_after = timed(after)
+        same = np.array_equal(ref.to_numpy(), out.to_numpy(), equal_nan=True)
+        print(f"{label:<34}{t_before:10.2f}{t_after:10.2f}{'yes' if same else 'NO':>6}")
+
+    ref, t_sample = timed(lambda: before_month_median(sample))
+    same = np.array_equal(ref.to_numpy("float64"), seasonal_median(sample, "value").to_numpy(), equal_nan=True)
+    _, t_after = timed(lambda: seasonal_median(df, "value"))
+    print(f"{'seasonal_median (apply extrap.)':<34}{t_sample * len(df) / len(sample):10.2f}{t_after:10.2f}"
+          f"{'yes' if same else 'NO':>6}")
+
+    _, t_clim = timed(lambda: climatology(df, "value", by="sensor_id", period=["month", "hour"]))
+    print(f"{'climatology(month x hour)':<34}{'':>10}{t_clim:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
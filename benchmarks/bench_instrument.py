@@ -0,0 +1,97 @@
+"""Cost of the app's timing instrumentation, disabled and enabled.
+
+* per call: a ``timer`` block, a ``timed`` call and a ``section`` mark with
+  no rerun open (the default), against the bare operation
+* per page: ``website/webapp.py`` rerun through ``streamlit.testing``, with
+  timing off and on (``instrument.ENABLED``). The disabled overhead is the
+  number of instrumented calls the page makes (counted from an enabled run)
+  times their per-call cost, as a share of the rerun. The enabled column is
+  the measured difference of the medians, so on a busy machine it is mostly
+  noise.
+
+Usage:
+    python benchmarks/bench_instrument.py [--reruns 7] [--calls 1000000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from bench_pages import PAGES, REPO_ROOT
+from streamlit.navigation.page import calc_hash
+from streamlit.testing.v1 import AppTest
+
+sys.path.insert(0, REPO_ROOT)
+
+from delhi_aq import instrument
+
+
+def per_call(fn, calls):
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - t0) / calls
+
+
+def noop(_=None):
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reruns", type=int, default=7)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    wrapped = instrument.timed(noop)
+
+    def in_timer():
+        with instrument.timer("x"):
+            pass
+
+    base = per_call(noop, args.calls)
+    costs = {
+        "timer block": per_call(in_timer, args.calls),
+        "timed call":  per_call(lambda: wrapped("x"), args.calls) - per_call(lambda: noop("x"), args.calls),
+        "section":     per_call(lambda: instrument.section("x"), args.calls) - base,
+    }
+    print("disabled, per call (ns): " + ", ".join(f"{k} {v * 1e9:.0f}" for k, v in costs.items()))
+    worst = max(costs.values())
+
+    # Keep the reruns the app closes, to count the instrumented calls of each page.
+    closed = []
+    end_rerun = instrument.end_rerun
+
+    def capture(*a, **kw):
+        rerun = end_rerun(*a, **kw)
+        closed.append(rerun)
+        return rerun
+
+    instrument.end_rerun = capture
+
+    os.chdir(REPO_ROOT)
+    at = AppTest.from_file(os.path.join(REPO_ROOT, "website", "webapp.py"), default_timeout=300)
+    at.run()
+
+    print(f"\n{'page':>14}{'off ms':>10}{'on ms':>10}{'calls':>7}{'disabled overhead':>19}{'enabled':>9}")
+    for page in PAGES:
+        at._page_hash = calc_hash(page)
+        at.run()   # warm the page's loads
+        timings = {}
+        for enabled in (False, True) * 2:
+            instrument.ENABLED = enabled
+            for _ in range(args.reruns):
+                t0 = time.perf_counter()
+                at.run()
+                timings.setdefault(enabled, []).append(time.perf_counter() - t0)
+        instrument.ENABLED = False
+
+        calls = len(closed[-1].timings)
+        off_ms, on_ms = statistics.median(timings[False]) * 1000, statistics.median(timings[True]) * 1000
+        disabled = calls * worst * 1000 / off_ms
+        print(f"{page:>14}{off_ms:10.1f}{on_ms:10.1f}{calls:>7}{disabled:18.4%}{on_ms / off_ms - 1:+9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""K-Means k sweep: the notebook loop vs ``delhi_aq.clustering.kmeans_sweep``.
+
+* before: ``KMeans(n_clusters=k).fit`` for each k in turn, then
+  ``silhouette_score`` on the full matrix
+* after:  ``kmeans_sweep`` cold (process pool, sampled silhouette) and warm
+  (every model loaded from the cache)
+
+Usage:
+    python benchmarks/bench_kmeans.py [--rows 20000] [--features 6] [--n-init 4] [--workers N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.clustering import feature_matrix, kmeans_sweep
+
+
+def synthetic(rows, features, centers=4, seed=0):
+    rng = np.random.default_rng(seed)
+    means = rng.normal(0, 4, (centers, features))
+    labels = rng.integers(0, centers, rows)
+    return pd.DataFrame(means[labels] + rng.normal(size=(rows, features)),
+                        columns=[f"f{i}" for i in range(features)])
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def before(X, ks, n_init, seed):
+    rows = []
+    for k in ks:
+        model = KMeans(n_clusters=k, random_state=seed, n_init=n_init).fit(X)
+        rows.append({"k": k, "inertia": model.inertia_, "silhouette": silhouette_score(X, model.labels_)})
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--features", type=int, default=6)
+    parser.add_argument("--n-init", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    ks = range(2, 11)
+    frame = synthetic(args.rows, args.features)
+    data = feature_matrix(frame, list(frame.columns))
+    print(f"{args.rows:,} rows x {args.features} features, k = 2..10, n_init={args.n_init}, "
+          f"{args.workers or os.cpu_count()} workers\n")
+
+    ref, t_before = timed(lambda: before(data.values, ks, args.n_init, 42))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cold, t_cold = timed(lambda: kmeans_sweep(data, ks, n_init=args.n_init, max_workers=args.workers,
+                                                  cache_dir=cache_dir))
+        warm, t_warm = timed(lambda: kmeans_sweep(data, ks, n_init=args.n_init, cache_dir=cache_dir))
+
+    print(f"{'run':<32}{'seconds':>10}")
+    print(f"{'sequential + full silhouette':<32}{t_before:10.2f}")
+    print(f"{'kmeans_sweep (cold)':<32}{t_cold:10.2f}")
+    print(f"{'kmeans_sweep (cached)':<32}{t_warm:10.2f}")
+    print(f"\nsame inertia: {'yes' if np.array_equal(ref['inertia'], cold['inertia']) else 'NO'}; "
+          f"max |silhouette estimate - exact|: {np.abs(ref['silhouette'] - cold['silhouette']).max():.4f}; "
+          f"warm run cached: {warm['cached'].all()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Rerun latency of the webapp data-loading path, before vs after the shared loader.
+
+Simulates N concurrent Streamlit sessions, each performing several reruns. A
+rerun loads the master dataset twice (Introduction + Data Exploration tabs):
+
+* before: ``pd.read_csv`` + ``pd.to_datetime`` in each tab, every rerun
+* after:  ``delhi_aq.loader.load_master()`` in each tab
+
+Usage:
+    python benchmarks/bench_loader.py [--sessions 50] [--reruns 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq import loader
+from delhi_aq.paths import MASTER_CSV
+
+
+def rerun_before():
+    for _ in range(2):
+        master = pd.read_csv(MASTER_CSV)
+        master["date"] = pd.to_datetime(master["date"])
+
+
+def rerun_after():
+    for _ in range(2):
+        loader.load_master()
+
+
+def session(rerun, reruns):
+    timings = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        rerun()
+        timings.append(time.perf_counter() - t0)
+    return timings
+
+
+def run(rerun, sessions, reruns):
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(lambda _: session(rerun, reruns), range(sessions)))
+    wall = time.perf_counter() - t0
+    timings = sorted(t for r in results for t in r)
+    return {
+        "p50_ms": statistics.median(timings) * 1000,
+        "p95_ms": timings[int(len(timings) * 0.95) - 1] * 1000,
+        "max_ms": timings[-1] * 1000,
+        "wall_s": wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    loader.clear_cache()
+    for label, rerun in [("before", rerun_before), ("after", rerun_after)]:
+        stats = run(rerun, args.sessions, args.reruns)
+        print(f"{label:>6}: p50 {stats['p50_ms']:8.2f} ms | p95 {stats['p95_ms']:8.2f} ms | "
+              f"max {stats['max_ms']:8.2f} ms | wall {stats['wall_s']:6.2f} s "
+              f"({args.sessions} sessions x {args.reruns} reruns)")
+
+
+if __name__ == "__main__":
+    main()
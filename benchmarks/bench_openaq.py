@@ -0,0 +1,110 @@
+"""OpenAQ ingestion throughput (sensors/second) against the local mock server.
+
+* before: the notebook's threaded ``requests`` fetch (10 workers, sequential
+  pages per sensor, no rate limiting; errors are printed and the sensor dropped)
+* after:  ``delhi_aq.openaq.fetch_sensors_daily`` with the limiter sized to the
+  mock's quota
+
+Both runs fetch the same sensors and date range; the rows column shows whether
+anything was lost to 429s.
+
+Usage:
+    python benchmarks/bench_openaq.py [--sensors 80] [--days 3650] [--latency 0.02] [--quota 200]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mock_openaq import make_app, start_server
+
+from delhi_aq.openaq import RateLimiter, fetch_sensors_daily
+
+START_DATE = "2015-01-01"
+
+
+def sensors(n):
+    return [{"sensor_id": 2000 + i, "location_id": 1000 + i // 2,
+             "location_name": f"Mock Station {i // 2}", "parameter": ("pm25", "pm10")[i % 2]}
+            for i in range(n)]
+
+
+def fetch_threaded(base_url, rows_in, date_from, date_to):
+    """The previous notebook implementation, parameterized on ``base_url``."""
+    def fetch(row):
+        out, page = [], 1
+        while True:
+            params = {"date_from": date_from, "date_to": date_to, "limit": 1000, "page": page}
+            try:
+                resp = requests.get(f"{base_url}/sensors/{row['sensor_id']}/days", params=params, timeout=30)
+                results = resp.json().get("results", [])
+                if not results:
+                    break
+                out.extend(results)
+                if len(results) < 1000:
+                    break
+                page += 1
+            except Exception:
+                break
+        return out
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        return sum(len(r) for r in executor.map(fetch, rows_in))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sensors", type=int, default=80)
+    parser.add_argument("--days", type=int, default=3650)
+    parser.add_argument("--latency", type=float, default=0.02, help="mock server latency per request (s)")
+    parser.add_argument("--quota", type=int, default=200, help="mock server requests per second")
+    args = parser.parse_args()
+
+    date_to = (date.fromisoformat(START_DATE) + timedelta(days=args.days - 1)).isoformat()
+    rows_in = sensors(args.sensors)
+    expected = args.sensors * args.days
+
+    loop = asyncio.new_event_loop()
+    app = make_app(latency=args.latency, quota=(args.quota, 1.0))
+    runner, base_url = loop.run_until_complete(start_server(app))
+    server = threading.Thread(target=loop.run_forever, daemon=True)
+    server.start()
+
+    print(f"{args.sensors} sensors × {args.days} days, mock latency {args.latency * 1000:.0f} ms, "
+          f"quota {args.quota} req/s\n")
+    print(f"{'':<10}{'seconds':>10}{'sensors/s':>12}{'rows':>10}{'of':>10}{'429s':>8}")
+
+    state = app["state"]
+    throttled = state["throttled"]
+    t0 = time.perf_counter()
+    rows = fetch_threaded(base_url, rows_in, START_DATE, date_to)
+    elapsed = time.perf_counter() - t0
+    print(f"{'before':<10}{elapsed:10.2f}{args.sensors / elapsed:12.1f}{rows:10}{expected:10}"
+          f"{state['throttled'] - throttled:8}")
+
+    time.sleep(1.0)  # let the mock's quota window reset
+    throttled = state["throttled"]
+    result = asyncio.run(fetch_sensors_daily(
+        rows_in, START_DATE, date_to, base_url=base_url,
+        limiter=RateLimiter([(args.quota, 1.0)]), sensor_concurrency=20, max_connections=50,
+    ))
+    print(f"{'after':<10}{result.elapsed:10.2f}{result.sensors_per_second:12.1f}{len(result.rows):10}"
+          f"{expected:10}{state['throttled'] - throttled:8}")
+    if result.failures:
+        print(f"\n{len(result.failures)} failed pages")
+
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+
+
+if __name__ == "__main__":
+    main()
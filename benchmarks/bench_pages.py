@@ -0,0 +1,57 @@
+"""First-paint time and per-rerun CPU of the Streamlit app, per page.
+
+Runs ``website/webapp.py`` headlessly with ``streamlit.testing`` and reports,
+for every registered page, wall time and process CPU time of a rerun. The
+first run of the process is reported separately as the cold first paint
+(module imports + first data load + default page).
+
+Usage:
+    python benchmarks/bench_pages.py [--script website/webapp.py] [--reruns 5]
+
+Pointing ``--script`` at a single-script version of the app (no
+``st.navigation``) reports the cost of one full rerun instead.
+"""
+import argparse
+import os
+import statistics
+import time
+
+from streamlit.navigation.page import calc_hash
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["introduction", "proposal", "exploration", "models", "conclusion", "team"]
+
+
+def timed_run(at):
+    wall, cpu = time.perf_counter(), time.process_time()
+    at.run()
+    return time.perf_counter() - wall, time.process_time() - cpu
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--script", default=os.path.join(REPO_ROOT, "website", "webapp.py"))
+    parser.add_argument("--reruns", type=int, default=5)
+    args = parser.parse_args()
+
+    # The app resolves images/ and data/ relative to the repository root.
+    os.chdir(REPO_ROOT)
+    at = AppTest.from_file(os.path.abspath(args.script), default_timeout=300)
+
+    wall, cpu = timed_run(at)
+    print(f"cold first paint: {wall * 1000:8.1f} ms wall | {cpu * 1000:8.1f} ms CPU")
+
+    uses_navigation = "render_introduction" in open(args.script, encoding="utf-8").read()
+    targets = PAGES if uses_navigation else ["<all tabs>"]
+
+    for page in targets:
+        if uses_navigation:
+            at._page_hash = calc_hash(page)
+        runs = [timed_run(at) for _ in range(args.reruns)]
+        print(f"{page:>14}: rerun {statistics.median(r[0] for r in runs) * 1000:8.1f} ms wall | "
+              f"{statistics.median(r[1] for r in runs) * 1000:8.1f} ms CPU")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Association rules on the notebook's binned columns: mlxtend vs ``delhi_aq.patterns``.
+
+* before: ``pd.get_dummies`` + ``mlxtend.apriori`` + ``association_rules``, then
+  the top 10 by lift
+* after:  ``encode`` + ``frequent_itemsets`` + ``top_rules`` (and the full rule
+  count via the streaming ``iter_rules``)
+
+``--scale`` repeats the daily rows with their bins shuffled within each
+column, so supports and itemset counts grow like station-level data would.
+
+Usage:
+    python benchmarks/bench_patterns.py [--supports 0.05 0.02 0.01 0.005] [--scale 1]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from mlxtend.frequent_patterns import apriori
+from mlxtend.frequent_patterns import association_rules as mlxtend_rules
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.paths import DATA_DIR
+from delhi_aq.patterns import encode, frequent_itemsets, iter_rules, top_rules
+from delhi_aq.storage import read_dataset
+
+COLUMNS = ["pm10_bin", "pm25_bin", "temp_bin", "wind_bin", "humidity_bin", "precip_bin", "season", "aqi_category"]
+
+
+def binned(scale=1, seed=0):
+    """The Model_implementation binning of ``master_daily``."""
+    df = read_dataset("master_daily", DATA_DIR)
+    out = pd.DataFrame({
+        "pm10_bin":     pd.cut(df["pm10_avg"], [0, 50, 100, 150, 200, 500]),
+        "pm25_bin":     pd.cut(df["pm25_avg"], [0, 30, 60, 90, 120, 500]),
+        "temp_bin":     pd.cut(df["temp_mean"], [-10, 20, 30, 50]),
+        "wind_bin":     pd.cut(df["wind_speed_mean"], [0, 5, 10, 50]),
+        "humidity_bin": pd.cut(df["humidity_mean"], [0, 30, 60, 100]),
+        "precip_bin":   pd.cut(df["precipitation"], [-1, 0, 5, 20, 100]),
+        "season":       df["season"],
+        "aqi_category": df["aqi_category"],
+    }).astype("object").fillna("Unknown").astype("str")
+    if scale > 1:
+        rng = np.random.default_rng(seed)
+        copies = [out] + [out.apply(lambda c: c.sample(frac=1, random_state=rng.integers(1 << 31)).to_numpy())
+                          for _ in range(scale - 1)]
+        out = pd.concat(copies, ignore_index=True)
+    return out
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def before(frame, min_support):
+    itemsets = apriori(pd.get_dummies(frame), min_support=min_support, use_colnames=True)
+    rules = mlxtend_rules(itemsets, metric="confidence", min_threshold=0.6)
+    return itemsets, rules.sort_values("lift", ascending=False).head(10)
+
+
+def after(frame, min_support):
+    itemsets = frequent_itemsets(encode(frame, COLUMNS), min_support)
+    return itemsets, top_rules(itemsets, 10, by="lift", min_confidence=0.6)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--supports", type=float, nargs="+", default=[0.05, 0.02, 0.01, 0.005])
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--skip-before-below", type=float, default=0.0,
+                        help="don't run mlxtend for supports below this")
+    args = parser.parse_args()
+
+    frame = binned(args.scale)
+    print(f"{len(frame):,} rows x {len(COLUMNS)} columns\n")
+    print(f"{'min_support':>11}{'itemsets':>10}{'rules':>9}{'mlxtend s':>11}{'bitset s':>10}{'same':>6}")
+    for s in args.supports:
+        (items, top), t_after = timed(lambda: after(frame, s))
+        n_rules = sum(1 for _ in iter_rules(items, 0.6))
+        if s < args.skip_before_below:
+            print(f"{s:>11}{len(items):>10}{n_rules:>9}{'-':>11}{t_after:10.2f}")
+            continue
+        (ref_items, ref_top), t_before = timed(lambda: before(frame, s))
+        same = len(ref_items) == len(items) and np.allclose(ref_top["lift"].to_numpy(), top["lift"].to_numpy())
+        print(f"{s:>11}{len(items):>10}{n_rules:>9}{t_before:11.2f}{t_after:10.2f}{'yes' if same else 'NO':>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""AQI prediction: notebook-style encoding vs ``AQIPredictor``, and HTTP latency of the service.
+
+Rows are drawn (with replacement) from ``master_daily``; the models are the
+ones registered in ``data/models`` by ``Model_implementation.ipynb``.
+
+* before: ``pd.cut`` + ``pd.Categorical`` + ``pd.get_dummies`` + scikit-learn
+  ``predict`` per batch, as in the notebook
+* after:  ``AQIPredictor.predict`` (searchsorted bins, direct one-hot fill,
+  leaf-table lookup)
+* http:   ``POST /predict`` against ``delhi_aq.service`` under uvicorn on a
+  local port: p50/p99 latency and rows/s per batch size, for both body forms
+  (``rows``: one object per row, ``columns``: one array per feature). Bodies
+  are serialized once up front, so the timings are the service's, not the
+  client's JSON encoding.
+
+Usage:
+    python benchmarks/bench_predict.py [--batches 1 100 1000 5000 10000] [--requests 200]
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.paths import DATA_DIR
+from delhi_aq.predict import FEATURE_BINS, INPUT_COLS, AQIPredictor
+from delhi_aq.storage import read_dataset
+
+TARGET_P99_MS = 50
+
+
+def sample_rows(n, seed=0):
+    df = read_dataset("master_daily", DATA_DIR)
+    return df.sample(n, replace=True, random_state=seed).reset_index(drop=True)[["date", "season"] + INPUT_COLS]
+
+
+def before(predictor, frame):
+    X = pd.DataFrame({f: pd.cut(frame[col], edges, labels=labels) for f, (col, edges, labels) in FEATURE_BINS.items()})
+    X["season"] = frame["season"]
+    for col in X:
+        X[col] = pd.Categorical(X[col])
+        if "Unknown" not in X[col].cat.categories:
+            X[col] = X[col].cat.add_categories("Unknown")
+        X[col] = X[col].fillna("Unknown")
+    X = pd.get_dummies(X).reindex(columns=predictor.feature_names, fill_value=False)
+    category = predictor.classes[predictor.tree.predict(X)]
+    numeric = frame[predictor.regression_cols].fillna(dict(zip(predictor.regression_cols, predictor.fill_values)))
+    return category, predictor.regression.predict(numeric)
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return np.array(times) * 1000
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def serve(port):
+    import uvicorn
+    from delhi_aq.service import create_app
+
+    server = uvicorn.Server(uvicorn.Config(create_app(), host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def payloads(frame):
+    """Request bodies (``rows`` and ``columns`` form) for ``frame``, readings rounded as a client would send them."""
+    frame = frame.round({col: 2 for col in INPUT_COLS})
+    frame = frame.assign(date=frame["date"].dt.strftime("%Y-%m-%d"), season=frame["season"].astype(str))
+    frame = frame.astype(object).where(frame.notna(), None)
+    return {"rows":    json.dumps({"rows": frame.to_dict(orient="records")}),
+            "columns": json.dumps({"columns": frame.to_dict(orient="list")})}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 100, 1000, 5000, 10000])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    predictor = AQIPredictor.from_registry()
+    frames = {n: sample_rows(n, seed=n) for n in args.batches}
+
+    print("in-process (median ms per batch)\n")
+    print(f"{'rows':>7}{'notebook':>11}{'vectorized':>12}{'speedup':>9}{'same':>6}")
+    for n, frame in frames.items():
+        repeat = max(5, min(50, 50_000 // n))
+        t_before = np.median(timed(lambda: before(predictor, frame), repeat))
+        t_after = np.median(timed(lambda: predictor.predict(frame), repeat))
+        ref_category, ref_aqi = before(predictor, frame)
+        out = predictor.predict(frame)
+        same = (out["aqi_category"].to_numpy() == ref_category).all() and np.allclose(out["aqi"], ref_aqi)
+        print(f"{n:>7}{t_before:11.2f}{t_after:12.2f}{t_before / t_after:8.1f}x{'yes' if same else 'NO':>6}")
+
+    import httpx
+
+    port = free_port()
+    server = serve(port)
+    print(f"\nHTTP POST /predict, {args.requests} requests per batch size (target p99 < {TARGET_P99_MS} ms)\n")
+    print(f"{'rows':>7}{'body':>9}{'p50 ms':>9}{'p99 ms':>9}{'rows/s':>12}{'ok':>5}")
+    headers = {"content-type": "application/json"}
+    with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=30, headers=headers) as client:
+        for n, frame in frames.items():
+            for form, body in payloads(frame).items():
+                client.post("/predict", content=body).raise_for_status()  # warm-up
+                latencies = timed(lambda: client.post("/predict", content=body).raise_for_status(), args.requests)
+                p50, p99 = np.percentile(latencies, [50, 99])
+                ok = "yes" if p99 < TARGET_P99_MS else "no"
+                print(f"{n:>7}{form:>9}{p50:9.2f}{p99:9.2f}{n / (latencies.mean() / 1000):12,.0f}{ok:>5}")
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""IDW surface cube: per-day weights vs weights shared by each set of reporting stations.
+
+* per day: for every day, find each cell's nearest reporting stations and
+  weight them (vectorized over cells, one pass per day)
+* shared:  ``delhi_aq.spatial.interpolate``, one weight matrix per distinct
+  set of reporting stations and one matrix product for all of its days
+
+Both build the full 2016-2025 cube from ``station_daily``. The table also shows
+the grid size, how far the two results differ, and the size of the quantized
+``.npz`` against the raw float32 cube.
+
+Usage:
+    python benchmarks/bench_spatial.py [--steps 0.02 0.01 0.005] [--parameter pm25]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.paths import DATA_DIR_PROCESSED
+from delhi_aq.spatial import (IDW_POWER, NEIGHBORS, build_cube, cube_path, delhi_grid,
+                              distance_km, interpolate, write_cube)
+from delhi_aq.stations import DELHI_BOUNDS, StationStore
+from delhi_aq.storage import dataset_path
+
+
+def per_day(values, dist, power=IDW_POWER, neighbors=NEIGHBORS):
+    out = np.full((len(values), dist.shape[0]), np.nan, dtype="float32")
+    for i, row in enumerate(values):
+        ok = ~np.isnan(row)
+        if not ok.any():
+            continue
+        d = dist[:, ok]
+        k = min(neighbors, ok.sum())
+        nearest = np.argsort(d, axis=1)[:, :k]
+        w = 1.0 / np.maximum(np.take_along_axis(d, nearest, axis=1), 1e-3) ** power
+        out[i] = (w * row[ok][nearest]).sum(axis=1) / w.sum(axis=1)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=float, nargs="+", default=[0.02, 0.01, 0.005])
+    parser.add_argument("--parameter", default="pm25")
+    args = parser.parse_args()
+
+    store = StationStore.from_parquet(dataset_path("station_daily", DATA_DIR_PROCESSED))
+    rows = store.query(DELHI_BOUNDS, parameter=args.parameter)
+    wide = rows.pivot(index="date", columns="location_id", values="value").asfreq("D")
+    stations = store.stations.set_index("location_id").loc[wide.columns]
+    values = wide.to_numpy(dtype="float64")
+    patterns = len(np.unique(~np.isnan(values), axis=0))
+    print(f"{args.parameter}: {len(wide):,} days, {wide.shape[1]} stations, {patterns} distinct sets of reporting "
+          f"stations\n")
+
+    print(f"{'step':>6}{'cells':>8}{'per day s':>11}{'shared s':>10}{'speedup':>9}{'max diff':>10}"
+          f"{'build_cube s':>14}{'raw MB':>8}{'npz MB':>8}")
+    for step in args.steps:
+        lat, lon = delhi_grid(step)
+        dist = distance_km(lat, lon, stations["lat"], stations["lon"])
+        t0 = time.perf_counter()
+        slow = per_day(values, dist)
+        t_slow = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        fast = interpolate(values, dist)
+        t_fast = time.perf_counter() - t0
+        diff = np.nanmax(np.abs(slow - fast))
+
+        t0 = time.perf_counter()
+        cube = build_cube(store, args.parameter, step=step)
+        t_build = time.perf_counter() - t0
+        with tempfile.TemporaryDirectory() as tmp:
+            write_cube(cube, tmp)
+            npz_mb = os.path.getsize(cube_path(args.parameter, tmp)) / 1e6
+        print(f"{step:>6}{dist.shape[0]:>8,}{t_slow:11.2f}{t_fast:10.2f}{t_slow / t_fast:8.1f}x{diff:10.1e}"
+              f"{t_build:14.2f}{cube.values.nbytes / 1e6:8.1f}{npz_mb:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
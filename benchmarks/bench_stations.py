@@ -0,0 +1,111 @@
+"""Station-level queries: full scans vs ``StationStore``'s per-series index.
+
+The station-day table (``station_daily``) is replicated ``--copies`` times
+with new location ids and jittered coordinates to stand in for a denser
+network. For each query the full scan is a boolean mask over every row (what
+the notebook's pandas filtering does); the indexed path is
+``StationStore.query`` / ``StationStore.history``:
+
+* bbox:    the stations in a box around central Delhi, one month, PM2.5
+* history: one station's full series, both pollutants
+* parquet: reading one station from disk, whole file + mask vs a
+  ``location_id`` filter that prunes row groups
+
+Usage:
+    python benchmarks/bench_stations.py [--copies 1 10 100] [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.paths import DATA_DIR_PROCESSED
+from delhi_aq.stations import ROW_GROUP_ROWS, STORE_KEY, StationStore
+from delhi_aq.storage import read_dataset, write_dataset
+
+BBOX = {"lat_min": 28.55, "lat_max": 28.70, "lon_min": 77.10, "lon_max": 77.25}
+START, END = pd.Timestamp("2019-11-01"), pd.Timestamp("2019-11-30")
+
+
+def replicate(daily, copies, seed=0):
+    """``daily`` plus ``copies - 1`` copies with new location ids and coordinates moved up to ~2 km."""
+    rng = np.random.default_rng(seed)
+    ids = daily["location_id"].unique()
+    offset = 10 ** len(str(ids.max()))
+    parts = [daily]
+    for k in range(1, copies):
+        jitter = pd.DataFrame({"location_id": ids, "dlat": rng.uniform(-0.02, 0.02, len(ids)),
+                               "dlon": rng.uniform(-0.02, 0.02, len(ids))})
+        part = daily.merge(jitter, on="location_id")
+        part = part.assign(location_id=part["location_id"] + k * offset,
+                           lat=part["lat"] + part["dlat"], lon=part["lon"] + part["dlon"])
+        parts.append(part.drop(columns=["dlat", "dlon"]))
+    return pd.concat(parts, ignore_index=True)
+
+
+def median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return np.median(times) * 1000
+
+
+def scan_bbox(frame):
+    mask = (frame["lat"].between(BBOX["lat_min"], BBOX["lat_max"])
+            & frame["lon"].between(BBOX["lon_min"], BBOX["lon_max"])
+            & (frame["date"] >= START) & (frame["date"] <= END) & (frame["parameter"] == "pm25"))
+    return frame[mask]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    daily = read_dataset("station_daily", DATA_DIR_PROCESSED)
+    station = int(daily["location_id"].value_counts().idxmax())
+
+    print(f"{'copies':>7}{'rows':>11}{'query':>9}{'scan ms':>10}{'index ms':>10}{'speedup':>9}{'rows out':>10}{'same':>6}")
+    for copies in args.copies:
+        frame = replicate(daily, copies)
+        t0 = time.perf_counter()
+        store = StationStore(frame)
+        t_build = time.perf_counter() - t0
+        frame = store.frame  # the same sorted rows, so both paths return them in the same order
+        repeat = max(3, args.repeat // copies)
+
+        cases = {
+            "bbox":    (lambda: scan_bbox(frame),
+                        lambda: store.query(BBOX, START, END, "pm25")),
+            "history": (lambda: frame[frame["location_id"] == station],
+                        lambda: store.history(station)),
+        }
+        for name, (scan, indexed) in cases.items():
+            t_scan, t_index = median_ms(scan, repeat), median_ms(indexed, repeat)
+            ref, out = scan(), indexed()
+            same = ref.reset_index(drop=True).equals(out)
+            print(f"{copies:>7}{len(frame):>11,}{name:>9}{t_scan:10.2f}{t_index:10.2f}"
+                  f"{t_scan / t_index:8.1f}x{len(out):>10,}{'yes' if same else 'NO':>6}")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            write_dataset(frame, "station_daily", tmp, csv=False, sort_by=STORE_KEY, row_group_size=ROW_GROUP_ROWS)
+            t_full = median_ms(lambda: (lambda df: df[df["location_id"] == station])(
+                read_dataset("station_daily", tmp)), repeat)
+            t_pruned = median_ms(lambda: read_dataset("station_daily", tmp,
+                                                      filters=[("location_id", "==", station)]), repeat)
+        print(f"{copies:>7}{len(frame):>11,}{'parquet':>9}{t_full:10.2f}{t_pruned:10.2f}{t_full / t_pruned:8.1f}x"
+              f"{'':>10}{'':>6}")
+        print(f"{'':>7}{'':>11}{'(index build ' + f'{t_build * 1000:.0f} ms)':>28}")
+
+
+if __name__ == "__main__":
+    main()
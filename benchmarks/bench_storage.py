@@ -0,0 +1,67 @@
+"""Read speed and on-disk size of the datasets: CSV (+ dtype/date parsing) vs Parquet.
+
+For every dataset that exists in both formats, times a typed full read
+(CSV: ``pd.read_csv`` + ``pd.to_datetime``, as the notebooks did; Parquet:
+``read_dataset``), plus a projected/filtered Parquet read of two columns for
+winter days since 2020.
+
+Usage:
+    python benchmarks/bench_storage.py [--repeat 10]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.paths import DATA_DIR, DATA_DIR_PROCESSED, DATA_DIR_RAW
+from delhi_aq.schema import DATASET_DTYPES
+from delhi_aq.storage import dataset_path, parse_dates, read_dataset
+
+
+def timed_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return statistics.median(timings) * 1000
+
+
+def read_csv(path):
+    df = pd.read_csv(path)
+    df["date"] = parse_dates(df["date"])
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'dataset':<36}{'csv KB':>9}{'pq KB':>9}{'csv ms':>9}{'pq ms':>9}")
+    for directory in (DATA_DIR, DATA_DIR_RAW, DATA_DIR_PROCESSED):
+        for name in DATASET_DTYPES:
+            csv_path = dataset_path(name, directory, "csv")
+            pq_path = dataset_path(name, directory)
+            if not (os.path.exists(csv_path) and os.path.exists(pq_path)):
+                continue
+            csv_ms = timed_ms(lambda: read_csv(csv_path), args.repeat)
+            pq_ms = timed_ms(lambda: read_dataset(name, directory), args.repeat)
+            label = os.path.relpath(pq_path, DATA_DIR)[:-len(".parquet")]
+            print(f"{label:<36}{os.path.getsize(csv_path) / 1024:9.0f}{os.path.getsize(pq_path) / 1024:9.0f}"
+                  f"{csv_ms:9.2f}{pq_ms:9.2f}")
+
+    pushdown_ms = timed_ms(lambda: read_dataset(
+        "master_daily", DATA_DIR, columns=["date", "aqi"],
+        filters=[("date", ">=", "2020-01-01"), ("season", "==", "Winter")],
+    ), args.repeat)
+    print(f"\nmaster_daily, 2 columns, winter since 2020 (projection + pushdown): {pushdown_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
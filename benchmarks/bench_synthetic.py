@@ -0,0 +1,54 @@
+"""Synthetic data generator: throughput and memory of ``SyntheticDelhi.write`` as the data grows.
+
+For each (stations, interval) size, writes the full synthetic dataset
+(``openaq_raw`` streamed to Parquet + CSV, weather, trends, stations; no CPCB
+Excel) to a temporary directory and reports rows, seconds, rows/s, file sizes
+and the process's peak RSS so far. Sizes run smallest first, so a flat peak
+RSS column means ``openaq_raw`` is streamed rather than built in memory.
+
+Usage:
+    python benchmarks/bench_synthetic.py [--sizes 30:D 300:D 30:h 300:h] [--years 10]
+"""
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq.storage import dataset_path
+from delhi_aq.synthetic import SyntheticDelhi
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", nargs="+", default=["30:D", "300:D", "30:h", "300:h"],
+                        help="stations:interval pairs")
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    end = f"{2016 + args.years - 1}-12-31"
+    print(f"{'stations':>9}{'freq':>5}{'rows':>14}{'s':>8}{'rows/s':>12}{'parquet MB':>12}{'csv MB':>9}"
+          f"{'peak RSS MB':>13}")
+    for size in args.sizes:
+        stations, freq = size.split(":")
+        with tempfile.TemporaryDirectory() as out:
+            t0 = time.perf_counter()
+            rows = SyntheticDelhi(int(stations), "2016-01-01", end, freq, args.seed).write(out, cpcb=False)
+            seconds = time.perf_counter() - t0
+            n = rows["openaq_raw"]
+            parquet_mb = os.path.getsize(dataset_path("openaq_raw", out)) / 1e6
+            csv_mb = os.path.getsize(dataset_path("openaq_raw", out, "csv")) / 1e6
+        print(f"{stations:>9}{freq:>5}{n:>14,}{seconds:8.1f}{n / seconds:12,.0f}{parquet_mb:12.1f}{csv_mb:9.1f}"
+              f"{peak_rss_mb():13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Local mock of the OpenAQ v3 endpoints used by ``delhi_aq.openaq``.
+
+Serves ``/v3/locations`` and ``/v3/sensors/{id}/days`` with deterministic
+synthetic values, real pagination (``meta.found``), a per-request latency and
+its own request quota that answers HTTP 429 + ``Retry-After`` when exceeded.
+A fraction of requests can also fail with 503 to exercise retries.
+
+Run standalone and point the client at it:
+    python benchmarks/mock_openaq.py --port 8089
+    fetch_sensors_daily(..., base_url="http://127.0.0.1:8089/v3")
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+
+from aiohttp import web
+
+DELHI_CENTER = (28.64, 77.10)
+
+
+def make_app(n_locations=40, latency=0.02, quota=None, error_rate=0.0, seed=0):
+    """``quota`` is ``(requests, per_seconds)``; ``None`` disables the mock's own limit."""
+    rng = random.Random(seed)
+    state = {"window_start": time.monotonic(), "count": 0, "served": 0, "throttled": 0, "errors": 0}
+
+    async def gate(request):
+        await asyncio.sleep(latency)
+        if quota is not None:
+            limit, per = quota
+            now = time.monotonic()
+            if now - state["window_start"] >= per:
+                state.update(window_start=now, count=0)
+            state["count"] += 1
+            if state["count"] > limit:
+                state["throttled"] += 1
+                retry = per - (now - state["window_start"])
+                return web.json_response({"detail": "Too many requests"}, status=429,
+                                         headers={"Retry-After": f"{retry:.3f}"})
+        if error_rate and rng.random() < error_rate:
+            state["errors"] += 1
+            return web.json_response({"detail": "Service unavailable"}, status=503)
+        state["served"] += 1
+        return None
+
+    def page_of(items, request):
+        limit = int(request.query.get("limit", 100))
+        page = int(request.query.get("page", 1))
+        return items[(page - 1) * limit: page * limit]
+
+    async def locations(request):
+        if (resp := await gate(request)) is not None:
+            return resp
+        items = []
+        for i in range(n_locations):
+            items.append({
+                "id": 1000 + i,
+                "name": f"Mock Station {i}",
+                "coordinates": {"latitude": DELHI_CENTER[0] + (i % 7 - 3) * 0.03,
+                                "longitude": DELHI_CENTER[1] + (i % 5 - 2) * 0.04},
+                "sensors": [
+                    {"id": 2 * (1000 + i), "parameter": {"name": "pm25"}},
+                    {"id": 2 * (1000 + i) + 1, "parameter": {"name": "pm10"}},
+                ],
+            })
+        return web.json_response({"meta": {"found": len(items)}, "results": page_of(items, request)})
+
+    async def sensor_days(request):
+        if (resp := await gate(request)) is not None:
+            return resp
+        sensor_id = int(request.match_info["sensor_id"])
+        start = date.fromisoformat(request.query["date_from"][:10])
+        end = date.fromisoformat(request.query["date_to"][:10])
+        limit = int(request.query.get("limit", 100))
+        page = int(request.query.get("page", 1))
+        n_days = (end - start).days + 1
+        first = (page - 1) * limit
+        results = []
+        for k in range(first, min(first + limit, n_days)):
+            day = start + timedelta(days=k)
+            value = 60 + (sensor_id * 37 + k * 11) % 240 + ((k % 365) > 300) * 150
+            results.append({
+                "value": float(value),
+                "period": {"datetimeFrom": {"utc": f"{day.isoformat()}T00:00:00Z"}},
+            })
+        return web.json_response({"meta": {"found": n_days}, "results": results})
+
+    app = web.Application()
+    app["state"] = state
+    app.router.add_get("/v3/locations", locations)
+    app.router.add_get("/v3/sensors/{sensor_id}/days", sensor_days)
+    return app
+
+
+async def start_server(app, host="127.0.0.1", port=0):
+    """Start ``app`` in the running loop; returns ``(runner, base_url)``."""
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{port}/v3"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--locations", type=int, default=40)
+    args = parser.parse_args()
+    web.run_app(make_app(args.locations, args.latency), host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+"""End-to-end benchmark suite: pipeline stages, model fits and page renders, with a history.
+
+Every stage runs on synthetic inputs built from the real datasets and scaled
+to ``--scales`` times their size (``master_daily``'s 2,964 rows -> 1x, 10x,
+100x, 1000x). A copy is one more synthetic site: the same calendar, a new
+``site`` (and ``sensor_id``) key, and pollutant/weather values jittered by a
+few percent, so group-bys, merges and models see realistic cardinalities.
+
+* load:    ``read_dataset`` of the scaled master from Parquet
+* aqi:     ``sub_index`` + ``aqi_category`` over the PM2.5 column
+* impute:  the collection notebook's plans, ``group_mean`` per sensor on
+  ``openaq_raw`` and ``interpolate`` + ``seasonal_median`` per site on
+  ``air_quality_daily``
+* merge:   the notebook's master build: CPCB rows appended, weather and
+  Google Trends joined on date, year/month/season added
+* fit:     each model of ``Model_implementation.ipynb``: Categorical NB and
+  decision tree on the binned features, K-Means (k=3, with its sampled
+  silhouette), DBSCAN(eps=1.5, min_samples=5), linear regression, apriori
+* render:  every page of ``website/webapp.py`` through ``streamlit.testing``
+  (1x only: the app reads the datasets on disk); just the default page when
+  this Streamlit version offers no way to select the others
+
+DBSCAN's neighborhoods grow with the copies, so its cost is quadratic in the
+scale; it stops at ``MAX_SCALE`` (10x, about 10 s on one core).
+
+Each run appends one JSON line per (stage, scale) to ``--history``
+(``benchmarks/results/history.jsonl`` by default, not committed: timings only
+compare on the same machine) and prints the change against the previous run of
+the same stage and scale on this host. A stage more than ``--tolerance``
+slower is flagged; ``--fail-on-regression`` turns that into exit status 1.
+
+Usage:
+    python benchmarks/suite.py [--scales 1 10 100] [--stages load aqi fit:kmeans render] [--repeat 3]
+    python benchmarks/suite.py --scales 1000 --stages load aqi impute merge
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from bench_pages import PAGES
+
+from delhi_aq.aggregates import KMEANS_FEATURES
+from delhi_aq.aqi import aqi_category, sub_index
+from delhi_aq.clustering import feature_matrix, silhouette
+from delhi_aq.impute import impute
+from delhi_aq.paths import DATA_DIR, DATA_DIR_PROCESSED, DATA_DIR_RAW
+from delhi_aq.patterns import association_rules, encode, frequent_itemsets
+from delhi_aq.predict import FEATURE_BINS, MONTH_SEASONS, bin_codes, season_codes
+from delhi_aq.storage import read_dataset, write_dataset
+
+HISTORY = os.path.join(REPO_ROOT, "benchmarks", "results", "history.jsonl")
+
+# Stages whose cost does not stay near-linear in the number of copies.
+MAX_SCALE = {"fit:dbscan": 10}
+
+# Differences below this are timer noise, never a regression.
+NOISE_FLOOR_S = 0.005
+
+JITTERED = ["pm10_avg", "pm25_avg", "temp_mean", "wind_speed_mean", "humidity_mean", "precipitation"]
+
+
+# ── Synthetic scaling ────────────────────────────────────────────────────────
+
+def replicate(frame, copies, jitter=(), key="site", seed=0):
+    """``copies`` stacked copies of ``frame`` with a ``key`` column and ``jitter`` columns scaled by ~N(1, 5%)."""
+    rng = np.random.default_rng(seed)
+    out = pd.concat([frame] * copies, ignore_index=True)
+    out.insert(0, key, np.repeat(np.arange(copies, dtype="int64"), len(frame)))
+    for col in jitter:
+        values = out[col].to_numpy(dtype="float64", na_value=np.nan)
+        out[col] = (values * rng.lognormal(0.0, 0.05, len(out))).astype(out[col].dtype)
+    return out
+
+
+def synthetic_inputs(scale, seed=0):
+    """The collection notebook's inputs and its master, each ``scale`` times over."""
+    master = read_dataset("master_daily", DATA_DIR)
+    aq_raw = read_dataset("openaq_raw", DATA_DIR_RAW)
+    aq_daily = read_dataset("air_quality_daily", DATA_DIR_RAW)
+
+    # Sensors of different copies are different sensors.
+    raw = replicate(aq_raw, scale, ["value"], seed=seed)
+    raw["sensor_id"] += raw.pop("site") * (aq_raw["sensor_id"].max() + 1)
+    cpcb = master.loc[master["aqi_source"] == "cpcb_direct", ["date", "aqi"]]
+    return {
+        "master":     replicate(master, scale, JITTERED + ["aqi"], seed=seed),
+        "aq_raw":     raw,
+        "aq_daily":   replicate(aq_daily, scale, ["pm10_avg", "pm25_avg"], seed=seed),
+        "cpcb":       replicate(cpcb, scale, ["aqi"], seed=seed),
+        "weather":    read_dataset("weather_daily", DATA_DIR_PROCESSED),
+        "trends":     read_dataset("google_trends_daily", DATA_DIR_RAW),
+    }
+
+
+# ── Stages ───────────────────────────────────────────────────────────────────
+# Each stage is (setup, run): setup(inputs, workdir) prepares untimed state, run(state) is timed.
+
+def _identity(inputs, workdir):
+    return inputs
+
+
+def _setup_load(inputs, workdir):
+    write_dataset(inputs["master"], "master_daily", workdir, csv=False)
+    return workdir
+
+
+def _load(workdir):
+    return read_dataset("master_daily", workdir)
+
+
+def _aqi(inputs):
+    aqi = sub_index(inputs["aq_daily"]["pm25_avg"], "pm25")
+    return aqi_category(aqi)
+
+
+def _impute(inputs):
+    raw = impute(inputs["aq_raw"], {"value": [("group_mean", {"by": ["sensor_id", "parameter"]})]})
+    daily = impute(inputs["aq_daily"], {"pm10_avg": [
+        ("interpolate",     {"limit": 7, "by": "site"}),
+        ("seasonal_median", {}),
+    ]})
+    return raw, daily
+
+
+def _merge(inputs):
+    aq_daily = inputs["aq_daily"].assign(aqi_source="openaq_computed")
+    cpcb = inputs["cpcb"].assign(aqi_category=lambda df: aqi_category(df["aqi"]), aqi_source="cpcb_direct")
+    existing = aq_daily[["site", "date"]].assign(_seen=True)
+    cpcb = cpcb.merge(existing, on=["site", "date"], how="left")
+    cpcb = cpcb[cpcb.pop("_seen").isna()]
+
+    master = pd.concat([aq_daily, cpcb], ignore_index=True)
+    master = master.merge(inputs["weather"], on="date", how="left")
+    master = master.merge(inputs["trends"], on="date", how="left")
+    master = master.sort_values(["site", "date"]).reset_index(drop=True)
+    master["year"] = master["date"].dt.year
+    master["month"] = master["date"].dt.month
+    master["season"] = master["month"].map(MONTH_SEASONS)
+    return master
+
+
+def _setup_categorical(inputs, workdir):
+    master = inputs["master"]
+    codes = {f: bin_codes(master[col], edges) for f, (col, edges, _) in FEATURE_BINS.items()}
+    codes["season"] = season_codes(master)
+    target = master["aqi_category"].cat.codes.to_numpy()
+    return pd.DataFrame(codes), target
+
+
+def _fit_nb(state):
+    from sklearn.naive_bayes import CategoricalNB
+
+    X, y = state
+    return CategoricalNB().fit(X, y)
+
+
+def _setup_tree(inputs, workdir):
+    X, y = _setup_categorical(inputs, workdir)
+    return pd.get_dummies(X.astype("category")), y
+
+
+def _fit_tree(state):
+    from sklearn.tree import DecisionTreeClassifier
+
+    X, y = state
+    return DecisionTreeClassifier(random_state=42, max_depth=5).fit(X, y)
+
+
+def _setup_scaled(inputs, workdir):
+    return feature_matrix(inputs["master"], KMEANS_FEATURES, scaler="standard").values
+
+
+def _fit_kmeans(X):
+    from sklearn.cluster import KMeans
+
+    model = KMeans(n_clusters=3, random_state=42, n_init=10).fit(X)
+    return model, silhouette(X, model.labels_, seed=42)
+
+
+def _fit_dbscan(X):
+    from sklearn.cluster import DBSCAN
+
+    return DBSCAN(eps=1.5, min_samples=5).fit(X)
+
+
+def _setup_regression(inputs, workdir):
+    master = inputs["master"]
+    X = master[KMEANS_FEATURES]
+    return X.fillna(X.median()), master["aqi"].fillna(master["aqi"].median())
+
+
+def _fit_regression(state):
+    from sklearn.linear_model import LinearRegression
+
+    X, y = state
+    return LinearRegression().fit(X, y)
+
+
+def _setup_apriori(inputs, workdir):
+    master = inputs["master"]
+    binned = {f: pd.cut(master[col], edges, labels=labels) for f, (col, edges, labels) in FEATURE_BINS.items()}
+    return pd.DataFrame(binned).assign(season=master["season"], aqi_category=master["aqi_category"])
+
+
+def _fit_apriori(frame):
+    itemsets = frequent_itemsets(encode(frame), min_support=0.05)
+    return association_rules(itemsets, min_confidence=0.6)
+
+
+STAGES = {
+    "load":              (_setup_load, _load),
+    "aqi":               (_identity, _aqi),
+    "impute":            (_identity, _impute),
+    "merge":             (_identity, _merge),
+    "fit:naive_bayes":   (_setup_categorical, _fit_nb),
+    "fit:decision_tree": (_setup_tree, _fit_tree),
+    "fit:kmeans":        (_setup_scaled, _fit_kmeans),
+    "fit:dbscan":        (_setup_scaled, _fit_dbscan),
+    "fit:linear":        (_setup_regression, _fit_regression),
+    "fit:apriori":       (_setup_apriori, _fit_apriori),
+}
+
+
+def timed(fn, arg, repeat, budget_s=1.0):
+    """Wall times of up to ``repeat`` calls; a call slower than ``budget_s`` is not repeated."""
+    times = []
+    while len(times) < repeat:
+        t0 = time.perf_counter()
+        fn(arg)
+        times.append(time.perf_counter() - t0)
+        if times[0] > budget_s:
+            break
+    return times
+
+
+def page_selector(at):
+    """A function that makes ``at``'s next run render a given page, or None if this Streamlit has none.
+
+    ``AppTest.switch_page`` only resolves file-based pages; the app's pages are functions
+    registered with ``st.navigation``, reachable only through AppTest's private page hash.
+    """
+    try:
+        from streamlit.navigation.page import calc_hash
+    except ImportError:
+        return None
+    if not hasattr(at, "_page_hash"):
+        return None
+
+    def select(page):
+        at._page_hash = calc_hash(page)
+    return select
+
+
+def render_times(repeat):
+    """Per page: wall times of reruns of ``webapp.py`` after a cold first run.
+
+    Without a way to select pages (see ``page_selector``) only reruns of the default page are timed.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    cwd = os.getcwd()
+    os.chdir(REPO_ROOT)  # the app resolves images/ and data/ relative to the repository root
+    try:
+        at = AppTest.from_file(os.path.join(REPO_ROOT, "website", "webapp.py"), default_timeout=300)
+        t0 = time.perf_counter()
+        at.run()
+        out = {"render:cold": [time.perf_counter() - t0]}
+        select = page_selector(at)
+        if select is None:
+            out["render:default"] = timed(lambda _: at.run(), None, repeat)
+            return out
+        for page in PAGES:
+            select(page)
+            out[f"render:{page}"] = timed(lambda _: at.run(), None, repeat)
+        return out
+    finally:
+        os.chdir(cwd)
+
+
+# ── History ──────────────────────────────────────────────────────────────────
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def read_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def previous(history, host, stage, scale):
+    """The most recent earlier record of ``stage`` at ``scale`` on ``host``."""
+    for record in reversed(history):
+        if record["host"] == host and record["stage"] == stage and record["scale"] == scale:
+            return record
+    return None
+
+
+def append_history(path, records):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--stages", nargs="+", default=list(STAGES) + ["render"],
+                        help="stage names, or a prefix such as 'fit' or 'render'")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--history", default=HISTORY)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="slowdown flagged as a regression")
+    parser.add_argument("--no-save", action="store_true", help="compare against the history without appending")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    def wanted(stage):
+        return any(stage == s or stage.startswith(s + ":") for s in args.stages)
+
+    history = read_history(args.history)
+    run = {"run": datetime.now(timezone.utc).isoformat(timespec="seconds"), "commit": git_commit(),
+           "host": platform.node(), "python": platform.python_version(),
+           "pandas": pd.__version__, "numpy": np.__version__}
+
+    results = []   # (stage, scale, master rows, times); rows is None for renders of the on-disk data
+    for scale in args.scales:
+        inputs = synthetic_inputs(scale)
+        rows = len(inputs["master"])
+        with tempfile.TemporaryDirectory() as workdir:
+            for stage, (setup, fn) in STAGES.items():
+                if not wanted(stage) or scale > MAX_SCALE.get(stage, scale):
+                    continue
+                state = setup(inputs, workdir)
+                results.append((stage, scale, rows, timed(fn, state, args.repeat)))
+        if scale == 1 and any(wanted(f"render:{page}") for page in ["cold", "default"] + PAGES):
+            for stage, times in render_times(args.repeat).items():
+                if wanted(stage):
+                    results.append((stage, 1, None, times))
+
+    print(f"{run['run']}  commit {run['commit']}  host {run['host']}  python {run['python']}\n")
+    print(f"{'stage':<22}{'scale':>6}{'rows':>12}{'median ms':>12}{'min ms':>10}{'prev ms':>10}{'change':>9}")
+    records, regressions = [], []
+    for stage, scale, rows, times in results:
+        median = statistics.median(times)
+        before = previous(history, run["host"], stage, scale)
+        change, flag = "", ""
+        if before is not None:
+            ratio = median / before["median_s"] - 1
+            change = f"{ratio:+.0%}"
+            if ratio > args.tolerance and median - before["median_s"] > NOISE_FLOOR_S:
+                flag = "  <- slower"
+                regressions.append(stage)
+        n_rows = f"{rows:,}" if rows else "-"
+        prev = f"{before['median_s'] * 1000:10.1f}" if before is not None else f"{'-':>10}"
+        print(f"{stage:<22}{scale:>5}x{n_rows:>12}{median * 1000:12.1f}{min(times) * 1000:10.1f}{prev}"
+              f"{change:>9}{flag}")
+        records.append({**run, "stage": stage, "scale": scale, "rows": rows, "median_s": median,
+                        "min_s": min(times), "runs": len(times)})
+
+    if not args.no_save:
+        append_history(args.history, records)
+        print(f"\n{len(records)} results appended to {os.path.relpath(args.history)}")
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(sorted(set(regressions)))}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
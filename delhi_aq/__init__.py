@@ -0,0 +1,5 @@
+"""Shared data and analysis code for the Delhi air pollution project.
+
+The Streamlit app (``website/webapp.py``) and the notebooks both import from
+here so that datasets are parsed the same way everywhere.
+"""
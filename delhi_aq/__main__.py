@@ -0,0 +1,4 @@
+"""``python -m delhi_aq build`` runs the data pipeline as a stage graph; see ``delhi_aq.build``."""
+from .build import main
+
+main()
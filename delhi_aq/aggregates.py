@@ -0,0 +1,163 @@
+"""Precomputed dashboard aggregates stored as Parquet.
+
+The dashboard figures only need a few small tables (a year x month heatmap,
+annual PM2.5 means, the summary-statistics table, AQI category counts and the
+K-Means k sweep).
+These are materialized once from ``master_daily.parquet`` into ``data/aggregates``
+and the app reads them directly instead of rescanning the daily rows.
+
+``manifest.json`` records the SHA-1 of the source file the store was built
+from. ``load_aggregate`` compares it against the current source on each call
+(a stat, plus a hash only when the stat changed) and rebuilds when stale.
+
+Build manually with:
+    python -m delhi_aq.aggregates
+"""
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from .loader import file_hash, file_signature
+from .paths import AGGREGATES_DIR, MASTER_PARQUET
+from .schema import AQI_CATEGORIES
+from .storage import read_parquet
+
+MANIFEST = "manifest.json"
+
+SUMMARY_COLS = ["pm25_avg", "pm10_avg", "aqi", "temp_mean",
+                "wind_speed_mean", "humidity_mean", "precipitation"]
+
+AQI_RANGES = ["0–50", "51–100", "101–200", "201–300", "301–400", "401–500"]
+
+KMEANS_FEATURES = ["pm10_avg", "pm25_avg", "temp_mean", "wind_speed_mean", "humidity_mean", "precipitation"]
+
+
+def aqi_heatmap(master):
+    """Mean AQI per (year, month), pivoted to years x months."""
+    heatmap_data = master.groupby(["year", "month"])["aqi"].mean().reset_index()
+    pivot = heatmap_data.pivot(index="year", columns="month", values="aqi")
+    pivot.columns = [str(c) for c in pivot.columns]  # Parquet needs string column names
+    return pivot
+
+
+def annual_pm25(master):
+    return (
+        master.dropna(subset=["pm25_avg"])
+        .groupby("year")["pm25_avg"]
+        .mean()
+        .reset_index()
+    )
+
+
+def summary_stats(master):
+    values = master[SUMMARY_COLS].astype("float64")  # stored as float32; report at full precision
+    summary = values.describe().T.round(2)
+    summary["skewness"] = values.skew().round(3)
+    summary["missing"]  = values.isna().sum()
+    return summary
+
+
+def aqi_category_counts(master):
+    counts = master["aqi_category"].astype("object").value_counts().reindex(AQI_CATEGORIES).reset_index()
+    counts.columns = ["AQI Category", "Days"]
+    counts["Percentage"] = (counts["Days"] / counts["Days"].sum() * 100).round(1)
+    counts["AQI Range"]  = AQI_RANGES
+    return counts[["AQI Category", "AQI Range", "Days", "Percentage"]]
+
+
+def kmeans_selection(master):
+    """Inertia and silhouette per k (2..10) for the Models page; fitted models come from the cache."""
+    from .clustering import feature_matrix, kmeans_sweep  # sklearn is only needed when (re)building
+    sweep = kmeans_sweep(feature_matrix(master, KMEANS_FEATURES), range(2, 11), seed=42, n_init=10)
+    return sweep[["k", "inertia", "silhouette", "silhouette_n"]]
+
+
+AGGREGATES = {
+    "aqi_heatmap":         aqi_heatmap,
+    "annual_pm25":         annual_pm25,
+    "summary_stats":       summary_stats,
+    "aqi_category_counts": aqi_category_counts,
+    "kmeans_sweep":        kmeans_selection,
+}
+
+# Per-name post-processing applied when reading back from Parquet.
+_RESTORE = {
+    "aqi_heatmap": lambda df: df.set_axis([int(c) for c in df.columns], axis=1),
+}
+
+_lock = threading.Lock()
+_state = {"signature": None, "sha1": None}
+_tables = {}
+
+
+def _manifest_path(out_dir):
+    return os.path.join(out_dir, MANIFEST)
+
+
+def read_manifest(out_dir=AGGREGATES_DIR):
+    try:
+        with open(_manifest_path(out_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def build_aggregates(source=MASTER_PARQUET, out_dir=AGGREGATES_DIR):
+    """Compute every aggregate from ``source`` and write the store + manifest."""
+    os.makedirs(out_dir, exist_ok=True)
+    master = read_parquet(source, "master_daily")
+
+    for name, compute in AGGREGATES.items():
+        compute(master).to_parquet(os.path.join(out_dir, f"{name}.parquet"))
+
+    manifest = {
+        "source":      os.path.basename(source),
+        "source_sha1": file_hash(source),
+        "source_rows": len(master),
+        "built_at":    datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "tables":      sorted(AGGREGATES),
+    }
+    # Written last so a crash mid-build leaves the store marked stale.
+    with open(_manifest_path(out_dir), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def ensure_aggregates(source=MASTER_PARQUET, out_dir=AGGREGATES_DIR):
+    """Rebuild the store if ``source`` changed since it was built. Returns the source SHA-1."""
+    signature = file_signature(source)
+    if _state["signature"] == signature:
+        return _state["sha1"]
+
+    with _lock:
+        if _state["signature"] == signature:
+            return _state["sha1"]
+
+        sha1 = file_hash(source)
+        manifest = read_manifest(out_dir)
+        if manifest is None or manifest.get("source_sha1") != sha1 \
+                or set(manifest.get("tables", [])) != set(AGGREGATES):
+            build_aggregates(source, out_dir)
+        if sha1 != _state["sha1"]:
+            _tables.clear()
+        _state.update(signature=signature, sha1=sha1)
+        return sha1
+
+
+def load_aggregate(name):
+    """Return a ready-made aggregate table, rebuilding the store first if stale."""
+    sha1 = ensure_aggregates()
+    key = (name, sha1)
+    if key not in _tables:
+        df = pd.read_parquet(os.path.join(AGGREGATES_DIR, f"{name}.parquet"))
+        _tables[key] = _RESTORE.get(name, lambda d: d)(df)
+    return _tables[key]
+
+
+if __name__ == "__main__":
+    manifest = build_aggregates()
+    print(f"Built {len(manifest['tables'])} aggregates from {manifest['source']} "
+          f"({manifest['source_rows']} rows) → {AGGREGATES_DIR}")
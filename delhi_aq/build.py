@@ -0,0 +1,365 @@
+"""Incremental, parallel builds of the pipeline stages as a dependency graph.
+
+``delhi_aq.pipeline.STAGES`` declares what each stage reads and writes; a
+stage depends on the stages that write its inputs. The four source branches
+(OpenAQ, Open-Meteo, Google Trends, the CPCB sheets) are independent until
+``merge_master``, so they run side by side::
+
+    discover_stations
+    fetch_sensors      after discover_stations
+    aggregate_city     after fetch_sensors
+    fetch_weather
+    fetch_trends
+    clean_sensors      after discover_stations, fetch_sensors
+    clean_city         after aggregate_city
+    clean_weather      after fetch_weather, clean_city
+    parse_cpcb
+    merge_master       after fetch_trends, clean_city, clean_weather, parse_cpcb
+
+A stage starts as soon as everything it depends on has finished, in one of
+up to ``jobs`` worker processes (spawned, like the model fits in
+``delhi_aq.clustering``), so each stage's CPU time and peak RSS in the run
+report are its own. With ``jobs=1`` everything runs in this process, in graph
+order.
+
+A stage is skipped when nothing it depends on changed since it last
+succeeded: the SHA-1 of every input file, the SHA-1 of the pipeline code and
+of every output (so a deleted or hand-edited output is rebuilt) all match the
+build state, ``data/cache/build_state.json``. File hashes are cached by
+(mtime, size), so an unchanged tree costs a ``stat`` per file. Stages that
+fetch from an external service always run; they only append days past their
+watermarks, and an unchanged output leaves the stages after it skipped.
+
+Subsets: ``only`` rebuilds just the named stages; ``start_from`` rebuilds a stage and
+checks everything downstream of it. Stages outside the selection are not run
+and their outputs on disk are used as they are. A failed stage blocks the
+stages after it; independent branches still finish.
+
+From the command line::
+
+    python -m delhi_aq build                        # everything, skipping what is up to date
+    python -m delhi_aq build --offline --jobs 4     # no fetches: rebuild from the raw files
+    python -m delhi_aq build --only parse_cpcb      # just this stage (forced)
+    python -m delhi_aq build --from clean_city      # clean_city (forced) and whatever depends on it
+    python -m delhi_aq stages                       # the graph, and what would run
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+
+from . import aqi, impute, incremental, pipeline, predict, schema, stations, storage
+from .loader import file_hash, file_signature
+from .paths import DATA_DIR
+from .pipeline import (END_DATE, OFFLINE_STAGES, PROFILERS, STAGES, START_DATE, Context, StageRecord,
+                       default_report_path, format_record, profile_dir_for, run_stage, start_report)
+
+STATE_FILE = os.path.join("cache", "build_state.json")   # under the data directory
+
+# Modules whose code decides what the stages write; editing any of them rebuilds every stage.
+CODE_MODULES = (pipeline, aqi, impute, incremental, predict, schema, stations, storage)
+
+
+# ── Graph ────────────────────────────────────────────────────────────────────
+
+def dependencies(stages=STAGES):
+    """Stage name -> names of the stages that write one of its inputs."""
+    writers = {}
+    for stage in stages.values():
+        for ref in stage.outputs:
+            writers[ref] = stage.name
+    return {stage.name: sorted({writers[ref] for ref in stage.inputs if ref in writers} - {stage.name},
+                               key=list(stages).index)
+            for stage in stages.values()}
+
+
+def downstream(names, deps):
+    """``names`` and every stage that depends on one of them, directly or not."""
+    out = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for name, before in deps.items():
+            if name not in out and out.intersection(before):
+                out.add(name)
+                changed = True
+    return out
+
+
+def select(only=None, start_from=None, offline=False, stages=STAGES):
+    """The stages to run, in graph order, and those of them to force (run even if up to date)."""
+    deps = dependencies(stages)
+    if only and start_from:
+        raise ValueError("choose either only or start_from")
+    if only:
+        chosen = forced = set(only)
+    elif start_from:
+        chosen, forced = downstream([start_from], deps), {start_from}
+    else:
+        chosen, forced = set(stages), set()
+    unknown = (chosen | forced) - set(stages)
+    if unknown:
+        raise KeyError(f"unknown stages {sorted(unknown)}; expected some of {list(stages)}")
+    if offline:
+        chosen = {name for name in chosen if name in OFFLINE_STAGES or name in forced}
+    return [name for name in stages if name in chosen], forced
+
+
+# ── State: content hashes ────────────────────────────────────────────────────
+
+class BuildState:
+    """Per file: (mtime, size) and SHA-1; per stage: the hashes of its last successful run. Saved as JSON."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            state = {}
+        self.files = state.get("files", {})
+        self.stages = state.get("stages", {})
+
+    def hash(self, path, key):
+        """SHA-1 of ``path`` (None if missing), re-hashed only when its (mtime, size) changed."""
+        if not os.path.exists(path):
+            return None
+        signature = list(file_signature(path))
+        with self._lock:
+            cached = self.files.get(key)
+        if cached is not None and cached["signature"] == signature:
+            return cached["sha1"]
+        sha1 = file_hash(path)
+        with self._lock:
+            self.files[key] = {"signature": signature, "sha1": sha1}
+        return sha1
+
+    def save(self):
+        with self._lock:
+            state = {"files": self.files, "stages": self.stages}
+            # Write-then-rename so a crash never leaves a truncated file.
+            tmp = f"{self.path}.tmp"
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+
+
+def code_fingerprint(modules=CODE_MODULES):
+    """SHA-1 over the source files of ``modules``."""
+    return hashlib.sha1("".join(file_hash(module.__file__) for module in modules).encode()).hexdigest()
+
+
+def hashes(state, ctx, refs):
+    """``{file (relative to the data directory): SHA-1}`` of every file of ``refs``."""
+    out = {}
+    for ref in refs:
+        paths = ctx.paths(ref)
+        if not paths and "*" in ref:
+            out[ref] = None  # a glob with no files yet
+        for path in paths:
+            key = os.path.relpath(path, ctx.data_dir)
+            out[key] = state.hash(path, key)
+    return out
+
+
+def up_to_date(stage, state, ctx, code):
+    """Why ``stage`` can be skipped, or None if it has to run."""
+    if stage.source is not None:
+        return None
+    last = state.stages.get(stage.name)
+    if last is None or last["code"] != code:
+        return None
+    if last["inputs"] != hashes(state, ctx, stage.inputs):
+        return None
+    if last["outputs"] != hashes(state, ctx, stage.outputs) or None in last["outputs"].values():
+        return None
+    return "inputs unchanged"
+
+
+# ── Scheduler ────────────────────────────────────────────────────────────────
+
+def _work(name, ctx, profiler, profile_dir, t0):
+    # Runs in a worker process: the failure is reported in the record, not raised.
+    record = StageRecord(name)
+    try:
+        run_stage(STAGES[name], ctx, profiler, profile_dir, record, t0)
+    except Exception:
+        pass
+    return record
+
+
+def build(ctx=None, only=None, start_from=None, offline=False, force=False, jobs=None,
+          profiler=None, report_path=None, progress=None):
+    """Run the selected stages in dependency order, ``jobs`` at a time; returns the ``RunReport``.
+
+    Up-to-date stages are skipped unless ``force`` (or named by ``only`` /
+    ``start_from``). The report, with every stage's status (ok, skipped,
+    failed or blocked), is written to ``report_path`` if given.
+    ``progress(record)`` is called as each stage finishes.
+    """
+    ctx = ctx or Context()
+    names, forced = select(only, start_from, offline)
+    deps = dependencies()
+    jobs = min(len(names) or 1, jobs or os.cpu_count() or 1)
+    report = start_report(ctx, names, profiler, jobs=jobs, only=only, start_from=start_from,
+                          offline=offline, force=force)
+    profile_dir = profile_dir_for(report_path) if profiler is not None else None
+    state = BuildState(os.path.join(ctx.data_dir, STATE_FILE))
+    code = code_fingerprint()
+
+    records = {name: StageRecord(name) for name in names}
+    report.stages = [records[name] for name in names]
+    waiting = list(names)
+    running = {}
+    input_hashes = {}
+    t0 = time.time()
+
+    def finish(record):
+        if progress is not None:
+            progress(record)
+        if record.status == "ok":
+            stage = STAGES[record.name]
+            state.stages[record.name] = {
+                "code": code, "inputs": input_hashes[record.name],
+                "outputs": hashes(state, ctx, stage.outputs),
+                "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+            state.save()
+        elif record.status == "failed":
+            for name in downstream([record.name], deps) - {record.name}:
+                if name in waiting:
+                    waiting.remove(name)
+                    records[name].status = "blocked"
+                    records[name].notes = {"blocked_by": record.name}
+                    if progress is not None:
+                        progress(records[name])
+
+    def ready():
+        pending = set(waiting) | {name for name in running.values()}
+        return [name for name in waiting if not pending.intersection(deps[name])]
+
+    def start(name, submit):
+        """Skip ``name`` if it is up to date, else ``submit`` it."""
+        waiting.remove(name)
+        stage = STAGES[name]
+        reason = None if (force or name in forced) else up_to_date(stage, state, ctx, code)
+        if reason is not None:
+            records[name].status = "skipped"
+            records[name].notes = {"reason": reason}
+            finish(records[name])
+            return
+        input_hashes[name] = hashes(state, ctx, stage.inputs)
+        submit(name)
+
+    try:
+        if jobs < 2:
+            def inline(name):
+                records[name] = _work(name, ctx, profiler, profile_dir, t0)
+                finish(records[name])
+
+            while waiting:
+                start(ready()[0], inline)
+        else:
+            with ProcessPoolExecutor(jobs, mp_context=multiprocessing.get_context("spawn")) as pool:
+                def submit(name):
+                    running[pool.submit(_work, name, ctx, profiler, profile_dir, t0)] = name
+
+                while waiting or running:
+                    for name in ready():
+                        if len(running) >= jobs:
+                            break
+                        start(name, submit)
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        records[name] = future.result()
+                        finish(records[name])
+    finally:
+        report.stages = [records[name] for name in names]
+        report.wall_s = round(time.time() - t0, 6)
+        if report_path is not None:
+            report.write(report_path)
+    return report
+
+
+# ── Command line ─────────────────────────────────────────────────────────────
+
+def _context(args):
+    return Context(start=args.start, end=args.end, data_dir=args.data_dir)
+
+
+def describe(ctx, only=None, start_from=None, offline=False, force=False):
+    """One line per stage: what it depends on and whether a build would run it."""
+    names, forced = select(only, start_from, offline)
+    deps = dependencies()
+    state = BuildState(os.path.join(ctx.data_dir, STATE_FILE))
+    code = code_fingerprint()
+    lines = []
+    for name, stage in STAGES.items():
+        if name not in names:
+            plan = "not selected"
+        elif force or name in forced:
+            plan = "run (forced)"
+        elif stage.source is not None:
+            plan = f"run (fetches from {stage.source})"
+        else:
+            reason = up_to_date(stage, state, ctx, code)
+            plan = f"skip ({reason})" if reason else "run"
+        after = ", ".join(deps[name]) or "-"
+        lines.append(f"{name:<18} after {after:<52} {plan}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m delhi_aq", description="Delhi air quality data pipeline")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data-dir", default=DATA_DIR)
+    common.add_argument("--start", default=START_DATE)
+    common.add_argument("--end", default=END_DATE)
+    subset = common.add_mutually_exclusive_group()
+    subset.add_argument("--only", nargs="+", choices=list(STAGES), metavar="STAGE",
+                        help="run just these stages, even if up to date")
+    subset.add_argument("--from", dest="start_from", choices=list(STAGES), metavar="STAGE",
+                        help="run this stage (even if up to date) and check every stage after it")
+    common.add_argument("--offline", action="store_true", help="leave out the stages that fetch data")
+    common.add_argument("--force", action="store_true", help="run selected stages even if up to date")
+
+    run_cmd = commands.add_parser("build", parents=[common], help="run the stage graph")
+    run_cmd.add_argument("--jobs", type=int, help="stages at a time (default: CPU count)")
+    run_cmd.add_argument("--profile", choices=PROFILERS, help="dump a profile of every stage next to the report")
+    run_cmd.add_argument("--report", help="run report path (default: data/reports/pipeline-<time>.json)")
+    commands.add_parser("stages", parents=[common], help="show the stage graph and what a build would run")
+    args = parser.parse_args(argv)
+
+    ctx = _context(args)
+    if args.command == "stages":
+        print("\n".join(describe(ctx, args.only, args.start_from, args.offline, args.force)))
+        return
+
+    report_path = args.report or default_report_path()
+    report = build(ctx, args.only, args.start_from, args.offline, args.force, args.jobs, args.profile,
+                   report_path, lambda record: print(format_record(record)))
+    counts = {}
+    for record in report.stages:
+        counts[record.status] = counts.get(record.status, 0) + 1
+    summary = ", ".join(f"{n} {status}" for status, n in counts.items())
+    failed = counts.get("failed", 0)
+    print(f"{'❌' if failed else '✅'} {summary} in {report.wall_s:.2f} s ({report.context['jobs']} jobs); "
+          f"report: {report_path}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
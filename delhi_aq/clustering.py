@@ -0,0 +1,421 @@
+"""Clustering model selection: a cached, process-parallel K-Means k sweep and a
+DBSCAN grid search over one shared neighbor index.
+
+::
+
+    data  = feature_matrix(final_df, feature_cols, scaler="standard")   # median fill + scaling
+    sweep = kmeans_sweep(data, range(2, 11), seed=42)                  # k, inertia, silhouette, ...
+    model = fit_kmeans(data, 3, seed=42)                                 # fitted KMeans, from cache
+
+Every fitted model is stored under ``data/cache/models`` keyed by the feature
+set (column names + a hash of the values), the scaler, ``k``, the seed and
+``n_init``. Rerunning the notebook or rebuilding the dashboard aggregates loads
+those models instead of refitting; changing any input gives a new key.
+
+Cache misses are fitted in a process pool, one ``k`` per task. Small inputs
+(below ``PARALLEL_MIN_ROWS``) are fitted inline: starting workers costs more
+than the fits themselves.
+
+The silhouette is exact up to ``SILHOUETTE_SAMPLE`` rows. Above that it is the
+mean over a few disjoint random batches of that size, which keeps it
+O(batches * sample²) instead of O(n²) in time and memory.
+
+DBSCAN tuning shares one neighbor index across a whole parameter grid::
+
+    index = NeighborIndex(data.values, max_min_samples=20)              # one KD-tree, one kNN query
+    curve = index.k_distance(5)                                          # k-distance plot
+    grid  = dbscan_grid(data, np.arange(0.5, 2.55, 0.1), range(3, 21), index=index)
+    labels = index.labels(1.5, 5)                                        # == DBSCAN(1.5, 5).fit_predict
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components, minimum_spanning_tree
+from sklearn.cluster import KMeans
+from sklearn.metrics import pairwise_distances, silhouette_score
+from sklearn.neighbors import BallTree, KDTree
+from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
+
+from .paths import MODEL_CACHE_DIR
+
+SCALERS = {
+    "standard": StandardScaler,
+    "robust":   RobustScaler,
+    "minmax":   MinMaxScaler,
+    "none":     None,
+}
+
+SILHOUETTE_SAMPLE = 10_000
+SILHOUETTE_BATCHES = 3
+PARALLEL_MIN_ROWS = 20_000
+
+
+@dataclass
+class FeatureMatrix:
+    """Scaled model input plus the identity used for cache keys."""
+    values: np.ndarray
+    features: list
+    scaler: str
+    key: str
+    transformer: object = field(default=None, repr=False)
+
+    def __len__(self):
+        return len(self.values)
+
+
+def feature_matrix(frame, features, scaler="standard", fill="median"):
+    """``features`` of ``frame`` as a float64 matrix, gaps filled with the column ``fill``
+    statistic (as in the notebook) and scaled with ``SCALERS[scaler]``."""
+    raw = frame[list(features)].astype("float64")
+    if fill is not None:
+        raw = raw.fillna(raw.agg(fill))
+    values = np.ascontiguousarray(raw.to_numpy())
+
+    digest = hashlib.sha1(json.dumps([list(features), scaler, fill]).encode())
+    digest.update(str(values.shape).encode())
+    digest.update(values.tobytes())
+
+    transformer = SCALERS[scaler]() if SCALERS[scaler] is not None else None
+    if transformer is not None:
+        values = transformer.fit_transform(values)
+    return FeatureMatrix(values, list(features), scaler, digest.hexdigest(), transformer)
+
+
+def silhouette(X, labels, sample_size=SILHOUETTE_SAMPLE, batches=SILHOUETTE_BATCHES, seed=0):
+    """Silhouette score, exact for up to ``sample_size`` rows, otherwise the mean over
+    ``batches`` disjoint random samples. Returns ``(score, rows_used)``."""
+    n = len(X)
+    if len(np.unique(labels)) < 2:
+        return np.nan, 0
+    if n <= sample_size:
+        return float(silhouette_score(X, labels)), n
+
+    order = np.random.default_rng(seed).permutation(n)
+    batches = max(1, min(batches, n // sample_size))
+    scores = []
+    for b in range(batches):
+        idx = order[b * sample_size:(b + 1) * sample_size]
+        if len(np.unique(labels[idx])) > 1:
+            scores.append(silhouette_score(X[idx], labels[idx]))
+    return (float(np.mean(scores)) if scores else np.nan), batches * sample_size
+
+
+def model_key(data, k, seed, n_init, sample_size):
+    # The entry stores the silhouette too, so its sampling is part of the identity.
+    spec = (f"{data.key}|kmeans|k={k}|seed={seed}|n_init={n_init}"
+            f"|silhouette={sample_size}x{SILHOUETTE_BATCHES}|sklearn={sklearn.__version__}")
+    return hashlib.sha1(spec.encode()).hexdigest()
+
+
+def _cache_path(key, cache_dir):
+    return os.path.join(cache_dir, f"kmeans-{key[:20]}.joblib")
+
+
+_memory = {}
+
+
+def _load(key, cache_dir):
+    if key in _memory:
+        return _memory[key]
+    path = _cache_path(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        entry = joblib.load(path)
+    except Exception:
+        return None  # unreadable (e.g. written by an incompatible version): refit
+    _memory[key] = entry
+    return entry
+
+
+def _store(key, entry, cache_dir):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(key, cache_dir)
+    # Write-then-rename so concurrent runs never read a partial file.
+    tmp = f"{path}.{os.getpid()}.tmp"
+    joblib.dump(entry, tmp)
+    os.replace(tmp, path)
+    _memory[key] = entry
+
+
+def _fit(X, k, seed, n_init, sample_size):
+    t0 = time.perf_counter()
+    model = KMeans(n_clusters=k, random_state=seed, n_init=n_init).fit(X)
+    fit_seconds = time.perf_counter() - t0
+    score, used = silhouette(X, model.labels_, sample_size, seed=seed)
+    return {"model": model, "k": k, "seed": seed, "n_init": n_init, "inertia": float(model.inertia_),
+            "silhouette": score, "silhouette_n": used, "fit_seconds": fit_seconds}
+
+
+# Worker-side state: the matrix is sent once per worker, not once per task.
+_worker_X = None
+
+
+def _init_worker(X, threads):
+    global _worker_X
+    _worker_X = X
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(threads)  # keep workers x BLAS/OpenMP threads within the cores
+
+
+def _fit_in_worker(k, seed, n_init, sample_size):
+    return _fit(_worker_X, k, seed, n_init, sample_size)
+
+
+def _fit_many(X, ks, seed, n_init, sample_size, max_workers):
+    workers = min(len(ks), max_workers or os.cpu_count() or 1)
+    if workers < 2 or len(X) < PARALLEL_MIN_ROWS:
+        return [_fit(X, k, seed, n_init, sample_size) for k in ks]
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    # spawn, not fork: forking a process that already ran OpenMP code can deadlock.
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(X, threads)) as pool:
+        # Largest k first: those fits are the slowest, so the pool stays busy to the end.
+        futures = {k: pool.submit(_fit_in_worker, k, seed, n_init, sample_size)
+                   for k in sorted(ks, reverse=True)}
+        return [futures[k].result() for k in ks]
+
+
+def kmeans_sweep(data, ks=range(2, 11), seed=42, n_init=10, sample_size=SILHOUETTE_SAMPLE,
+                 max_workers=None, cache_dir=MODEL_CACHE_DIR):
+    """Fit (or load) one K-Means model per ``k`` and score it.
+
+    Returns a frame with ``k, inertia, silhouette, silhouette_n, fit_seconds, cached``
+    (``silhouette_n`` is the number of rows the silhouette was computed on).
+    """
+    ks = [int(k) for k in ks]
+    keys = {k: model_key(data, k, seed, n_init, sample_size) for k in ks}
+    entries = {k: _load(keys[k], cache_dir) for k in ks}
+    misses = [k for k in ks if entries[k] is None]
+
+    for entry in _fit_many(data.values, misses, seed, n_init, sample_size, max_workers):
+        _store(keys[entry["k"]], entry, cache_dir)
+        entries[entry["k"]] = entry
+
+    return pd.DataFrame([{
+        "k":            k,
+        "inertia":      entries[k]["inertia"],
+        "silhouette":   entries[k]["silhouette"],
+        "silhouette_n": entries[k]["silhouette_n"],
+        "fit_seconds":  entries[k]["fit_seconds"],
+        "cached":       k not in misses,
+    } for k in ks])
+
+
+def fit_kmeans(data, k, seed=42, n_init=10, sample_size=SILHOUETTE_SAMPLE, cache_dir=MODEL_CACHE_DIR):
+    """The fitted ``KMeans`` for ``k`` (loaded from the cache when available)."""
+    key = model_key(data, k, seed, n_init, sample_size)
+    entry = _load(key, cache_dir)
+    if entry is None:
+        entry = _fit(data.values, int(k), seed, n_init, sample_size)
+        _store(key, entry, cache_dir)
+    return entry["model"]
+
+
+# ── DBSCAN tuning ─────────────────────────────────────────────────────────────
+
+DBSCAN_SILHOUETTE_SAMPLE = 3_000
+TREES = {"kd_tree": KDTree, "ball_tree": BallTree}
+
+
+class NeighborIndex:
+    """One KD-tree (or ball tree) over ``X`` shared by every DBSCAN setting.
+
+    Two neighbor searches run once: the ``max_min_samples`` nearest neighbors
+    of every point (the k-distance curve) and the radius graph at the largest
+    ``eps`` asked for, which is filtered down for every smaller eps.
+
+    For a given eps, a point with ``c`` neighbors (itself included) is core for
+    every ``min_samples <= c``, so an edge joins two core points exactly when
+    ``min_samples <= min(c_i, c_j)``. A maximum spanning forest on that weight
+    keeps the connectivity for every threshold, so each ``min_samples`` only
+    runs connected components on at most n - 1 forest edges. ``labels`` returns
+    the same labels as ``DBSCAN(eps, min_samples).fit_predict(X)``.
+    """
+
+    def __init__(self, X, max_min_samples=20, algorithm="kd_tree", leaf_size=40):
+        self.X = np.asarray(X, dtype="float64")
+        self.tree = TREES[algorithm](self.X, leaf_size=leaf_size)
+        self.max_min_samples = max_min_samples
+        self.kdist = self.tree.query(self.X, k=min(max_min_samples, len(self.X)))[0]  # column 0: the point itself
+        self._graph_eps = None
+        self._graph = None
+        self._per_eps = {}
+
+    def k_distance(self, k):
+        """Sorted distance of every point to its k-th nearest neighbor (itself counted)."""
+        return np.sort(self.kdist[:, k - 1])
+
+    def suggest_eps(self, min_samples):
+        """Knee of the k-distance curve: the point farthest below the chord joining its ends."""
+        curve = self.k_distance(min_samples)
+        x = np.linspace(0, 1, len(curve))
+        y = (curve - curve[0]) / ((curve[-1] - curve[0]) or 1)
+        return float(curve[np.argmax(x - y)])
+
+    def prepare(self, eps_values):
+        """Run the radius search once for the largest of ``eps_values``."""
+        eps = max(eps_values)
+        if self._graph_eps is None or eps > self._graph_eps:
+            ind, dist = self.tree.query_radius(self.X, r=eps, return_distance=True)
+            counts = np.fromiter((len(i) for i in ind), dtype="int64", count=len(ind))
+            rows = np.repeat(np.arange(len(ind), dtype="int32"), counts)
+            cols = np.concatenate(ind).astype("int32")
+            other = rows != cols
+            # Row-major edge list (rows ascending), without self-pairs.
+            self._graph = (rows[other], cols[other], np.concatenate(dist)[other])
+            self._graph_eps = eps
+            self._filtered = (eps, *self._graph)
+            self._per_eps = {}
+
+    def _structure(self, eps):
+        """Neighbor counts, spanning forest and border-candidate edges at ``eps``."""
+        if eps not in self._per_eps:
+            self.prepare([eps])
+            n = len(self.X)
+            # Filter from the last (smaller) graph when eps decreases, as in dbscan_grid.
+            source = self._filtered if eps <= self._filtered[0] else (self._graph_eps, *self._graph)
+            prev_eps, rows, cols, dist = source
+            if eps < prev_eps:
+                keep = dist <= eps
+                rows, cols, dist = rows[keep], cols[keep], dist[keep]
+                self._filtered = (eps, rows, cols, dist)
+            count = np.bincount(rows, minlength=n) + 1
+            c_rows, c_cols = count[rows], count[cols]
+
+            upper = rows < cols
+            weight = np.minimum(c_rows[upper], c_cols[upper])
+            top = count.max() + 1  # zero weights would be dropped: store top - w >= 1
+            graph = sparse.csr_matrix((top - weight, (rows[upper], cols[upper])), shape=(n, n))
+            forest = minimum_spanning_tree(graph).tocoo()
+
+            # A border point's core neighbors always have more neighbors than it does, and
+            # points with max_min_samples neighbors or more are core for every setting.
+            denser = (c_rows < c_cols) & (c_rows < self.max_min_samples)
+            # One eps at a time keeps memory bounded by the radius graph.
+            self._per_eps = {eps: (count, forest.row, forest.col, top - forest.data.astype("int64"),
+                                   rows[denser], cols[denser])}
+        return self._per_eps[eps]
+
+    def labels(self, eps, min_samples):
+        """Same labels as ``DBSCAN(eps, min_samples).fit_predict(X)`` (-1 = noise)."""
+        if min_samples > self.max_min_samples:
+            raise ValueError(f"min_samples={min_samples} exceeds max_min_samples={self.max_min_samples}")
+        count, f_rows, f_cols, f_weight, b_rows, b_cols = self._structure(eps)
+        n = len(self.X)
+        core = count >= min_samples
+        labels = np.full(n, -1, dtype="int64")
+        if not core.any():
+            return labels
+
+        # Clusters: components of the core points, numbered by their lowest
+        # point index (the order in which DBSCAN discovers them).
+        sel = f_weight >= min_samples
+        graph = sparse.csr_matrix((np.ones(sel.sum(), dtype="int8"), (f_rows[sel], f_cols[sel])), shape=(n, n))
+        comp = connected_components(graph, directed=False)[1]
+        core_ids = np.flatnonzero(core)
+        _, first, inverse = np.unique(comp[core_ids], return_index=True, return_inverse=True)
+        rank = np.empty(len(first), dtype="int64")
+        rank[np.argsort(first)] = np.arange(len(first))
+        labels[core_ids] = rank[inverse]
+
+        # Border points take the lowest-numbered cluster among their core neighbors.
+        border = (count[b_rows] < min_samples) & core[b_cols]
+        if border.any():
+            r, lab = b_rows[border], labels[b_cols[border]]
+            starts = np.flatnonzero(np.r_[True, r[1:] != r[:-1]])
+            labels[r[starts]] = np.minimum.reduceat(lab, starts)
+        return labels
+
+
+class _SampleSilhouette:
+    """Silhouette over the non-noise points of a fixed sample, from one distance matrix.
+
+    Per-cluster distance sums are a sparse one-hot product with the matrix, so
+    each labelling costs O(sample²) without recomputing distances. Exact (up to
+    summation order) when the sample is the whole input.
+    """
+
+    def __init__(self, X, sample_size, seed):
+        n = len(X)
+        self.idx = np.arange(n) if n <= sample_size else \
+            np.sort(np.random.default_rng(seed).choice(n, sample_size, replace=False))
+        self.D = pairwise_distances(X[self.idx])
+
+    def __call__(self, labels):
+        lab = labels[self.idx]
+        keep = np.flatnonzero(lab >= 0)
+        clusters, lab = np.unique(lab[keep], return_inverse=True)
+        if not 2 <= len(clusters) <= len(keep) - 1:
+            return np.nan
+        # (clusters, sample) one-hot with empty noise columns: no submatrix copy.
+        onehot = sparse.csr_matrix((np.ones(len(keep)), (lab, keep)), shape=(len(clusters), len(self.idx)))
+        sums = (onehot @ self.D)[:, keep]                                 # (clusters, points)
+        sizes = np.bincount(lab).astype("float64")
+        cols = np.arange(len(keep))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            a = sums[lab, cols] / (sizes[lab] - 1)
+            means = sums / sizes[:, None]
+            means[lab, cols] = np.inf
+            b = means.min(axis=0)
+            s = (b - a) / np.maximum(a, b)
+        s[sizes[lab] == 1] = 0
+        return float(np.nan_to_num(s).mean())
+
+
+def _davies_bouldin(X, labels):
+    """``davies_bouldin_score`` for labels 0..c-1, from per-cluster sums (no per-call validation)."""
+    sizes = np.bincount(labels).astype("float64")
+    centroids = np.stack([np.bincount(labels, weights=col) for col in X.T], axis=1) / sizes[:, None]
+    intra = np.bincount(labels, weights=np.linalg.norm(X - centroids[labels], axis=1)) / sizes
+    between = pairwise_distances(centroids)
+    if np.allclose(intra, 0) or np.allclose(between, 0):
+        return 0.0
+    between[between == 0] = np.inf
+    return float(np.max((intra[:, None] + intra[None, :]) / between, axis=1).mean())
+
+
+def dbscan_grid(data, eps_values, min_samples_values, algorithm="kd_tree",
+                silhouette_sample=DBSCAN_SILHOUETTE_SAMPLE, seed=0, index=None):
+    """Evaluate every ``(eps, min_samples)`` pair from one shared ``NeighborIndex``.
+
+    Returns one row per pair with ``clusters``, ``noise`` (count), ``noise_frac``,
+    ``silhouette`` and ``davies_bouldin`` (both over non-noise points, as in the
+    notebook; NaN when fewer than two clusters form). The silhouette is exact up
+    to ``silhouette_sample`` rows, otherwise computed on a fixed random sample.
+    Pass ``index`` to reuse an existing ``NeighborIndex``.
+    """
+    X = data.values if isinstance(data, FeatureMatrix) else np.asarray(data, dtype="float64")
+    eps_values = sorted((float(e) for e in eps_values), reverse=True)  # each eps filters the previous graph
+    min_samples_values = sorted(int(m) for m in min_samples_values)
+    if index is None:
+        index = NeighborIndex(X, max(min_samples_values), algorithm)
+    index.prepare(eps_values)
+    score = _SampleSilhouette(X, silhouette_sample, seed)
+
+    rows = []
+    for eps in eps_values:
+        for m in min_samples_values:
+            labels = index.labels(eps, m)
+            mask = labels >= 0
+            clusters = len(np.unique(labels[mask]))
+            rows.append({
+                "eps":            eps,
+                "min_samples":    m,
+                "clusters":       clusters,
+                "noise":          int((~mask).sum()),
+                "noise_frac":     float((~mask).mean()),
+                "silhouette":     score(labels) if clusters > 1 else np.nan,
+                "davies_bouldin": _davies_bouldin(X[mask], labels[mask]) if clusters > 1 else np.nan,
+            })
+    return pd.DataFrame(rows).sort_values(["eps", "min_samples"], ignore_index=True)
@@ -0,0 +1,139 @@
+"""Event-study analysis on daily series (e.g. the VIZ 9 rain recovery curve).
+
+The series is laid out on a gap-free daily grid (per group, for station-level
+data), so the value ``k`` days after an event is a single array offset. The
+full events x offsets matrix is one fancy-indexing operation instead of a
+table scan per (event, offset)::
+
+    events = threshold_events(master, "precipitation", 5)          # rain > 5 mm
+    curve  = event_study(master, "aqi", events, window=(-5, 5))   # mean/std/n/CI per offset
+
+Triggers are any dates: ``threshold_events`` for weather (rain, wind, ...),
+or a plain list of festival / policy dates. ``threshold_sweep`` evaluates many
+thresholds from one matrix.
+"""
+import operator
+
+import numpy as np
+import pandas as pd
+from scipy import stats as st
+
+from .schema import DATE_COL
+
+OPS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "==": operator.eq}
+
+
+def _day_numbers(dates):
+    return pd.to_datetime(pd.Series(dates)).to_numpy("datetime64[D]").astype("int64")
+
+
+def threshold_events(frame, col, threshold, op=">", date_col=DATE_COL):
+    """Dates where ``frame[col] <op> threshold`` (missing values never trigger)."""
+    hit = OPS[op](frame[col], threshold).fillna(False).astype(bool)
+    return pd.DatetimeIndex(frame.loc[hit, date_col].unique())
+
+
+class DailyGrid:
+    """``value_col`` of ``frame`` on a gap-free daily grid, one block per group.
+
+    Expects at most one row per (group, day); missing days are NaN.
+    """
+
+    def __init__(self, frame, value_col, date_col=DATE_COL, by=None):
+        days = _day_numbers(frame[date_col])
+        if by is None:
+            codes, self.groups = np.zeros(len(frame), dtype="int64"), pd.Index([None])
+        else:
+            codes, self.groups = pd.factorize(frame[by], sort=True)
+            self.groups = pd.Index(self.groups, name=by)
+
+        n = len(self.groups)
+        self.first = pd.Series(days).groupby(codes).min().reindex(range(n)).to_numpy()
+        self.length = pd.Series(days).groupby(codes).max().reindex(range(n)).to_numpy() - self.first + 1
+        self.start = np.r_[0, np.cumsum(self.length)[:-1]]
+
+        self.values = np.full(int(self.length.sum()), np.nan)
+        self.values[self.start[codes] + days - self.first[codes]] = frame[value_col].to_numpy(dtype="float64")
+
+    def matrix(self, event_days, event_groups, offsets):
+        """Values at ``event_day + offset`` for each event; NaN outside the group's range."""
+        rel = (event_days - self.first[event_groups])[:, None] + offsets[None, :]
+        inside = (rel >= 0) & (rel < self.length[event_groups][:, None])
+        idx = np.where(inside, self.start[event_groups][:, None] + rel, 0)
+        return np.where(inside, self.values[idx], np.nan)
+
+
+def _event_index(grid, events, by):
+    """Expand ``events`` to (day, group code) pairs plus a display index."""
+    if isinstance(events, pd.DataFrame):
+        codes = grid.groups.get_indexer(events[by])
+        keep = codes >= 0
+        days = _day_numbers(events[DATE_COL])[keep]
+        index = pd.MultiIndex.from_arrays([events[by][keep].to_numpy(), pd.to_datetime(events[DATE_COL][keep])],
+                                          names=[by, DATE_COL])
+        return days, codes[keep], index
+
+    days = _day_numbers(events)
+    dates = pd.to_datetime(pd.Series(events)).to_numpy()
+    if by is None:
+        return days, np.zeros(len(days), dtype="int64"), pd.DatetimeIndex(dates, name=DATE_COL)
+    # Plain dates apply to every group (e.g. a city-wide rain day for each station).
+    g = len(grid.groups)
+    index = pd.MultiIndex.from_product([grid.groups, pd.DatetimeIndex(dates)], names=[by, DATE_COL])
+    return np.tile(days, g), np.repeat(np.arange(g), len(days)), index
+
+
+def event_matrix(frame, value_col, events, window=(-5, 5), date_col=DATE_COL, by=None):
+    """Events x offsets DataFrame of ``value_col`` around each event.
+
+    ``events`` is a list of dates, or for station-level data either dates (applied
+    to every group) or a DataFrame with ``by`` and ``date`` columns.
+    """
+    grid = DailyGrid(frame, value_col, date_col, by)
+    offsets = np.arange(window[0], window[1] + 1)
+    days, codes, index = _event_index(grid, events, by)
+    return pd.DataFrame(grid.matrix(days, codes, offsets), index=index, columns=pd.Index(offsets, name="offset"))
+
+
+def summarize(matrix, ci=0.95):
+    """Per-offset mean, std, count and a t-based ``ci`` confidence band of the mean."""
+    values = np.asarray(matrix, dtype="float64")
+    n = (~np.isnan(values)).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(values, axis=0) / n
+        std = np.sqrt(np.nansum((values - mean) ** 2, axis=0) / (n - 1))
+        sem = std / np.sqrt(n)
+        half = st.t.ppf(0.5 + ci / 2, np.maximum(n - 1, 1)) * sem
+    out = pd.DataFrame({"offset": np.asarray(matrix.columns), "mean": mean, "std": std, "n": n,
+                        "sem": sem, "ci_low": mean - half, "ci_high": mean + half})
+    out.loc[n == 0, ["mean", "std", "sem", "ci_low", "ci_high"]] = np.nan
+    return out
+
+
+def event_study(frame, value_col, events, window=(-5, 5), ci=0.95, date_col=DATE_COL, by=None):
+    """Event-study curve of ``value_col`` around ``events``: one row per offset."""
+    return summarize(event_matrix(frame, value_col, events, window, date_col, by), ci)
+
+
+def threshold_sweep(frame, value_col, trigger_col, thresholds, window=(-5, 5), op=">", ci=0.95,
+                    date_col=DATE_COL, by=None):
+    """Event-study curves for several trigger thresholds, built from a single matrix.
+
+    Returns a long frame with a ``threshold`` column plus the ``summarize`` columns.
+    """
+    thresholds = sorted(thresholds)
+    loosest = thresholds[0] if op in (">", ">=") else thresholds[-1]
+    triggers = frame.loc[OPS[op](frame[trigger_col], loosest).fillna(False).astype(bool), [date_col, trigger_col]]
+    triggers = triggers.groupby(date_col)[trigger_col].max() if op in (">", ">=") \
+        else triggers.groupby(date_col)[trigger_col].min()
+
+    matrix = event_matrix(frame, value_col, triggers.index, window, date_col, by)
+    event_dates = matrix.index.get_level_values(DATE_COL) if by is not None else matrix.index
+    level = triggers.reindex(event_dates).to_numpy()
+
+    curves = []
+    for t in thresholds:
+        curve = summarize(matrix[OPS[op](level, t)], ci)
+        curve.insert(0, "threshold", t)
+        curves.append(curve)
+    return pd.concat(curves, ignore_index=True)
@@ -0,0 +1,41 @@
+"""Plotly figures exported by the notebooks and rendered by the app.
+
+Figures are saved as Plotly JSON specs (``data/figures/<name>.json``) rather
+than standalone HTML. A standalone HTML file bundles its own copy of plotly.js
+(several MB), and embedding eleven of them shipped eleven copies to the browser
+on every rerun. The app instead passes the spec to ``st.plotly_chart`` so the
+frontend's single plotly.js renders every figure.
+"""
+import json
+import os
+
+from .loader import cached_read
+from .paths import FIGURES_DIR
+
+
+def figure_path(name, figures_dir=FIGURES_DIR):
+    return os.path.join(figures_dir, f"{name}.json")
+
+
+def export_figure(fig, name, figures_dir=FIGURES_DIR):
+    """Write ``fig`` as a Plotly JSON spec; used by the notebook visualization cells."""
+    os.makedirs(figures_dir, exist_ok=True)
+    path = figure_path(name, figures_dir)
+    fig.write_json(path)
+    return path
+
+
+def _read_spec(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_figure(name, figures_dir=FIGURES_DIR):
+    """Return the figure spec as a dict (cached per process), or None if it was never exported.
+
+    The dict is shared between sessions; ``st.plotly_chart`` only serializes it.
+    """
+    path = figure_path(name, figures_dir)
+    if not os.path.exists(path):
+        return None
+    return cached_read(path, _read_spec)
@@ -0,0 +1,278 @@
+"""Next-day to 7-day AQI forecasts from ``master_daily``.
+
+::
+
+    master   = read_dataset("master_daily", DATA_DIR)
+    result   = backtest(master)                   # walk-forward, one fold per test year
+    result.metrics                                # horizon, mae, rmse, r2, persistence_mae, skill, ...
+    model    = fit_forecaster(master)             # all history, horizons 1..7
+    model.predict(master)                         # date, horizon, aqi, aqi_category
+
+Features are computed for every day at once on a gap-free daily calendar
+(missing days are NaN, so a lag is always a calendar lag), with column-wise
+``shift`` / ``rolling`` / ``ewm``:
+
+* AQI and PM levels on the forecast day and 1, 2, 6, 13 and 364 days before
+* rolling AQI mean over 3/7/14/30 days, 7-day std/min/max, 7-day EWM, 1-day change
+* weather on the forecast day plus 7-day wind and 3-day rain totals
+* season: day-of-year and day-of-week harmonics of the forecast day and of
+  the target day (``origin + horizon``)
+
+Every feature at origin ``t`` uses data up to ``t`` only. There is one direct
+``HistGradientBoostingRegressor`` per horizon (it handles the NaNs from
+calendar gaps natively). Each model predicts the change from the current
+``level`` (today's AQI, or its 7-day EWM when today is missing) rather than
+the AQI itself. Shallow trees with an absolute-error loss keep the change
+model from chasing the heavy-tailed winter spikes, and make it beat
+persistence from day 1.
+
+Walk-forward folds train on every origin whose target precedes the test year
+and test on that year's origins. Folds are independent, so they run in a
+process pool with the feature matrix sent once per worker (as
+``clustering.kmeans_sweep`` does). ``persistence`` (every horizon = today's
+level) is scored alongside as the baseline.
+
+``Forecaster.predict`` rebuilds features for the last ``LOOKBACK_DAYS`` only.
+It then scores all horizons from one small array: the origin row repeated
+once per horizon, with that horizon's target-day harmonics appended.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor
+
+from .aqi import aqi_category
+from .schema import DATE_COL
+
+TARGET = "aqi"
+HORIZONS = range(1, 8)
+
+AQI_LAGS = [1, 2, 6, 13, 364]
+PM_LAGS = [1, 6]
+ROLLING_WINDOWS = [3, 7, 14, 30]
+WEATHER_COLS = ["temp_mean", "wind_speed_mean", "humidity_mean", "precipitation"]
+
+# Days of history ``Forecaster.predict`` needs for the longest lag.
+LOOKBACK_DAYS = max(AQI_LAGS) + 1
+
+MODEL_PARAMS = {"loss": "absolute_error", "max_iter": 100, "learning_rate": 0.1, "max_depth": 3,
+                "min_samples_leaf": 40, "l2_regularization": 1.0, "random_state": 42}
+
+
+def daily_calendar(frame, date_col=DATE_COL):
+    """``frame`` indexed by a gap-free daily ``DatetimeIndex`` (one row per day; missing days NaN)."""
+    frame = frame.drop_duplicates(date_col, keep="last").set_index(date_col).sort_index()
+    return frame.asfreq("D")
+
+
+def _harmonics(dates, prefix):
+    doy = 2 * np.pi * dates.dayofyear.to_numpy() / 365.25
+    dow = 2 * np.pi * dates.dayofweek.to_numpy() / 7
+    return {f"{prefix}doy_sin": np.sin(doy), f"{prefix}doy_cos": np.cos(doy),
+            f"{prefix}dow_sin": np.sin(dow), f"{prefix}dow_cos": np.cos(dow)}
+
+
+def forecast_features(daily):
+    """Origin features for every day of ``daily`` (output of ``daily_calendar``)."""
+    aqi = daily[TARGET].astype("float64")
+    cols = {"aqi": aqi, "aqi_diff1": aqi - aqi.shift(1)}
+    for lag in AQI_LAGS:
+        cols[f"aqi_lag{lag}"] = aqi.shift(lag)
+    for pm in ["pm25_avg", "pm10_avg"]:
+        cols[pm] = daily[pm]
+        for lag in PM_LAGS:
+            cols[f"{pm}_lag{lag}"] = daily[pm].shift(lag)
+    for w in ROLLING_WINDOWS:
+        cols[f"aqi_mean{w}"] = aqi.rolling(w, min_periods=1).mean()
+    week = aqi.rolling(7, min_periods=2)
+    cols.update(aqi_std7=week.std(), aqi_min7=week.min(), aqi_max7=week.max(),
+                aqi_ewm7=aqi.ewm(span=7, ignore_na=True).mean())
+    for col in WEATHER_COLS:
+        cols[col] = daily[col].astype("float64")
+    cols["wind_mean7"] = daily["wind_speed_mean"].rolling(7, min_periods=1).mean()
+    cols["rain_sum3"] = daily["precipitation"].rolling(3, min_periods=1).sum()
+    cols["level"] = aqi.fillna(cols["aqi_ewm7"])
+    features = pd.DataFrame(cols, index=daily.index)
+    return features.assign(**_harmonics(daily.index, ""))
+
+
+def horizon_matrix(features, horizon):
+    """``features`` plus the target-day harmonics for ``horizon`` days ahead."""
+    return features.assign(**_harmonics(features.index + pd.Timedelta(days=horizon), "target_"))
+
+
+def walk_forward_folds(index, first_test_year=2018):
+    """``(test_start, test_end)`` per calendar year from ``first_test_year`` to the last year in ``index``."""
+    years = range(first_test_year, index.max().year + 1)
+    return [(pd.Timestamp(year, 1, 1), pd.Timestamp(year, 12, 31)) for year in years]
+
+
+def _fit_horizon(X, y, params):
+    """Model of ``y - level`` on the rows where both are known (fitted on arrays, columns as in ``X``)."""
+    change = y - X["level"]
+    keep = change.notna().to_numpy()
+    return HistGradientBoostingRegressor(**params).fit(X[keep].to_numpy(), change[keep].to_numpy())
+
+
+def _predict_horizon(model, X):
+    return X["level"].to_numpy() + model.predict(X.to_numpy())
+
+
+def _run_fold(features, aqi, fold, horizons, params):
+    test_start, test_end = fold
+    out = []
+    for h in horizons:
+        X = horizon_matrix(features, h)
+        y = aqi.shift(-h)
+        target_day = X.index + pd.Timedelta(days=h)
+        train = target_day < test_start
+        test = ((X.index >= test_start) & (X.index <= test_end)
+                & y.notna().to_numpy() & features["level"].notna().to_numpy())
+        if not test.any() or not train.any():
+            continue
+        model = _fit_horizon(X[train], y[train], params)
+        out.append(pd.DataFrame({
+            "origin":      X.index[test],
+            "horizon":     h,
+            "fold":        test_start.year,
+            "actual":      y[test].to_numpy(),
+            "predicted":   _predict_horizon(model, X[test]),
+            "persistence": features["level"][test].to_numpy(),
+        }))
+    return pd.concat(out, ignore_index=True) if out else None
+
+
+# Worker-side state: the feature matrix is sent once per worker, not once per fold.
+_worker_data = None
+
+
+def _init_worker(features, aqi, threads):
+    global _worker_data
+    _worker_data = (features, aqi)
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(threads)  # keep workers x OpenMP threads within the cores
+
+
+def _fold_in_worker(fold, horizons, params):
+    return _run_fold(*_worker_data, fold, horizons, params)
+
+
+def _run_folds(features, aqi, folds, horizons, params, max_workers):
+    workers = min(len(folds), max_workers or os.cpu_count() or 1)
+    if workers < 2:
+        return [_run_fold(features, aqi, fold, horizons, params) for fold in folds]
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    # spawn, not fork: forking a process that already ran OpenMP code can deadlock.
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(features, aqi, threads)) as pool:
+        # Latest folds first: they have the most training rows, so the pool stays busy to the end.
+        futures = {fold: pool.submit(_fold_in_worker, fold, horizons, params) for fold in reversed(folds)}
+        return [futures[fold].result() for fold in folds]
+
+
+def _scores(group):
+    err = group["predicted"] - group["actual"]
+    base = group["persistence"] - group["actual"]
+    ss_tot = ((group["actual"] - group["actual"].mean()) ** 2).sum()
+    mae, persistence_mae = err.abs().mean(), base.abs().mean()
+    return pd.Series({
+        "n":                len(group),
+        "mae":              mae,
+        "rmse":             np.sqrt((err ** 2).mean()),
+        "r2":               1 - (err ** 2).sum() / ss_tot,
+        "persistence_mae":  persistence_mae,
+        "skill":            1 - mae / persistence_mae,
+        "category_accuracy": (aqi_category(group["predicted"]) == aqi_category(group["actual"])).mean(),
+    })
+
+
+@dataclass
+class Backtest:
+    """Walk-forward backtest output.
+
+    ``predictions``: one row per (origin, horizon) with ``actual``, ``predicted``
+    and ``persistence``. ``metrics``: scores per horizon over all folds.
+    ``fold_metrics``: the same per (fold, horizon).
+    """
+    predictions: pd.DataFrame
+    metrics: pd.DataFrame
+    fold_metrics: pd.DataFrame
+
+
+def backtest(frame, horizons=HORIZONS, first_test_year=2018, params=None, max_workers=None):
+    """Walk-forward backtest of the direct per-horizon models on ``frame`` (``master_daily``)."""
+    params = {**MODEL_PARAMS, **(params or {})}
+    daily = daily_calendar(frame)
+    features = forecast_features(daily)
+    folds = walk_forward_folds(daily.index, first_test_year)
+    parts = [p for p in _run_folds(features, daily[TARGET].astype("float64"), folds, list(horizons), params,
+                                   max_workers) if p is not None]
+    predictions = pd.concat(parts, ignore_index=True)
+    scored = ["actual", "predicted", "persistence"]
+    metrics = predictions.groupby("horizon")[scored].apply(_scores).astype({"n": "int64"})
+    fold_metrics = predictions.groupby(["fold", "horizon"])[scored].apply(_scores).astype({"n": "int64"})
+    return Backtest(predictions, metrics.reset_index(), fold_metrics.reset_index())
+
+
+@dataclass
+class Forecaster:
+    """Direct per-horizon models fitted on the full history (see ``fit_forecaster``)."""
+    models: dict
+    params: dict
+    trained_until: pd.Timestamp
+
+    def predict(self, frame, origin=None):
+        """AQI forecast for each horizon from ``origin`` (default: the last day of ``frame``).
+
+        Raises ``ValueError`` if ``origin`` is after the last day of ``frame``
+        or no AQI is known in the ``LOOKBACK_DAYS`` up to it.
+        """
+        dates = frame[DATE_COL]
+        origin = dates.max() if origin is None else pd.Timestamp(origin)
+        if origin > dates.max():
+            raise ValueError(f"origin {origin.date()} is after the last day of the data ({dates.max().date()})")
+        window = frame[(dates > origin - pd.Timedelta(days=LOOKBACK_DAYS)) & (dates <= origin)]
+        if window.empty:
+            raise ValueError(f"no data in the {LOOKBACK_DAYS} days up to origin {origin.date()}")
+        # Run the calendar through the origin itself, so a missing origin day is NaN rather than an earlier day.
+        daily = daily_calendar(window)
+        daily = daily.reindex(pd.date_range(daily.index[0], origin, freq="D"))
+        row = forecast_features(daily).iloc[-1]
+        if np.isnan(row["level"]):
+            raise ValueError(f"no AQI known in the {LOOKBACK_DAYS} days up to origin {origin.date()}")
+        horizons = sorted(self.models)
+        targets = origin + pd.to_timedelta(horizons, unit="D")
+        X = np.column_stack([np.tile(row.to_numpy(dtype="float64"), (len(horizons), 1)),
+                             *_harmonics(targets, "target_").values()])
+        aqi = row["level"] + np.array([self.models[h].predict(X[i:i + 1])[0] for i, h in enumerate(horizons)])
+        return pd.DataFrame({
+            "date":         targets,
+            "horizon":      horizons,
+            "aqi":          aqi,
+            "aqi_category": aqi_category(aqi),
+        })
+
+
+def fit_forecaster(frame, horizons=HORIZONS, params=None):
+    """One model per horizon, trained on every origin of ``frame`` with a known target."""
+    params = {**MODEL_PARAMS, **(params or {})}
+    daily = daily_calendar(frame)
+    features = forecast_features(daily)
+    aqi = daily[TARGET].astype("float64")
+    models = {h: _fit_horizon(horizon_matrix(features, h), aqi.shift(-h), params) for h in horizons}
+    return Forecaster(models, params, daily.index[-1])
+
+
+if __name__ == "__main__":
+    from .paths import DATA_DIR
+    from .storage import read_dataset
+
+    master = read_dataset("master_daily", DATA_DIR)
+    result = backtest(master)
+    print(result.metrics.round(3).to_string(index=False))
+    print()
+    print(fit_forecaster(master).predict(master).to_string(index=False))
@@ -0,0 +1,175 @@
+"""Vectorized gap-filling strategies.
+
+Each strategy takes a frame and a column and returns the filled column; ``impute``
+applies a per-column plan of strategies in order::
+
+    impute(aq_daily, {"pm10_avg": [("interpolate", {"limit": 7}), ("seasonal_median", {})]})
+    impute(aq_raw,   {"value": [("group_mean", {"by": ["sensor_id", "parameter"]})]})
+
+Strategies:
+
+* ``interpolate``      — linear interpolation over at most ``limit`` consecutive
+  missing values, optionally within groups (``by``). Same values as pandas
+  ``Series.interpolate(method="linear", limit=...)`` on each group.
+* ``seasonal_median``  — median of the same calendar month.
+* ``group_mean``       — mean of the group (e.g. per sensor + parameter).
+* ``climatology``      — per-station statistic of the same calendar period
+  (month, day of year or hour, or several of them for hourly data).
+
+No strategy runs Python per row or per group over the whole frame, so they
+scale to station-level hourly data. Rows are expected in date order within
+each group (as written by ``storage.write_dataset``).
+"""
+import numpy as np
+import pandas as pd
+
+from .schema import DATE_COL
+
+
+def _group_codes(frame, by):
+    if by is None:
+        return np.zeros(len(frame), dtype="int64")
+    keys = [by] if isinstance(by, str) else list(by)
+    return frame.groupby(keys, sort=False, observed=True, dropna=False).ngroup().to_numpy()
+
+
+def _group_order(groups):
+    """Stable permutation that makes each group contiguous (``None`` if it already is)."""
+    if len(groups) < 2 or (groups[1:] >= groups[:-1]).all():
+        return None
+    # Narrow codes let numpy use its O(n) radix sort for the stable argsort.
+    return np.argsort(groups.astype(np.min_scalar_type(groups.max())), kind="stable")
+
+
+def interpolate(frame, col, limit=None, by=None):
+    """Linear interpolation (positions treated as equally spaced), filling at most
+    ``limit`` values forward into each gap. Trailing gaps take the last value and
+    leading gaps stay missing, as with pandas."""
+    values = frame[col].to_numpy(dtype="float64")
+    groups = _group_codes(frame, by)
+    order = _group_order(groups)
+    v, g = (values, groups) if order is None else (values[order], groups[order])
+    n = len(v)
+    pos = np.arange(n)
+    valid = ~np.isnan(v)
+    first = np.r_[True, g[1:] != g[:-1]]
+    last = np.r_[first[1:], True]
+
+    # Nearest valid row before/after each missing row, not crossing group edges:
+    # an edge row that is itself missing is returned to mean "none".
+    gaps = np.flatnonzero(~valid)
+    prev = np.maximum.accumulate(np.where(valid | first, pos, 0))[gaps]
+    nxt = np.minimum.accumulate(np.where(valid | last, pos, n)[::-1])[::-1][gaps]
+
+    fill = valid[prev]
+    if limit is not None:
+        fill &= (gaps - prev) <= limit
+    x, p, q = gaps[fill], prev[fill], nxt[fill]
+    interior = valid[q]
+    filled = v[p]                                          # trailing gaps: last value
+    x, p, q = x[interior], p[interior], q[interior]
+    # Same expression as np.interp, which pandas uses for method="linear".
+    slope = (v[q] - v[p]) / (q - p)
+    filled[interior] = slope * (x - p) + v[p]
+    out = v.copy()
+    out[gaps[fill]] = filled
+
+    if order is not None:
+        result = np.empty(n)
+        result[order] = out
+        out = result
+    return pd.Series(out, index=frame.index, name=col)
+
+
+def _fill_from(frame, col, stat):
+    return frame[col].fillna(pd.Series(stat, index=frame.index))
+
+
+def group_stat(frame, col, by, stat="median"):
+    """Fill ``col`` with ``stat`` ("median" or "mean") of its group.
+
+    The mean is one ``np.add.reduceat`` over the rows sorted by group, so it matches
+    ``transform(lambda x: x.fillna(x.mean()))`` up to floating-point rounding.
+    """
+    if stat == "median":
+        keys = by if isinstance(by, list) else [by]
+        stats = frame.groupby(keys, sort=False, observed=True)[col].transform("median")
+        return frame[col].fillna(stats)
+    if stat != "mean":
+        raise ValueError(f"Unknown stat {stat!r}; expected 'median' or 'mean'")
+
+    values = frame[col].to_numpy(dtype="float64")
+    if not np.isnan(values).any():
+        return frame[col].copy()
+    groups = _group_codes(frame, by)
+    order = _group_order(groups)
+    v, g = (values, groups) if order is None else (values[order], groups[order])
+    bounds = np.flatnonzero(np.r_[True, g[1:] != g[:-1], True])
+    gaps = np.isnan(v)
+    zeroed = np.where(gaps, 0.0, v)
+    counts = np.add.reduceat((~gaps).astype("int64"), bounds[:-1])
+    has_gap = np.add.reduceat(gaps.astype("int64"), bounds[:-1]) > 0
+
+    sums = np.add.reduceat(zeroed, bounds[:-1])
+    means = np.where(has_gap & (counts > 0), sums / np.maximum(counts, 1), np.nan)
+    stat_values = np.repeat(means, np.diff(bounds))
+    if order is not None:
+        unsorted = np.empty(len(values))
+        unsorted[order] = stat_values
+        stat_values = unsorted
+    return _fill_from(frame, col, stat_values)
+
+
+def group_mean(frame, col, by):
+    return group_stat(frame, col, by, "mean")
+
+
+CALENDAR_KEYS = {
+    "month":     lambda d: d.dt.month,
+    "dayofyear": lambda d: d.dt.dayofyear,
+    "hour":      lambda d: d.dt.hour,
+}
+
+
+def _calendar(frame, period, date_col):
+    periods = [period] if isinstance(period, str) else list(period)
+    return {f"_{p}": CALENDAR_KEYS[p](frame[date_col]) for p in periods}
+
+
+def seasonal_median(frame, col, date_col=DATE_COL):
+    """Fill with the median of the same calendar month (across all years)."""
+    keyed = frame[[col]].assign(**_calendar(frame, "month", date_col))
+    return group_stat(keyed, col, ["_month"], "median")
+
+
+def climatology(frame, col, by="sensor_id", period="month", stat="mean", date_col=DATE_COL):
+    """Fill with the per-station ``stat`` of the same calendar ``period``.
+
+    ``period`` is ``"month"``, ``"dayofyear"``, ``"hour"`` or a list of them
+    (``["month", "hour"]`` gives a diurnal cycle per month for hourly data).
+    """
+    stations = [by] if isinstance(by, str) else list(by)
+    calendar = _calendar(frame, period, date_col)
+    keyed = frame[stations + [col]].assign(**calendar)
+    return group_stat(keyed, col, stations + list(calendar), stat)
+
+
+STRATEGIES = {
+    "interpolate":     interpolate,
+    "seasonal_median": seasonal_median,
+    "group_mean":      group_mean,
+    "climatology":     climatology,
+}
+
+
+def impute(frame, plan):
+    """Return a copy of ``frame`` with each column in ``plan`` filled.
+
+    ``plan`` maps column -> list of ``(strategy, kwargs)``; strategies run in
+    order and each only fills what the previous ones left missing.
+    """
+    frame = frame.copy()
+    for col, steps in plan.items():
+        for name, kwargs in steps:
+            frame[col] = STRATEGIES[name](frame, col, **kwargs)
+    return frame
@@ -0,0 +1,194 @@
+"""Incremental, resumable ingestion driven by per-source watermarks.
+
+A watermark is the last date already stored for one source:
+
+* ``openaq/<sensor_id>`` — per OpenAQ sensor
+* ``trends/<keyword>``   — per Google Trends keyword
+* ``weather``            — the Open-Meteo archive
+
+Each ``refresh_*`` function fetches only the days after its watermarks,
+upserts them into the raw Parquet dataset (``storage.append_dataset``) and
+advances the watermark right after the data is written, batch by batch. A run
+that crashes midway therefore resumes from the last written batch.
+
+When a watermark is missing it is derived from the dataset already on disk, so
+the first incremental run over an existing ``data/raw`` fetches only new days.
+
+The Open-Meteo and pytrends clients stay in the notebook; ``refresh_weather``
+and ``refresh_trends`` take the fetch function as an argument.
+"""
+import json
+import os
+import threading
+from datetime import timedelta
+
+import pandas as pd
+
+from .openaq import fetch_sensors_daily
+from .paths import DATA_DIR_RAW, WATERMARKS_PATH
+from .storage import append_dataset, dataset_path, read_dataset
+
+TRENDS_CHUNK_DAYS = 75
+
+
+def _day(value):
+    return pd.Timestamp(value).date()
+
+
+class WatermarkStore:
+    """Source key -> last stored date (ISO string), persisted as JSON after every update."""
+
+    def __init__(self, path=WATERMARKS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.marks = json.load(f)
+        except FileNotFoundError:
+            self.marks = {}
+
+    def get(self, key):
+        return self.marks.get(key)
+
+    def update(self, marks):
+        """Set several watermarks at once; never moves a watermark backwards."""
+        with self._lock:
+            for key, value in marks.items():
+                value = _day(value).isoformat()
+                if self.marks.get(key) is None or value > self.marks[key]:
+                    self.marks[key] = value
+            # Write-then-rename so a crash never leaves a truncated file.
+            tmp = f"{self.path}.tmp"
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.marks, f, indent=2, sort_keys=True)
+            os.replace(tmp, self.path)
+
+    def next_start(self, key, default, overlap_days=0):
+        """First date to fetch for ``key``: the day after its watermark, minus ``overlap_days``."""
+        mark = self.get(key)
+        if mark is None:
+            return _day(default)
+        return max(_day(default), _day(mark) + timedelta(days=1 - overlap_days))
+
+
+def _seed(store, keys_and_dates):
+    missing = {k: d for k, d in keys_and_dates.items() if store.get(k) is None and pd.notna(d)}
+    if missing:
+        store.update(missing)
+
+
+def _stored(name, directory, columns=None):
+    if not os.path.exists(dataset_path(name, directory)):
+        return None
+    return read_dataset(name, directory, columns=columns)
+
+
+async def refresh_openaq(stations, start_date, end_date, store, directory=DATA_DIR_RAW,
+                         batch_size=20, overlap_days=1, **fetch_kwargs):
+    """Fetch and append new OpenAQ days for every sensor in ``stations``.
+
+    ``overlap_days=1`` re-pulls each sensor's last stored day, whose daily
+    aggregate may have been partial. Sensors are processed ``batch_size`` at a
+    time; a sensor's watermark only moves if all its pages succeeded.
+    Returns the list of ``FetchFailure`` records.
+    """
+    existing = _stored("openaq_raw", directory, ["date", "sensor_id"])
+    if existing is not None:
+        _seed(store, {f"openaq/{s}": d for s, d in existing.groupby("sensor_id")["date"].max().items()})
+
+    end = _day(end_date)
+    todo = []
+    for sensor in (stations.to_dict("records") if isinstance(stations, pd.DataFrame) else stations):
+        start = store.next_start(f"openaq/{sensor['sensor_id']}", start_date, overlap_days)
+        if start <= end:
+            todo.append((start, sensor))
+
+    failures = []
+    for i in range(0, len(todo), batch_size):
+        batch = todo[i:i + batch_size]
+        # One concurrent fetch per distinct start date (usually just one per batch).
+        frames = []
+        for start in sorted({s for s, _ in batch}):
+            sensors = [sensor for s, sensor in batch if s == start]
+            result = await fetch_sensors_daily(sensors, start.isoformat(), end.isoformat(), **fetch_kwargs)
+            frames.append(result.to_frame())
+            failures.extend(result.failures)
+
+        new = pd.concat(frames, ignore_index=True)
+        if len(new):
+            append_dataset(new, "openaq_raw", directory, key=("date", "sensor_id"))
+        failed = {f.sensor_id for f in failures}
+        store.update({f"openaq/{s}": d for s, d in new.groupby("sensor_id")["date"].max().items()
+                      if s not in failed})
+    return failures
+
+
+def refresh_weather(fetch, start_date, end_date, store, directory=DATA_DIR_RAW, overlap_days=0):
+    """Fetch weather after the ``weather`` watermark with ``fetch(start, end) -> DataFrame`` and append it.
+
+    Returns the number of new rows.
+    """
+    existing = _stored("weather_daily", directory, ["date"])
+    if existing is not None and len(existing):
+        _seed(store, {"weather": existing["date"].max()})
+
+    start = store.next_start("weather", start_date, overlap_days)
+    end = _day(end_date)
+    if start > end:
+        return 0
+    new = fetch(start.isoformat(), end.isoformat())
+    # The archive lags a few days behind; don't checkpoint past the last day with values.
+    has_data = new.drop(columns=["date"]).notna().any(axis=1)
+    if not has_data.any():
+        return 0
+    new = new[new["date"] <= new.loc[has_data, "date"].max()]
+    append_dataset(new, "weather_daily", directory)
+    store.update({"weather": new["date"].max()})
+    return len(new)
+
+
+def trends_column(keyword):
+    return keyword.replace(" ", "_")
+
+
+def trends_chunks(start, end, days=TRENDS_CHUNK_DAYS):
+    """Consecutive, non-overlapping ``(start, stop)`` date windows covering ``start..end``."""
+    start, end = _day(start), _day(end)
+    while start <= end:
+        stop = min(start + timedelta(days=days), end)
+        yield start, stop
+        start = stop + timedelta(days=1)
+
+
+def refresh_trends(fetch_chunk, keywords, start_date, end_date, store, directory=DATA_DIR_RAW):
+    """Fetch Google Trends per keyword in windows after each ``trends/<keyword>`` watermark.
+
+    ``fetch_chunk(keyword, start, stop)`` returns a DataFrame indexed by date
+    with a ``keyword`` column (``TrendReq.interest_over_time`` output). Every
+    window is appended and checkpointed before the next one; on an error the
+    keyword stops and resumes from that window on the next run.
+    Returns ``{keyword: error}`` for keywords that stopped early.
+    """
+    existing = _stored("google_trends_daily", directory)
+    if existing is not None:
+        _seed(store, {f"trends/{kw}": existing.loc[existing[trends_column(kw)].notna(), "date"].max()
+                      for kw in keywords if trends_column(kw) in existing.columns})
+
+    errors = {}
+    for kw in keywords:
+        key = f"trends/{kw}"
+        for start, stop in trends_chunks(store.next_start(key, start_date), end_date):
+            try:
+                df = fetch_chunk(kw, start.isoformat(), stop.isoformat())
+            except Exception as e:
+                errors[kw] = f"{start} → {stop}: {e}"
+                break
+            if df is None or df.empty or kw not in df.columns:
+                continue  # nothing published (yet) for this window; retried next run
+            chunk = df[[kw]].rename(columns={kw: trends_column(kw)})
+            chunk = chunk[~chunk.index.duplicated(keep="first")].rename_axis("date").reset_index()
+            chunk["date"] = pd.to_datetime(chunk["date"])
+            append_dataset(chunk, "google_trends_daily", directory)
+            store.update({key: chunk["date"].max()})
+    return errors
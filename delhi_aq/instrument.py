@@ -0,0 +1,291 @@
+"""Timers for the Streamlit app: where a rerun spends its time.
+
+The app opens a ``Rerun`` at the top of the script and closes it after the
+page has run. In between, sections, data loads and embeds record their wall
+time::
+
+    rerun = instrument.begin_rerun(session=st.session_state["timings"])
+    instrument.set_page("Data Exploration")
+    instrument.section("4. Summary Statistics")        # lap: runs until the next section() or end_rerun()
+    with instrument.timer("figure:pm25_trend"):        # explicit block
+        ...
+    load_aggregate = instrument.timed(load_aggregate)  # every call, labelled "load_aggregate:<first arg>"
+    instrument.end_rerun()                             # -> Rerun (timings of this rerun, in order)
+
+A closed rerun keeps its own breakdown (``Rerun.table``) and is added to two
+``Recorder``s of fixed-bucket histograms: the session's (kept in
+``st.session_state`` by the app) and the process-wide ``PROCESS``. With ``DELHI_AQ_TIMING_EXPORT`` set, every rerun
+is also exported to that file: Prometheus text exposition for a ``.prom``
+path (rewritten atomically, for a node_exporter textfile collector), one JSON
+object per rerun for any other path (appended).
+
+Timing is on for every session when ``DELHI_AQ_TIMING=1``; the app also turns
+it on for one session with ``?diagnostics=1``, which shows the panel. When
+no rerun is open, ``timer`` returns a shared no-op context manager and a
+``timed`` function makes one thread-local lookup before calling through. That
+costs well under a microsecond per call. A rerun makes a few dozen such calls
+and takes 100 ms or more, so the disabled overhead is far below 1%
+(``benchmarks/bench_instrument.py`` measures it).
+
+Streamlit runs each session's script in its own thread, so the open rerun is
+kept thread-local and sessions never record into each other.
+"""
+import bisect
+import contextlib
+import functools
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+ENABLED = os.environ.get("DELHI_AQ_TIMING", "") not in ("", "0")
+EXPORT_PATH = os.environ.get("DELHI_AQ_TIMING_EXPORT") or None
+
+# Upper bounds (seconds) of the histogram buckets; one more bucket catches everything slower.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+RERUN = "rerun"          # timing name of a whole rerun
+METRIC = "delhi_aq_app_seconds"
+
+
+class Histogram:
+    """Counts per ``BUCKETS`` bucket, plus count, sum and max of the observations."""
+
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the ``q`` quantile (the max if that is lower, or for the last bucket)."""
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Recorder:
+    """One ``Histogram`` per timing name; shared by the threads of a session or of the process."""
+
+    def __init__(self):
+        self.histograms = {}
+        self.reruns = 0
+        self._lock = threading.Lock()
+
+    def add(self, rerun):
+        with self._lock:
+            self.reruns += 1
+            for name, seconds in rerun.totals().items():
+                histogram = self.histograms.get(name)
+                if histogram is None:
+                    histogram = self.histograms[name] = Histogram()
+                histogram.observe(seconds)
+
+    def table(self):
+        """count, mean, p50, p95, max and total (ms) per name, slowest total first."""
+        with self._lock:
+            rows = [{"name": name, "count": h.count, "mean_ms": 1000 * h.sum / h.count,
+                     "p50_ms": 1000 * h.quantile(0.5), "p95_ms": 1000 * h.quantile(0.95),
+                     "max_ms": 1000 * h.max, "total_ms": 1000 * h.sum}
+                    for name, h in self.histograms.items()]
+        columns = ["name", "count", "mean_ms", "p50_ms", "p95_ms", "max_ms", "total_ms"]
+        return pd.DataFrame(rows, columns=columns).sort_values("total_ms", ascending=False, ignore_index=True)
+
+
+@dataclass
+class Rerun:
+    """The timings of one script run, in the order they finished."""
+    page: str = None
+    started_at: float = field(default_factory=time.time)
+    timings: list = field(default_factory=list)     # (name, seconds)
+    seconds: float = math.nan
+    _t0: float = field(default_factory=time.perf_counter, repr=False)
+    _section: tuple = field(default=None, repr=False)
+
+    def record(self, name, seconds):
+        self.timings.append((name, seconds))
+
+    def totals(self):
+        """Seconds per name within this rerun (a name timed several times is summed)."""
+        out = {}
+        for name, seconds in self.timings:
+            out[name] = out.get(name, 0.0) + seconds
+        return out
+
+    def table(self):
+        totals = self.totals()
+        calls = pd.Series([name for name, _ in self.timings]).value_counts()
+        frame = pd.DataFrame({"name": list(totals), "calls": [int(calls[n]) for n in totals],
+                              "ms": [1000 * s for s in totals.values()]})
+        return frame.sort_values("ms", ascending=False, ignore_index=True)
+
+
+class _Local(threading.local):
+    rerun = None
+    recorders = ()
+
+
+_local = _Local()
+PROCESS = Recorder()
+
+
+def active():
+    """Whether this thread has an open rerun (i.e. timings are being recorded)."""
+    return _local.rerun is not None
+
+
+def begin_rerun(session=None, page=None):
+    """Open a rerun on this thread; it is added to ``session`` (a ``Recorder``) and ``PROCESS`` when it ends."""
+    rerun = Rerun(page=page)
+    _local.rerun = rerun
+    _local.recorders = (PROCESS,) if session is None else (session, PROCESS)
+    return rerun
+
+
+def set_page(page):
+    if _local.rerun is not None:
+        _local.rerun.page = page
+
+
+def _close_section(rerun, now):
+    if rerun._section is not None:
+        name, t0 = rerun._section
+        rerun.record(name, now - t0)
+        rerun._section = None
+
+
+def section(name):
+    """Close the open section of this rerun (if any) and start ``name`` (prefixed with the page)."""
+    rerun = _local.rerun
+    if rerun is None:
+        return
+    now = time.perf_counter()
+    _close_section(rerun, now)
+    rerun._section = (f"{rerun.page}/{name}" if rerun.page else name, now)
+
+
+def end_rerun(export_path=EXPORT_PATH):
+    """Close this thread's rerun, add it to its recorders and export it; returns it (None if none was open)."""
+    rerun = _local.rerun
+    if rerun is None:
+        return None
+    now = time.perf_counter()
+    _close_section(rerun, now)
+    rerun.seconds = now - rerun._t0
+    rerun.record(RERUN, rerun.seconds)
+    for recorder in _local.recorders:
+        recorder.add(rerun)
+    _local.rerun, _local.recorders = None, ()
+    if export_path:
+        export(rerun, export_path)
+    return rerun
+
+
+class _Timer:
+    __slots__ = ("rerun", "name", "t0")
+
+    def __init__(self, rerun, name):
+        self.rerun = rerun
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.rerun.record(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+_NULL = contextlib.nullcontext()
+
+
+def timer(name):
+    """Context manager timing its block as ``name`` (a shared no-op when no rerun is open)."""
+    rerun = _local.rerun
+    if rerun is None:
+        return _NULL
+    return _Timer(rerun, name)
+
+
+def timed(fn, name=None):
+    """Wrap ``fn`` so each call is timed as ``<name>:<first argument>`` (``name`` defaults to ``fn.__name__``)."""
+    name = name or fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        rerun = _local.rerun
+        if rerun is None:
+            return fn(*args, **kwargs)
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            rerun.record(f"{name}:{args[0]}" if args else name, time.perf_counter() - t0)
+
+    return wrapper
+
+
+# ── Export ───────────────────────────────────────────────────────────────────
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(recorder=PROCESS, metric=METRIC):
+    """``recorder`` in the Prometheus text exposition format (one histogram series per name)."""
+    lines = [f"# HELP {metric} Wall time of Streamlit app reruns, sections and data loads.",
+             f"# TYPE {metric} histogram"]
+    with recorder._lock:
+        items = sorted((name, list(h.counts), h.count, h.sum) for name, h in recorder.histograms.items())
+    for name, counts, count, total in items:
+        label = f'name="{_label(name)}"'
+        cumulative = 0
+        for bound, n in zip(BUCKETS, counts):
+            cumulative += n
+            lines.append(f'{metric}_bucket{{{label},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {count}')
+        lines.append(f"{metric}_sum{{{label}}} {total:.6f}")
+        lines.append(f"{metric}_count{{{label}}} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def rerun_record(rerun):
+    """One rerun as a JSON-ready dict: when, which page, total and per-name seconds."""
+    return {"time": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(rerun.started_at)),
+            "page": rerun.page, "seconds": round(rerun.seconds, 6),
+            "timings": {name: round(s, 6) for name, s in rerun.totals().items() if name != RERUN}}
+
+
+_export_lock = threading.Lock()
+
+
+def export(rerun, path):
+    """Rewrite ``path`` with ``PROCESS`` as Prometheus text (``.prom``), or append ``rerun`` as a JSON line."""
+    with _export_lock:
+        if path.endswith(".prom"):
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(prometheus_text(PROCESS))
+            os.replace(tmp, path)
+        else:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(rerun_record(rerun)) + "\n")
@@ -0,0 +1,82 @@
+"""Process-wide cache for the project datasets.
+
+Streamlit re-executes ``webapp.py`` on every widget interaction, but imported
+modules live for the whole server process. Each dataset is therefore parsed
+once here and the same frame is handed to every tab and every session. A file
+is re-parsed only when its stat signature (mtime, size) changes *and* its
+content hash differs, so a ``touch`` or a re-save of identical data is free.
+
+Returned frames are shared between sessions: treat them as read-only and
+``.copy()`` before adding columns.
+"""
+import hashlib
+import os
+import threading
+
+from .paths import DATA_DIR, DATA_DIR_PROCESSED, DATA_DIR_RAW
+from .storage import dataset_path, read_parquet
+
+# Loader name -> (dataset name, directory) of the canonical Parquet file.
+DATASETS = {
+    "master":      ("master_daily", DATA_DIR),
+    "air_quality": ("air_quality_daily", DATA_DIR_PROCESSED),
+    "openaq":      ("openaq_raw", DATA_DIR_PROCESSED),
+    "weather":     ("weather_daily", DATA_DIR_PROCESSED),
+    "trends":      ("google_trends_daily", DATA_DIR_RAW),
+}
+
+# path -> (stat signature, content hash, parsed value)
+_cache = {}
+_lock = threading.Lock()
+
+
+def file_signature(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cached_read(path, reader):
+    """Return ``reader(path)``, re-running it only if the file at ``path`` changed."""
+    signature = file_signature(path)
+
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[2]
+
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[2]
+
+        digest = file_hash(path)
+        if cached is not None and cached[1] == digest:
+            # Touched but unchanged: keep the parsed value, remember the new stat.
+            _cache[path] = (signature, digest, cached[2])
+            return cached[2]
+
+        value = reader(path)
+        _cache[path] = (signature, digest, value)
+        return value
+
+
+def load_dataset(name):
+    """Return the cached frame for ``name``, re-reading it only if the file changed."""
+    dataset, directory = DATASETS[name]
+    return cached_read(dataset_path(dataset, directory), lambda p: read_parquet(p, dataset))
+
+
+def load_master():
+    return load_dataset("master")
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
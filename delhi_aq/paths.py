@@ -0,0 +1,21 @@
+import os
+
+# Resolve everything from the repository root so the app and the notebooks
+# agree on locations regardless of the working directory they start in.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_DIR           = os.path.join(REPO_ROOT, "data")
+DATA_DIR_RAW       = os.path.join(DATA_DIR, "raw")
+DATA_DIR_PROCESSED = os.path.join(DATA_DIR, "processed")
+FIGURES_DIR        = os.path.join(DATA_DIR, "figures")
+AGGREGATES_DIR     = os.path.join(DATA_DIR, "aggregates")
+IMAGES_DIR         = os.path.join(REPO_ROOT, "images")
+MODELS_DIR         = os.path.join(DATA_DIR, "models")
+MODEL_CACHE_DIR    = os.path.join(DATA_DIR, "cache", "models")
+GRIDS_DIR          = os.path.join(DATA_DIR, "grids")
+REPORTS_DIR        = os.path.join(DATA_DIR, "reports")
+
+MASTER_CSV     = os.path.join(DATA_DIR, "master_daily.csv")
+MASTER_PARQUET = os.path.join(DATA_DIR, "master_daily.parquet")
+
+WATERMARKS_PATH = os.path.join(DATA_DIR_RAW, "watermarks.json")
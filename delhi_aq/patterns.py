@@ -0,0 +1,198 @@
+"""Frequent itemsets and association rules on categorical columns, via packed bitsets.
+
+Each row is a transaction holding one item per column (``pm25_bin=PM25_Severe``,
+``season=Winter``, ...). Every item is stored as a bitset over the rows, packed
+64 rows per ``uint64`` word, so the support of an itemset is the popcount of the
+AND of its items' bitsets. The search is depth-first (Eclat): each prefix keeps
+its own bitset and scores all its extensions with a single vectorized AND +
+popcount. Items of the same column never co-occur, so they are never combined.
+
+::
+
+    tx       = encode(final_df, ["pm25_bin", "temp_bin", ..., "aqi_category"])
+    itemsets = frequent_itemsets(tx, min_support=0.005)         # support, itemsets
+    rules    = top_rules(itemsets, k=10, by="lift", min_confidence=0.6)
+
+The output columns match ``mlxtend.frequent_patterns`` (``apriori`` and
+``association_rules``) with item names as ``pd.get_dummies`` spells them
+(``<column>_<value>``), so existing plotting code keeps working.
+
+``iter_rules`` generates rules lazily, one itemset at a time, so a low support
+threshold never needs the full rule table in memory. ``top_rules`` keeps only
+the best ``k`` and skips itemsets whose rules cannot beat the current k-th
+lift: ``lift(A -> C) = s(A ∪ C) / (s(A) s(C)) <= 1 / max(s(A), s(C))``.
+"""
+import heapq
+from dataclasses import dataclass
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+MISSING = "Unknown"
+
+RULE_COLUMNS = ["antecedents", "consequents", "antecedent support", "consequent support",
+                "support", "confidence", "lift", "leverage", "conviction"]
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(words):
+        return np.bitwise_count(words).sum(axis=-1, dtype="int64")
+else:  # numpy < 2.0
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype="uint8")
+
+    def _popcount(words):
+        return _BYTE_COUNTS[words.view("uint8")].sum(axis=-1, dtype="int64")
+
+
+@dataclass
+class Transactions:
+    """Items of a categorical frame as packed row bitsets.
+
+    ``items`` has one row per item (``column``, ``value``, ``name``, ``count``);
+    ``bits[i]`` is the bitset of item ``i``.
+    """
+    items: pd.DataFrame
+    bits: np.ndarray
+    n_rows: int
+
+
+def encode(frame, columns=None, missing=MISSING):
+    """Pack ``columns`` of ``frame`` (default: all) into item bitsets.
+
+    Missing values become the ``missing`` item, as the notebook's ``fillna('Unknown')``.
+    """
+    columns = list(frame.columns if columns is None else columns)
+    n = len(frame)
+    words = -(-n // 64)
+    items, bits = [], []
+    for col in columns:
+        codes, values = pd.factorize(frame[col].astype("object").where(frame[col].notna(), missing), sort=True)
+        onehot = np.zeros((len(values), words * 64), dtype=bool)
+        onehot[codes, np.arange(n)] = True
+        # Little-endian bit order, so bit r of the bitset (word r // 64) is row r.
+        bits.append(np.packbits(onehot, axis=1, bitorder="little").view("uint64"))
+        items.extend({"column": col, "value": v, "name": f"{col}_{v}"} for v in values)
+    items = pd.DataFrame(items)
+    bits = np.concatenate(bits) if bits else np.zeros((0, words), dtype="uint64")
+    items["count"] = _popcount(bits)
+    return Transactions(items, bits, n)
+
+
+def frequent_itemsets(tx, min_support=0.05, max_len=None):
+    """All itemsets with support >= ``min_support`` (a fraction of rows).
+
+    Returns ``support`` and ``itemsets`` (frozensets of item names), like
+    ``mlxtend.apriori(..., use_colnames=True)``.
+    """
+    min_count = int(np.ceil(min_support * tx.n_rows - 1e-9))
+    min_count = max(min_count, 1)
+    column = pd.factorize(tx.items["column"])[0]
+    names = tx.items["name"].to_numpy()
+
+    frequent = np.flatnonzero(tx.items["count"].to_numpy() >= min_count)
+    found_items, found_counts = [(i,) for i in frequent], list(tx.items["count"].to_numpy()[frequent])
+
+    # Depth-first: (prefix items, prefix bitset, candidate extension items).
+    stack = [((i,), tx.bits[i], frequent[column[frequent] > column[i]]) for i in frequent[::-1]]
+    while stack:
+        prefix, bitset, candidates = stack.pop()
+        if not len(candidates) or (max_len is not None and len(prefix) >= max_len):
+            continue
+        joined = tx.bits[candidates] & bitset
+        counts = _popcount(joined)
+        keep = np.flatnonzero(counts >= min_count)
+        for j in keep[::-1]:
+            item = candidates[j]
+            itemset = prefix + (item,)
+            found_items.append(itemset)
+            found_counts.append(counts[j])
+            rest = candidates[keep[keep > j]]
+            stack.append((itemset, joined[j], rest[column[rest] != column[item]]))
+
+    return pd.DataFrame({
+        "support":  np.asarray(found_counts, dtype="float64") / tx.n_rows,
+        "itemsets": [frozenset(names[list(s)]) for s in found_items],
+    })
+
+
+def _support_lookup(itemsets):
+    return dict(zip(itemsets["itemsets"], itemsets["support"]))
+
+
+def _allowed(consequents):
+    """Predicate on a consequent frozenset: every item starts with one of ``consequents`` (column prefixes)."""
+    if consequents is None:
+        return None
+    prefixes = tuple(f"{c}_" for c in ([consequents] if isinstance(consequents, str) else consequents))
+    return lambda items: all(i.startswith(prefixes) for i in items)
+
+
+def _rule(ante, cons, s_xy, s_x, s_y):
+    confidence = s_xy / s_x
+    return (ante, cons, s_x, s_y, s_xy, confidence, confidence / s_y, s_xy - s_x * s_y,
+            np.inf if confidence == 1 else (1 - s_y) / (1 - confidence))
+
+
+def _itemset_rules(itemset, s_xy, support, allowed, min_confidence, max_consequent_len):
+    items = sorted(itemset)
+    top = len(items) - 1 if max_consequent_len is None else min(max_consequent_len, len(items) - 1)
+    for r in range(1, top + 1):
+        for cons in combinations(items, r):
+            cons = frozenset(cons)
+            if allowed is not None and not allowed(cons):
+                continue
+            ante = itemset - cons
+            s_x, s_y = support[ante], support[cons]
+            if s_xy / s_x >= min_confidence:
+                yield _rule(ante, cons, s_xy, s_x, s_y)
+
+
+def iter_rules(itemsets, min_confidence=0.6, consequents=None, max_consequent_len=None, min_lift=None):
+    """Lazily yield rules ``(antecedents, consequents, antecedent support, consequent support,
+    support, confidence, lift, leverage, conviction)`` from ``frequent_itemsets`` output.
+
+    ``consequents`` restricts the right-hand side to items of the given column(s)
+    (e.g. ``"aqi_category"``).
+    """
+    support = _support_lookup(itemsets)
+    allowed = _allowed(consequents)
+    for itemset, s_xy in zip(itemsets["itemsets"], itemsets["support"]):
+        if len(itemset) < 2:
+            continue
+        for rule in _itemset_rules(itemset, s_xy, support, allowed, min_confidence, max_consequent_len):
+            if min_lift is None or rule[6] >= min_lift:
+                yield rule
+
+
+def association_rules(itemsets, min_confidence=0.6, consequents=None, max_consequent_len=None, min_lift=None):
+    """All rules above ``min_confidence`` as a DataFrame with the core ``mlxtend.association_rules`` columns."""
+    rules = iter_rules(itemsets, min_confidence, consequents, max_consequent_len, min_lift)
+    return pd.DataFrame(list(rules), columns=RULE_COLUMNS)
+
+
+def top_rules(itemsets, k=10, by="lift", min_confidence=0.0, consequents=None, max_consequent_len=None):
+    """The ``k`` best rules by ``by`` ("lift", "confidence", "support" or "leverage"), best first.
+
+    Only a heap of ``k`` rules is kept. For ``by="lift"`` an itemset is skipped
+    once ``1 / s(itemset)`` (an upper bound on the lift of any of its rules)
+    cannot beat the current k-th best.
+    """
+    key = RULE_COLUMNS.index(by)
+    heap, seq = [], 0
+    support = _support_lookup(itemsets)
+    allowed = _allowed(consequents)
+    # Rarest itemsets first: they carry the highest lift bounds, so the heap fills with strong rules early.
+    order = itemsets.assign(_len=itemsets["itemsets"].map(len))
+    order = order[order["_len"] > 1].sort_values("support", kind="stable")
+    for itemset, s_xy in zip(order["itemsets"], order["support"]):
+        if by == "lift" and len(heap) == k and 1 / s_xy <= heap[0][0]:
+            break  # supports only grow from here, so every later bound is lower too
+        for rule in _itemset_rules(itemset, s_xy, support, allowed, min_confidence, max_consequent_len):
+            entry = (rule[key], seq, rule)
+            seq += 1
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[0] > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+    best = [rule for _, _, rule in sorted(heap, key=lambda e: (-e[0], e[1]))]
+    return pd.DataFrame(best, columns=RULE_COLUMNS)
@@ -0,0 +1,652 @@
+"""The data-collection pipeline of ``final_data_collection.ipynb`` as named stages.
+
+Every stage reads and writes the same dataset files as the notebook, so any
+stage can be re-run on its own once its inputs exist::
+
+    ctx = Context(end="2025-12-31")
+    report = run(["clean_sensors", "clean_city", "clean_weather", "parse_cpcb", "merge_master"], ctx,
+                 profiler="cprofile", report_path="data/reports/rebuild.json")
+    report.table()      # wall s, CPU s, peak RSS MB, rows in / out per stage
+
+Stages, in notebook order (inputs and outputs are relative to ``data/``):
+
+* ``discover_stations`` OpenAQ locations in the Delhi box -> ``raw/stations``, ``raw/sensors``
+* ``fetch_sensors``     new OpenAQ sensor days -> ``raw/openaq_raw`` (watermarked)
+* ``aggregate_city``    city-wide daily mean per parameter -> ``raw/air_quality_daily``
+* ``fetch_weather``     Open-Meteo archive -> ``raw/weather_daily`` (watermarked)
+* ``fetch_trends``      Google Trends per keyword -> ``raw/google_trends_daily`` (watermarked)
+* ``clean_sensors``     impute, drop negatives, clip -> ``processed/openaq_raw``, ``processed/station_daily``
+* ``clean_city``        fill PM10 gaps, CPCB AQI from PM2.5 -> ``processed/air_quality_daily``
+* ``clean_weather``     trim to the AQ date range, round -> ``processed/weather_daily``
+* ``parse_cpcb``        CPCB bulletin sheets (``AQI_daily_city_level_delhi_*.xlsx``) -> ``processed/cpcb_daily``
+* ``merge_master``      AQ + CPCB days, weather and trends -> ``master_daily``
+
+The notebook's "cleaning" is three stages because each writes its own
+dataset. The fetch stages need the network (and ``OPENAQ_API_KEY`` for
+OpenAQ); their clients are imported only when they run.
+
+Every run measures each stage: wall time, CPU time (the whole process, all
+threads), peak RSS and the rows of each input and output dataset (from the
+Parquet footers). On Linux the kernel's peak-RSS counter is reset before each
+stage, so the peak is the stage's own; elsewhere it is the process peak so
+far (``peak_rss_scope`` in the report). ``profiler="cprofile"`` (or
+``"pyinstrument"``, if installed) also dumps one profile per stage next to
+the report: ``<report>.profiles/<stage>.prof`` (``pstats``/snakeviz) or
+``<stage>.html``. The report is a JSON file with one record per stage.
+
+Run from the command line with:
+    python -m delhi_aq.pipeline [--stages clean_sensors ...] [--profile cprofile] [--report PATH]
+
+which runs the stages one after another. ``python -m delhi_aq build``
+(``delhi_aq.build``) runs them as a dependency graph instead: independent
+branches in parallel, up-to-date stages skipped.
+"""
+import argparse
+import calendar
+import contextlib
+import cProfile
+import glob
+import json
+import os
+import platform
+import re
+import socket
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .aqi import aqi_category, sub_index
+from .impute import impute
+from .incremental import WatermarkStore, refresh_openaq, refresh_trends, refresh_weather
+from .openaq import OPENAQ_BASE_URL
+from .openaq import run as run_async
+from .paths import DATA_DIR, REPORTS_DIR
+from .predict import MONTH_SEASONS
+from .schema import DATE_COL, WEATHER_COLS
+from .stations import DELHI_BOUNDS, STATION_COLS, build_station_store
+from .storage import read_dataset, write_dataset
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+START_DATE = "2016-01-01"
+END_DATE   = "2025-12-31"
+
+TRENDS_KEYWORDS = ("air pollution Delhi", "N95 mask", "air purifier", "breathing problem", "AQI Delhi")
+
+# Physically impossible readings are clipped to these (µg/m³).
+PM_CAPS = {"pm25": 1000, "pm10": 1500}
+
+# The CPCB city bulletin sheets, one per year, in the data directory.
+CPCB_PATTERN = "AQI_daily_city_level_delhi_*.xlsx"
+
+OPEN_METEO_URL = "https://archive-api.open-meteo.com/v1/archive"
+OPEN_METEO_DAILY = {  # Open-Meteo variable -> weather_daily column
+    "temperature_2m_max":        "temp_max",
+    "temperature_2m_min":        "temp_min",
+    "temperature_2m_mean":       "temp_mean",
+    "wind_speed_10m_max":        "wind_speed_max",
+    "wind_speed_10m_mean":       "wind_speed_mean",
+    "relative_humidity_2m_mean": "humidity_mean",
+    "precipitation_sum":         "precipitation",
+}
+DELHI_CENTRE = (28.6139, 77.2090)
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+# ── Stage logic (also called cell by cell from the notebook) ────────────────
+
+def discover_sensors(api_key, bounds=DELHI_BOUNDS, base_url=OPENAQ_BASE_URL):
+    """PM2.5 and PM10 sensors of every OpenAQ location in ``bounds``, one row per (location, parameter)."""
+    import requests
+
+    headers = {"X-API-Key": api_key}
+    bbox = f"{bounds['lon_min']},{bounds['lat_min']},{bounds['lon_max']},{bounds['lat_max']}"
+    sensors = []
+    page = 1
+    while True:
+        response = requests.get(f"{base_url}/locations", params={"bbox": bbox, "limit": 100, "page": page},
+                                headers=headers, timeout=30)
+        data = response.json()
+        results = data.get("results", [])
+        if not results:
+            break
+        for loc in results:
+            for sensor in loc.get("sensors", []):
+                parameter = sensor["parameter"]["name"]
+                if parameter in PM_CAPS:
+                    sensors.append({
+                        "location_id":   loc["id"],
+                        "location_name": loc["name"],
+                        "sensor_id":     sensor["id"],
+                        "parameter":     parameter,
+                        "lat":           loc.get("coordinates", {}).get("latitude"),
+                        "lon":           loc.get("coordinates", {}).get("longitude"),
+                    })
+        found = data["meta"].get("found", "0")
+        total = int(found) if found != ">1000" else 1000
+        if page * 100 >= total:
+            break
+        page += 1
+
+    columns = ["location_id", "location_name", "sensor_id", "parameter", "lat", "lon"]
+    return pd.DataFrame(sensors, columns=columns).drop_duplicates(subset=["location_id", "parameter"])
+
+
+def city_daily(aq_raw):
+    """City-wide daily mean over all sensors: one row per date with ``pm25_avg`` and ``pm10_avg``."""
+    daily = (aq_raw.groupby([DATE_COL, "parameter"], observed=True)["value"].mean()
+             .unstack("parameter")
+             .rename(columns={"pm25": "pm25_avg", "pm10": "pm10_avg"})
+             .reset_index())
+    daily.columns.name = None
+    daily[DATE_COL] = pd.to_datetime(daily[DATE_COL])
+    return daily
+
+
+def weather_fetcher(cache_path, latitude=DELHI_CENTRE[0], longitude=DELHI_CENTRE[1]):
+    """``fetch(start, end) -> weather_daily rows`` over the Open-Meteo archive (for ``refresh_weather``)."""
+    import openmeteo_requests
+    import requests_cache
+    from retry_requests import retry
+
+    session = retry(requests_cache.CachedSession(cache_path, expire_after=-1), retries=5, backoff_factor=0.2)
+    client = openmeteo_requests.Client(session=session)
+
+    def fetch(start, end):
+        params = {"latitude": latitude, "longitude": longitude, "start_date": start, "end_date": end,
+                  "daily": list(OPEN_METEO_DAILY), "timezone": "Asia/Kolkata"}
+        daily = client.weather_api(OPEN_METEO_URL, params=params)[0].Daily()
+        dates = pd.date_range(start=pd.to_datetime(daily.Time(), unit="s", utc=True).tz_localize(None),
+                              end=pd.to_datetime(daily.TimeEnd(), unit="s", utc=True).tz_localize(None),
+                              freq=pd.Timedelta(seconds=daily.Interval()), inclusive="left")
+        df = pd.DataFrame({col: daily.Variables(i).ValuesAsNumpy() for i, col in enumerate(OPEN_METEO_DAILY.values())})
+        df.insert(0, DATE_COL, dates.normalize())
+        return df
+
+    return fetch
+
+
+def trends_fetcher(pause_s=1.0):
+    """``fetch_chunk(keyword, start, stop)`` over pytrends for Delhi (for ``refresh_trends``)."""
+    from pytrends.request import TrendReq
+
+    client = TrendReq(hl="en-IN", tz=330, timeout=(10, 25))
+
+    def fetch_chunk(keyword, start, stop):
+        client.build_payload([keyword], geo="IN-DL", timeframe=f"{start} {stop}")
+        df = client.interest_over_time()
+        time.sleep(pause_s)  # pytrends is rate limited per IP
+        return df
+
+    return fetch_chunk
+
+
+def clean_openaq(aq_raw):
+    """Fill missing readings with their sensor's mean, drop negatives and clip at ``PM_CAPS``."""
+    aq_raw = impute(aq_raw, {"value": [("group_mean", {"by": ["sensor_id", "parameter"]})]})
+    aq_raw = aq_raw[aq_raw["value"] >= 0].copy()
+    for parameter, cap in PM_CAPS.items():
+        rows = aq_raw["parameter"] == parameter
+        aq_raw.loc[rows, "value"] = aq_raw.loc[rows, "value"].clip(upper=cap)
+    return aq_raw
+
+
+def clean_air_quality(aq_daily):
+    """Fill PM10 gaps (linear over at most 7 days, then the month's median) and add the CPCB AQI from PM2.5."""
+    aq_daily = impute(aq_daily, {"pm10_avg": [("interpolate", {"limit": 7}), ("seasonal_median", {})]})
+    aq_daily["aqi"] = sub_index(aq_daily["pm25_avg"], "pm25")
+    aq_daily["aqi_category"] = aqi_category(aq_daily["aqi"])
+    return aq_daily
+
+
+def trim_weather(weather, start, end):
+    """Weather days from ``start`` to ``end``, rounded to 2 decimals (Open-Meteo has excessive precision)."""
+    weather = weather[(weather[DATE_COL] >= start) & (weather[DATE_COL] <= end)].reset_index(drop=True)
+    cols = [col for col in WEATHER_COLS if col in weather.columns]
+    weather[cols] = weather[cols].round(2)
+    return weather
+
+
+_MONTHS = {name: number for number, name in enumerate(calendar.month_name) if name}
+
+
+def parse_cpcb_wide(filepath, year):
+    """One CPCB bulletin sheet (Day x month AQI, then footer rows) as ``date, aqi_cpcb`` rows."""
+    df = pd.read_excel(filepath).rename(columns={"Day": "day"})
+    df_long = df.melt(id_vars="day", var_name="month_name", value_name="aqi_cpcb")
+    df_long["month"] = df_long["month_name"].map(_MONTHS)
+    df_long["year"] = year
+    df_long["day"] = pd.to_numeric(df_long["day"], errors="coerce")
+    df_long["aqi_cpcb"] = pd.to_numeric(df_long["aqi_cpcb"], errors="coerce")
+
+    # Footer rows (category counts, availability) have no day number; Feb 30 etc. are not dates.
+    df_long = df_long.dropna(subset=["day", "month", "aqi_cpcb"])
+    df_long[DATE_COL] = pd.to_datetime(df_long[["year", "month", "day"]], errors="coerce")
+    df_long = df_long.dropna(subset=[DATE_COL])
+    return df_long[[DATE_COL, "aqi_cpcb"]].sort_values(DATE_COL).reset_index(drop=True)
+
+
+def cpcb_year(path):
+    """Year of a CPCB bulletin file from its name (``..._delhi_2024.xlsx``)."""
+    return int(re.findall(r"(\d{4})", os.path.basename(path))[-1])
+
+
+def merge_master(aq_daily, cpcb, weather, trends):
+    """``master_daily``: OpenAQ days plus the CPCB days they lack, with weather, trends and calendar columns."""
+    cpcb_rows = cpcb.rename(columns={"aqi_cpcb": "aqi"})
+    cpcb_rows["pm25_avg"] = np.nan
+    cpcb_rows["pm10_avg"] = np.nan
+    cpcb_rows["aqi_category"] = aqi_category(cpcb_rows["aqi"])
+    cpcb_rows["aqi_source"] = "cpcb_direct"
+
+    aq_daily = aq_daily.assign(aqi_source="openaq_computed")
+    cpcb_new = cpcb_rows[~cpcb_rows[DATE_COL].isin(aq_daily[DATE_COL])]
+    master = pd.concat([aq_daily, cpcb_new], ignore_index=True).sort_values(DATE_COL).reset_index(drop=True)
+
+    master = master.merge(weather, on=DATE_COL, how="left").merge(trends, on=DATE_COL, how="left")
+    master = master.sort_values(DATE_COL).reset_index(drop=True)
+    master["year"] = master[DATE_COL].dt.year
+    master["month"] = master[DATE_COL].dt.month
+    master["season"] = master["month"].map(MONTH_SEASONS)
+    return master
+
+
+# ── Stages ───────────────────────────────────────────────────────────────────
+
+@dataclass
+class Context:
+    """What a pipeline run covers and where it reads and writes."""
+    start: str = START_DATE
+    end: str = END_DATE       # move forward to refresh; the fetch stages only pull days past their watermarks
+    data_dir: str = DATA_DIR
+    api_key: str = None       # OpenAQ; defaults to $OPENAQ_API_KEY (a .env file is read if python-dotenv is installed)
+    keywords: tuple = TRENDS_KEYWORDS
+
+    @property
+    def raw_dir(self):
+        return os.path.join(self.data_dir, "raw")
+
+    @property
+    def processed_dir(self):
+        return os.path.join(self.data_dir, "processed")
+
+    def paths(self, ref):
+        """Files of a stage input/output: ``raw/openaq_raw`` is a Parquet dataset, a ``*`` ref is a glob."""
+        path = os.path.join(self.data_dir, *ref.split("/"))
+        if "*" in ref:
+            return sorted(glob.glob(path))
+        return [path if os.path.splitext(ref)[1] else f"{path}.parquet"]
+
+    def watermarks(self):
+        return WatermarkStore(os.path.join(self.raw_dir, "watermarks.json"))
+
+    def openaq_key(self):
+        if self.api_key is None:
+            with contextlib.suppress(ImportError):
+                from dotenv import load_dotenv
+                load_dotenv()
+            self.api_key = os.getenv("OPENAQ_API_KEY")
+        return self.api_key
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A named step: ``run(ctx)`` reads ``inputs`` and writes ``outputs`` and returns notes (a dict)."""
+    name: str
+    run: callable
+    inputs: tuple = ()
+    outputs: tuple = ()
+    source: str = None        # external service the stage fetches from, if any
+    description: str = ""
+
+
+def _discover_stations(ctx):
+    sensors = discover_sensors(ctx.openaq_key())
+    write_dataset(sensors, "sensors", ctx.raw_dir)
+    # Keep the coordinates: the station-level store (delhi_aq.stations) joins them to every reading
+    write_dataset(sensors.drop_duplicates("location_id")[STATION_COLS].assign(source="openaq"), "stations",
+                  ctx.raw_dir)
+    return {"sensors": len(sensors)}
+
+
+def _fetch_sensors(ctx):
+    sensors = read_dataset("sensors", ctx.raw_dir)
+    failures = run_async(refresh_openaq(sensors, ctx.start, ctx.end, ctx.watermarks(),
+                                        directory=ctx.raw_dir, api_key=ctx.openaq_key()))
+    return {"failures": len(failures)}
+
+
+def _aggregate_city(ctx):
+    write_dataset(city_daily(read_dataset("openaq_raw", ctx.raw_dir)), "air_quality_daily", ctx.raw_dir)
+    return {}
+
+
+def _fetch_weather(ctx):
+    fetch = weather_fetcher(os.path.join(ctx.data_dir, "cache", "open-meteo"))
+    return {"new_rows": refresh_weather(fetch, ctx.start, ctx.end, ctx.watermarks(), directory=ctx.raw_dir)}
+
+
+def _fetch_trends(ctx):
+    errors = refresh_trends(trends_fetcher(), list(ctx.keywords), ctx.start, ctx.end, ctx.watermarks(),
+                            directory=ctx.raw_dir)
+    return {"errors": errors} if errors else {}
+
+
+def _clean_sensors(ctx):
+    raw = read_dataset("openaq_raw", ctx.raw_dir)
+    missing = int(raw["value"].isna().sum())
+    cleaned = clean_openaq(raw)
+    write_dataset(cleaned, "openaq_raw", ctx.processed_dir)
+    build_station_store(ctx.processed_dir, ctx.raw_dir, ctx.processed_dir)
+    return {"imputed": missing, "dropped": len(raw) - len(cleaned)}
+
+
+def _clean_city(ctx):
+    aq_daily = read_dataset("air_quality_daily", ctx.raw_dir)
+    missing = int(aq_daily["pm10_avg"].isna().sum())
+    write_dataset(clean_air_quality(aq_daily), "air_quality_daily", ctx.processed_dir)
+    return {"pm10_imputed": missing}
+
+
+def _clean_weather(ctx):
+    dates = read_dataset("air_quality_daily", ctx.processed_dir, columns=[DATE_COL])[DATE_COL]
+    weather = trim_weather(read_dataset("weather_daily", ctx.raw_dir), dates.min(), dates.max())
+    write_dataset(weather, "weather_daily", ctx.processed_dir)
+    return {}
+
+
+def _parse_cpcb(ctx):
+    files = ctx.paths(CPCB_PATTERN)
+    frames = [parse_cpcb_wide(path, cpcb_year(path)) for path in files]
+    cpcb = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=[DATE_COL, "aqi_cpcb"])
+    write_dataset(cpcb, "cpcb_daily", ctx.processed_dir)
+    return {"files": len(files)}
+
+
+def _merge_master(ctx):
+    master = merge_master(read_dataset("air_quality_daily", ctx.processed_dir),
+                          read_dataset("cpcb_daily", ctx.processed_dir),
+                          read_dataset("weather_daily", ctx.processed_dir),
+                          read_dataset("google_trends_daily", ctx.raw_dir))
+    write_dataset(master, "master_daily", ctx.data_dir)
+    return {}
+
+
+# In notebook order, which is also a valid execution order.
+STAGES = {stage.name: stage for stage in [
+    Stage("discover_stations", _discover_stations, (), ("raw/sensors", "raw/stations"), source="OpenAQ",
+          description="OpenAQ PM sensors in the Delhi box"),
+    Stage("fetch_sensors", _fetch_sensors, ("raw/sensors",), ("raw/openaq_raw",), source="OpenAQ",
+          description="new daily readings per sensor"),
+    Stage("aggregate_city", _aggregate_city, ("raw/openaq_raw",), ("raw/air_quality_daily",),
+          description="city-wide daily PM means"),
+    Stage("fetch_weather", _fetch_weather, (), ("raw/weather_daily",), source="Open-Meteo",
+          description="new daily weather"),
+    Stage("fetch_trends", _fetch_trends, (), ("raw/google_trends_daily",), source="Google Trends",
+          description="new search-interest windows per keyword"),
+    Stage("clean_sensors", _clean_sensors, ("raw/openaq_raw", "raw/stations"),
+          ("processed/openaq_raw", "processed/station_daily"), description="clean readings, station store"),
+    Stage("clean_city", _clean_city, ("raw/air_quality_daily",), ("processed/air_quality_daily",),
+          description="PM10 gaps, AQI"),
+    Stage("clean_weather", _clean_weather, ("raw/weather_daily", "processed/air_quality_daily"),
+          ("processed/weather_daily",), description="trim to the AQ range, round"),
+    Stage("parse_cpcb", _parse_cpcb, (CPCB_PATTERN,), ("processed/cpcb_daily",),
+          description="CPCB bulletin sheets"),
+    Stage("merge_master", _merge_master,
+          ("processed/air_quality_daily", "processed/cpcb_daily", "processed/weather_daily",
+           "raw/google_trends_daily"), ("master_daily",), description="master_daily"),
+]}
+
+# Stages that need nothing but the files already under data/.
+OFFLINE_STAGES = [name for name, stage in STAGES.items() if stage.source is None]
+
+
+# ── Measurement ──────────────────────────────────────────────────────────────
+
+def _reset_peak_rss():
+    """Reset the kernel's peak-RSS counter of this process (Linux); False where unsupported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if platform.system() == "Darwin" else peak / 1024  # bytes on macOS, KiB elsewhere
+
+
+def _rows(ctx, refs):
+    """Rows per dataset file of ``refs`` (Parquet footers only; other files count as None)."""
+    out = {}
+    for ref in refs:
+        for path in ctx.paths(ref):
+            name = os.path.relpath(path, ctx.data_dir)
+            if path.endswith(".parquet") and os.path.exists(path):
+                out[name] = pq.ParquetFile(path).metadata.num_rows
+            elif os.path.exists(path):
+                out[name] = None
+    return out
+
+
+@contextlib.contextmanager
+def _profiling(profiler, path):
+    if profiler is None:
+        yield None
+    elif profiler == "cprofile":
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield f"{path}.prof"
+        finally:
+            profile.disable()
+            profile.dump_stats(f"{path}.prof")
+    elif profiler == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profile = Profiler()
+        profile.start()
+        try:
+            yield f"{path}.html"
+        finally:
+            profile.stop()
+            with open(f"{path}.html", "w", encoding="utf-8") as f:
+                f.write(profile.output_html())
+    else:
+        raise ValueError(f"unknown profiler {profiler!r}; expected one of {PROFILERS}")
+
+
+@dataclass
+class StageRecord:
+    """What one stage did and what it cost."""
+    name: str
+    status: str = "pending"   # ok | failed (| skipped | blocked in delhi_aq.build)
+    start_s: float = None     # seconds after the run started
+    wall_s: float = None
+    cpu_s: float = None
+    peak_rss_mb: float = None
+    rows_in: dict = field(default_factory=dict)
+    rows_out: dict = field(default_factory=dict)
+    notes: dict = field(default_factory=dict)
+    profile: str = None
+    error: str = None
+
+
+@dataclass
+class RunReport:
+    """A pipeline run: context, host and one ``StageRecord`` per stage, in execution order."""
+    started_at: str
+    context: dict
+    host: dict
+    profiler: str = None
+    peak_rss_scope: str = "stage"
+    wall_s: float = None
+    stages: list = field(default_factory=list)
+
+    def table(self):
+        """start, wall s, CPU s, peak RSS MB and total rows in / out per stage."""
+        return pd.DataFrame([{"stage": s.name, "status": s.status, "start_s": s.start_s,
+                              "wall_s": s.wall_s, "cpu_s": s.cpu_s,
+                              "peak_rss_mb": s.peak_rss_mb,
+                              "rows_in": sum(n or 0 for n in s.rows_in.values()),
+                              "rows_out": sum(n or 0 for n in s.rows_out.values())}
+                             for s in self.stages])
+
+    def write(self, path):
+        """Write the report as JSON (atomically); returns ``path``."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, indent=2, default=str)
+        os.replace(tmp, path)
+        return path
+
+
+def default_report_path(reports_dir=REPORTS_DIR):
+    return os.path.join(reports_dir, f"pipeline-{datetime.now().strftime('%Y%m%dT%H%M%S')}.json")
+
+
+def start_report(ctx, names, profiler=None, **context):
+    """An empty ``RunReport`` for running ``names`` over ``ctx``; ``context`` adds run options to it."""
+    if profiler is not None and profiler not in PROFILERS:
+        raise ValueError(f"unknown profiler {profiler!r}; expected one of {PROFILERS}")
+    if profiler == "pyinstrument":
+        import pyinstrument  # noqa: F401  (fail before any stage has run)
+    return RunReport(
+        started_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        context={"start": ctx.start, "end": ctx.end, "data_dir": ctx.data_dir, "stages": list(names), **context},
+        host={"host": socket.gethostname(), "python": platform.python_version(),
+              "platform": platform.platform(), "cpus": os.cpu_count()},
+        profiler=profiler,
+        peak_rss_scope="stage" if _reset_peak_rss() else "process",
+    )
+
+
+def profile_dir_for(report_path):
+    """Where the per-stage profiles of the run reported at ``report_path`` go."""
+    return os.path.splitext(report_path or default_report_path())[0] + ".profiles"
+
+
+def run_stage(stage, ctx, profiler=None, profile_dir=None, record=None, t0=None):
+    """Run one stage and measure it into ``record`` (a new ``StageRecord`` by default).
+
+    ``t0`` is the run's start (``time.time()``) for ``start_s``. A failing
+    stage is still measured, with ``status="failed"`` and the ``error``, and
+    its exception is re-raised.
+    """
+    record = record or StageRecord(stage.name)
+    if t0 is not None:
+        record.start_s = round(time.time() - t0, 6)
+    record.rows_in = _rows(ctx, stage.inputs)
+    if profile_dir is not None:
+        os.makedirs(profile_dir, exist_ok=True)
+    _reset_peak_rss()
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    try:
+        with _profiling(profiler, profile_dir and os.path.join(profile_dir, stage.name)) as dump:
+            record.profile = dump
+            record.notes = stage.run(ctx) or {}
+        record.status = "ok"
+        record.rows_out = _rows(ctx, stage.outputs)
+    except BaseException as e:
+        record.status, record.error = "failed", f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record.wall_s = round(time.perf_counter() - wall0, 6)
+        record.cpu_s = round(time.process_time() - cpu0, 6)
+        record.peak_rss_mb = _peak_rss_mb()
+    return record
+
+
+_STATUS_ICONS = {"ok": "✅", "failed": "❌", "skipped": "⏭️ ", "blocked": "⛔"}
+
+
+def format_record(record):
+    """One progress line for a finished stage."""
+    line = f"{_STATUS_ICONS.get(record.status, '  ')} {record.name:<18}"
+    if record.wall_s is not None:
+        rows = sum(n or 0 for n in record.rows_out.values())
+        line += (f"{record.wall_s:8.2f} s wall{record.cpu_s:8.2f} s CPU"
+                 f"{record.peak_rss_mb or float('nan'):8.0f} MB peak{rows:>12,} rows out")
+    if record.notes:
+        line += "  " + json.dumps(record.notes, default=str)
+    if record.error:
+        line += f"  {record.error}"
+    return line
+
+
+def run(names=None, ctx=None, profiler=None, report_path=None, progress=None):
+    """Run ``names`` (default: every stage) in order and return the ``RunReport``.
+
+    The report is written to ``report_path`` (if given) even when a stage
+    fails; the failure is then re-raised and the remaining stages are not run.
+    ``progress(record)`` is called after each stage.
+    """
+    ctx = ctx or Context()
+    names = list(STAGES) if names is None else list(names)
+    unknown = [name for name in names if name not in STAGES]
+    if unknown:
+        raise KeyError(f"unknown stages {unknown}; expected some of {list(STAGES)}")
+    report = start_report(ctx, names, profiler)
+    profile_dir = profile_dir_for(report_path) if profiler is not None else None
+
+    t0 = time.time()
+    try:
+        for name in names:
+            record = StageRecord(name)
+            report.stages.append(record)
+            run_stage(STAGES[name], ctx, profiler, profile_dir, record, t0)
+            if progress is not None:
+                progress(record)
+    finally:
+        report.wall_s = round(time.time() - t0, 6)
+        if report_path is not None:
+            report.write(report_path)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), metavar="STAGE",
+                        help=f"stages to run, in order (default: all). Offline: {' '.join(OFFLINE_STAGES)}")
+    parser.add_argument("--offline", action="store_true", help="run only the stages that fetch nothing")
+    parser.add_argument("--start", default=START_DATE)
+    parser.add_argument("--end", default=END_DATE)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--profile", choices=PROFILERS, help="dump a profile of every stage next to the report")
+    parser.add_argument("--report", help="run report path (default: data/reports/pipeline-<time>.json)")
+    args = parser.parse_args()
+
+    names = args.stages or (OFFLINE_STAGES if args.offline else list(STAGES))
+    ctx = Context(start=args.start, end=args.end, data_dir=args.data_dir)
+    report_path = args.report or default_report_path()
+
+    try:
+        report = run(names, ctx, args.profile, report_path, lambda record: print(format_record(record)))
+    except Exception as e:
+        print(f"❌ {e!r}; report: {report_path}")
+        raise SystemExit(1)
+    print(f"✅ {len(report.stages)} stages in {report.wall_s:.2f} s; report: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
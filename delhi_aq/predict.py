@@ -0,0 +1,149 @@
+"""Vectorized AQI inference from the registered notebook models.
+
+``AQIPredictor`` loads the decision tree (AQI category) and the linear
+regression (AQI value) from ``data/models`` once, then scores whole batches of
+daily feature rows::
+
+    predictor = AQIPredictor.from_registry()
+    predictor.predict(pd.DataFrame({"pm25_avg": [180.0], "pm10_avg": [260.0], "temp_mean": [14.2],
+                                    "wind_speed_mean": [3.1], "humidity_mean": [78.0],
+                                    "precipitation": [0.0], "date": ["2024-12-02"]}))
+
+The tree was trained on ``pd.get_dummies`` of the notebook's ``pd.cut`` bins.
+Here the bin of every value is found with one ``np.searchsorted`` per feature
+(``pd.cut`` intervals are closed on the right, so ``side="left"``), and the
+one-hot matrix is filled by index in the tree's own column order. Values
+outside the bins, and missing values, fall into the ``Unknown`` column, the
+same as the notebook's ``fillna('Unknown')``. ``season`` may be given
+directly or derived from ``date``.
+
+Both models are evaluated straight from their fitted parameters: the tree's
+leaf of each row (``tree_.apply``) indexes a per-leaf class/probability table,
+and the regression is one matrix-vector product. This skips scikit-learn's
+per-call input validation, which otherwise costs more than the inference
+itself on a few thousand rows. Missing regression inputs are filled with the
+training medians stored next to the model.
+"""
+import numpy as np
+import pandas as pd
+
+from .paths import MODELS_DIR
+from .registry import load_model, model_entry
+from .schema import DATE_COL, SEASONS
+
+UNKNOWN = "Unknown"
+
+# Bin edges and labels of Model_implementation.ipynb (``pd.cut``, right-closed).
+FEATURE_BINS = {
+    "pm10_bin":     ("pm10_avg", [0, 50, 100, 150, 200, 500],
+                     ["PM10_Low", "PM10_Med", "PM10_High", "PM10_VHigh", "PM10_Severe"]),
+    "pm25_bin":     ("pm25_avg", [0, 30, 60, 90, 120, 500],
+                     ["PM25_Low", "PM25_Med", "PM25_High", "PM25_VHigh", "PM25_Severe"]),
+    "temp_bin":     ("temp_mean", [-10, 20, 30, 50], ["Temp_Low", "Temp_Med", "Temp_High"]),
+    "wind_bin":     ("wind_speed_mean", [0, 5, 10, 50], ["Wind_Low", "Wind_Med", "Wind_High"]),
+    "humidity_bin": ("humidity_mean", [0, 30, 60, 100], ["Hum_Low", "Hum_Med", "Hum_High"]),
+    "precip_bin":   ("precipitation", [-1, 0, 5, 20, 100], ["Rain_None", "Rain_Light", "Rain_Med", "Rain_Heavy"]),
+}
+
+# Calendar months of each season in master_daily.
+MONTH_SEASONS = {1: "Winter", 2: "Winter", 3: "Spring", 4: "Spring", 5: "Spring", 6: "Monsoon",
+                 7: "Monsoon", 8: "Monsoon", 9: "Post-Monsoon", 10: "Post-Monsoon",
+                 11: "Post-Monsoon", 12: "Winter"}
+
+INPUT_COLS = ["pm10_avg", "pm25_avg", "temp_mean", "wind_speed_mean", "humidity_mean", "precipitation"]
+
+_MONTH_CODES = np.array([-1] + [SEASONS.index(MONTH_SEASONS[m]) for m in range(1, 13)])
+
+
+def bin_codes(values, edges):
+    """Index of the ``pd.cut`` bin of each value; ``len(edges) - 1`` (Unknown) outside the bins or NaN."""
+    values = np.asarray(values, dtype="float64")
+    codes = np.searchsorted(np.asarray(edges, dtype="float64"), values, side="left") - 1
+    unknown = len(edges) - 1
+    return np.where((codes >= 0) & (codes < unknown), codes, unknown)
+
+
+def season_codes(frame):
+    """Index into ``SEASONS`` per row (``len(SEASONS)`` = Unknown), from ``season`` or else ``date``."""
+    n = len(frame)
+    codes = np.full(n, len(SEASONS))
+    if "season" in frame:
+        season = pd.Categorical(frame["season"], categories=SEASONS).codes
+        codes = np.where(season >= 0, season, codes)
+    if DATE_COL in frame and (codes == len(SEASONS)).any():
+        dates = frame[DATE_COL]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, errors="coerce")
+        month = dates.dt.month.fillna(0).to_numpy(dtype="int64")
+        from_date = _MONTH_CODES[month]
+        codes = np.where((codes == len(SEASONS)) & (from_date >= 0), from_date, codes)
+    return codes
+
+
+def _column(frame, col):
+    if col not in frame:
+        return np.full(len(frame), np.nan)
+    values = frame[col]
+    if not pd.api.types.is_numeric_dtype(values):
+        values = pd.to_numeric(values, errors="coerce")
+    return values.to_numpy(dtype="float64", na_value=np.nan)
+
+
+class AQIPredictor:
+    """Decision tree (category) + linear regression (AQI) over batches of daily features."""
+
+    def __init__(self, tree, tree_artifacts, regression, regression_artifacts):
+        self.tree = tree
+        self.classes = np.asarray(tree_artifacts["classes"], dtype=object)
+        self.feature_names = list(tree_artifacts["feature_names"])
+        self.regression = regression
+        self.regression_cols = list(regression_artifacts["feature_cols"])
+        self.fill_values = np.array([regression_artifacts["fill_values"][c] for c in self.regression_cols])
+
+        # Class and probability of the majority class at every tree node (predict_proba's argmax).
+        counts = tree.tree_.value[:, 0, :]
+        self._leaf_class = self.classes[tree.classes_[counts.argmax(axis=1)]]
+        self._leaf_probability = counts.max(axis=1) / counts.sum(axis=1)
+        self._coef = np.asarray(regression.coef_, dtype="float64")
+        self._intercept = float(regression.intercept_)
+
+        # Per categorical feature: one-hot column of each bin code (last = Unknown), -1 if absent.
+        position = {name: i for i, name in enumerate(self.feature_names)}
+        self._onehot = {}
+        for feature, (_, _, labels) in FEATURE_BINS.items():
+            self._onehot[feature] = np.array([position.get(f"{feature}_{v}", -1) for v in labels + [UNKNOWN]])
+        self._onehot["season"] = np.array([position.get(f"season_{v}", -1) for v in SEASONS + [UNKNOWN]])
+
+    @classmethod
+    def from_registry(cls, directory=MODELS_DIR):
+        """Load ``decision_tree`` and ``linear_regression`` saved by ``Model_implementation.ipynb``."""
+        missing = [name for name in ("decision_tree", "linear_regression") if model_entry(name, directory) is None]
+        if missing:
+            raise FileNotFoundError(f"models not registered in {directory}: {', '.join(missing)} "
+                                    f"(run Model_implementation.ipynb)")
+        tree, regression = load_model("decision_tree", directory), load_model("linear_regression", directory)
+        return cls(tree["model"], tree["artifacts"], regression["model"], regression["artifacts"])
+
+    def encode(self, frame):
+        """The tree's one-hot design matrix for ``frame`` (float32, columns = ``feature_names``)."""
+        n = len(frame)
+        X = np.zeros((n, len(self.feature_names)), dtype="float32")
+        rows = np.arange(n)
+        codes = {feature: bin_codes(_column(frame, col), edges) for feature, (col, edges, _) in FEATURE_BINS.items()}
+        codes["season"] = season_codes(frame)
+        for feature, code in codes.items():
+            cols = self._onehot[feature][code]
+            hit = cols >= 0
+            X[rows[hit], cols[hit]] = 1
+        return X
+
+    def predict(self, frame):
+        """``aqi_category``, its tree probability, and the regression ``aqi`` for each row of ``frame``."""
+        leaves = self.tree.tree_.apply(self.encode(frame))
+        numeric = np.column_stack([_column(frame, col) for col in self.regression_cols])
+        numeric = np.where(np.isnan(numeric), self.fill_values, numeric)
+        return pd.DataFrame({
+            "aqi_category": self._leaf_class[leaves],
+            "probability":  self._leaf_probability[leaves],
+            "aqi":          numeric @ self._coef + self._intercept,
+        }, index=frame.index)
@@ -0,0 +1,199 @@
+"""Persisted registry of the fitted models from ``Model_implementation.ipynb``.
+
+The notebook saves each fitted model once, with its metrics::
+
+    save_model("decision_tree", dt_model, classification_summary(y_test, y_pred, classes),
+               fingerprint=frame_fingerprint(final_df), params={"max_depth": 5})
+
+``data/models/registry.json`` holds one entry per model:
+- the estimator class, its parameters and metrics (JSON);
+- the fingerprint of the training frame;
+- the SHA-1 of each source dataset the notebook reads;
+- the training time and scikit-learn version.
+
+The fitted object itself, plus any larger artifacts (test predictions, rule
+tables, ...), is pickled next to it as ``<name>.joblib``.
+
+The dashboard reads ``registry.json`` once per process, and again only when
+the file changes. It unpickles a model only when a page asks for it, so a
+page view never retrains anything. ``stale_sources`` compares the recorded
+hashes against the current files, so the app can flag results that predate
+the data it shows.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from .loader import file_hash, file_signature
+from .paths import DATA_DIR, DATA_DIR_PROCESSED, MODELS_DIR
+from .storage import dataset_path
+
+REGISTRY_FILE = "registry.json"
+
+# Datasets Model_implementation.ipynb merges into its training frame.
+MODEL_SOURCES = {
+    "air_quality_daily": dataset_path("air_quality_daily", DATA_DIR_PROCESSED),
+    "master_daily":      dataset_path("master_daily", DATA_DIR),
+    "weather_daily":     dataset_path("weather_daily", DATA_DIR_PROCESSED),
+}
+
+_lock = threading.Lock()
+_state = {"signature": None, "registry": None}
+_models = {}
+_source_hashes = {}
+
+
+def frame_fingerprint(frame):
+    """SHA-1 over the column names and row hashes of ``frame`` (index ignored)."""
+    h = hashlib.sha1(json.dumps([str(c) for c in frame.columns]).encode())
+    h.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _jsonable(value):
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _jsonable(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def classification_summary(y_true, y_pred, labels=None):
+    """Accuracy, macro precision/recall/F1 and the confusion matrix (rows = actual)."""
+    from sklearn.metrics import accuracy_score, confusion_matrix, precision_recall_fscore_support
+    labels = list(np.unique(np.concatenate([np.asarray(y_true), np.asarray(y_pred)]))) if labels is None \
+        else list(labels)
+    precision, recall, f1, _ = precision_recall_fscore_support(y_true, y_pred, average="macro", zero_division=0)
+    return {
+        "accuracy":         accuracy_score(y_true, y_pred),
+        "precision_macro":  precision,
+        "recall_macro":     recall,
+        "f1_macro":         f1,
+        "labels":           [str(label) for label in labels],
+        "confusion_matrix": confusion_matrix(y_true, y_pred, labels=labels),
+    }
+
+
+def regression_summary(y_true, y_pred):
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    return {
+        "r2":   r2_score(y_true, y_pred),
+        "rmse": float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        "mae":  mean_absolute_error(y_true, y_pred),
+    }
+
+
+def _registry_path(directory):
+    return os.path.join(directory, REGISTRY_FILE)
+
+
+def read_registry(directory=MODELS_DIR):
+    try:
+        with open(_registry_path(directory), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _atomic_write(path, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def save_model(name, model, metrics, fingerprint, params=None, artifacts=None, estimator=None,
+               sources=MODEL_SOURCES, directory=MODELS_DIR):
+    """Pickle ``model`` (+ ``artifacts``) as ``<name>.joblib`` and record its entry in the registry.
+
+    ``estimator`` labels non-scikit-learn models (default: the class name of ``model``).
+    """
+    import joblib
+    import sklearn
+
+    os.makedirs(directory, exist_ok=True)
+    if params is None and hasattr(model, "get_params"):
+        params = model.get_params()
+    _atomic_write(os.path.join(directory, f"{name}.joblib"),
+                  lambda tmp: joblib.dump({"model": model, "artifacts": artifacts or {}}, tmp, compress=3))
+
+    with _lock:
+        registry = read_registry(directory)
+        registry[name] = _jsonable({
+            "estimator":   estimator or type(model).__name__,
+            "params":      params or {},
+            "metrics":     metrics,
+            "fingerprint": fingerprint,
+            "sources":     {k: file_hash(p) for k, p in sources.items() if os.path.exists(p)},
+            "trained_at":  datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "sklearn":     sklearn.__version__,
+            "file":        f"{name}.joblib",
+        })
+
+        def write(tmp):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(registry, f, indent=2, sort_keys=True)
+        _atomic_write(_registry_path(directory), write)
+    return registry[name]
+
+
+def load_registry(directory=MODELS_DIR):
+    """All registry entries (metrics only, no unpickling); re-read only when the file changes."""
+    path = _registry_path(directory)
+    try:
+        signature = (directory, file_signature(path))
+    except FileNotFoundError:
+        return {}
+    if _state["signature"] != signature:
+        with _lock:
+            if _state["signature"] != signature:
+                _state.update(registry=read_registry(directory), signature=signature)
+                _models.clear()
+    return _state["registry"]
+
+
+def model_entry(name, directory=MODELS_DIR):
+    """Registry entry for ``name`` (``None`` if the notebook hasn't registered it)."""
+    return load_registry(directory).get(name)
+
+
+def load_model(name, directory=MODELS_DIR):
+    """``{"model": ..., "artifacts": {...}}`` for ``name``, unpickled on first use in this process."""
+    entry = model_entry(name, directory)
+    if entry is None:
+        return None
+    key = (directory, name)
+    if key not in _models:
+        import joblib
+        with _lock:
+            if key not in _models:
+                _models[key] = joblib.load(os.path.join(directory, entry["file"]))
+    return _models[key]
+
+
+def _current_hash(path):
+    signature = file_signature(path)
+    cached = _source_hashes.get(path)
+    if cached is None or cached[0] != signature:
+        cached = (signature, file_hash(path))
+        _source_hashes[path] = cached
+    return cached[1]
+
+
+def stale_sources(name, sources=MODEL_SOURCES, directory=MODELS_DIR):
+    """Source datasets whose contents changed since ``name`` was trained."""
+    entry = model_entry(name, directory)
+    if entry is None:
+        return []
+    return [k for k, path in sources.items()
+            if os.path.exists(path) and entry["sources"].get(k) != _current_hash(path)]
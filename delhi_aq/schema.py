@@ -0,0 +1,93 @@
+"""Column types for the project datasets.
+
+Kept in one place so every reader produces the same dtypes instead of
+re-inferring them from text on each parse. ``delhi_aq.storage`` derives the
+Parquet (Arrow) schema from these: measurements are float32, labels are
+dictionary-encoded categoricals and ``date`` is stored as date32.
+
+PM concentrations are the exception and stay float64: the CPCB AQI formula
+rounds at .5 boundaries, and float32 city means (e.g. 71.666664 vs
+71.666667) flip the AQI of a handful of days.
+"""
+import pandas as pd
+
+AQI_CATEGORIES = ["Good", "Satisfactory", "Moderate", "Poor", "Very Poor", "Severe"]
+SEASONS        = ["Winter", "Spring", "Monsoon", "Post-Monsoon"]
+AQI_SOURCES    = ["openaq_computed", "cpcb_direct"]
+
+PM_COLS        = ["pm10_avg", "pm25_avg"]
+WEATHER_COLS   = ["temp_max", "temp_min", "temp_mean", "wind_speed_max",
+                  "wind_speed_mean", "humidity_mean", "precipitation"]
+TRENDS_COLS    = ["air_pollution_Delhi", "N95_mask", "air_purifier",
+                  "breathing_problem", "AQI_Delhi"]
+
+DATE_COL = "date"
+
+MASTER_DTYPES = {
+    **{col: "float64" for col in PM_COLS},
+    **{col: "float32" for col in ["aqi"] + WEATHER_COLS + TRENDS_COLS},
+    "aqi_category": pd.CategoricalDtype(AQI_CATEGORIES, ordered=True),
+    "aqi_source":   pd.CategoricalDtype(AQI_SOURCES),
+    "season":       pd.CategoricalDtype(SEASONS),
+    "year":         "int16",
+    "month":        "int8",
+}
+
+OPENAQ_DTYPES = {
+    "value":         "float64",
+    "sensor_id":     "int64",
+    "location_id":   "int64",
+    "location_name": "category",
+    "parameter":     "category",
+}
+
+STATIONS_DTYPES = {
+    "location_id":   "int64",
+    "location_name": "category",
+    "lat":           "float64",
+    "lon":           "float64",
+}
+
+# "openaq" for coordinates from the API, "approximate" for hand-entered ones.
+STATION_LIST_DTYPES = {
+    **STATIONS_DTYPES,
+    "source": "category",
+}
+
+SENSORS_DTYPES = {
+    **STATIONS_DTYPES,
+    "sensor_id": "int64",
+    "parameter": "category",
+}
+
+STATION_DAILY_DTYPES = {
+    **STATIONS_DTYPES,
+    "parameter": "category",
+    "value":     "float64",
+    "sensors":   "int8",
+}
+
+AIR_QUALITY_DTYPES = {
+    **{col: "float64" for col in PM_COLS},
+    "aqi":          "float32",
+    "aqi_category": pd.CategoricalDtype(AQI_CATEGORIES, ordered=True),
+    "aqi_source":   pd.CategoricalDtype(AQI_SOURCES),
+}
+
+WEATHER_DTYPES = {col: "float32" for col in WEATHER_COLS}
+TRENDS_DTYPES  = {col: "float32" for col in TRENDS_COLS}
+CPCB_DTYPES    = {"aqi_cpcb": "float32"}
+
+# Dataset name (file stem under data/, data/raw or data/processed) -> dtypes.
+# Raw and processed files share a name; the raw one may lack some columns.
+DATASET_DTYPES = {
+    "openaq_raw":          OPENAQ_DTYPES,
+    "stations":            STATION_LIST_DTYPES,
+    "sensors":             SENSORS_DTYPES,
+    "station_daily":       STATION_DAILY_DTYPES,
+    "air_quality_daily":   AIR_QUALITY_DTYPES,
+    "weather_daily":       WEATHER_DTYPES,
+    "google_trends_daily": TRENDS_DTYPES,
+    "cpcb_daily":          CPCB_DTYPES,
+    "master_daily":        MASTER_DTYPES,
+}
@@ -0,0 +1,202 @@
+"""Local HTTP prediction service for daily AQI (FastAPI).
+
+Loads the registered decision tree and linear regression once at startup
+(``AQIPredictor.from_registry``) and scores batches with the vectorized
+``AQIPredictor.predict``::
+
+    python -m delhi_aq.service --port 8000
+
+    POST /predict      {"rows": [{"date": "2024-12-02", "pm25_avg": 180, "pm10_avg": 260,
+                                  "temp_mean": 14.2, "wind_speed_mean": 3.1,
+                                  "humidity_mean": 78, "precipitation": 0}, ...]}
+                       or {"columns": {"date": [...], "pm25_avg": [...], ...}}
+                    -> {"aqi_category": [...], "probability": [...], "aqi": [...]}
+    POST /predict/day  one row object -> {"aqi_category": ..., "probability": ..., "aqi": ...}
+    GET  /health       registry entries the service is running on
+
+Batches are answered column-wise (one list per output, in row order): the rows
+go into a single DataFrame and out as three lists, so the cost per request is
+a handful of numpy calls however many rows it carries. For large batches the
+``columns`` form is the fast path: a JSON array per feature parses several
+times faster than one object per row. Both endpoints apply the same type
+rules: numbers (or numeric strings) for the features, never booleans; a string
+for ``season``; an ISO date for ``date``. Each row needs at least one feature
+value; other missing values fall back to the notebook's handling (``Unknown``
+bin for the tree, training median for the regression).
+"""
+import argparse
+import datetime
+import json
+from contextlib import asynccontextmanager
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Request, Response
+from pydantic import BaseModel, field_validator
+
+from .paths import MODELS_DIR
+from .predict import INPUT_COLS, AQIPredictor
+from .registry import model_entry
+
+MAX_BATCH_ROWS = 100_000
+
+# Decimals returned per output; full float reprs would double the response encoding time.
+OUTPUT_DECIMALS = {"probability": 4, "aqi": 2}
+
+
+class DailyFeatures(BaseModel):
+    date: datetime.date | None = None
+    season: str | None = None
+    pm10_avg: float | None = None
+    pm25_avg: float | None = None
+    temp_mean: float | None = None
+    wind_speed_mean: float | None = None
+    humidity_mean: float | None = None
+    precipitation: float | None = None
+
+    @field_validator(*INPUT_COLS, mode="before")
+    @classmethod
+    def _not_bool(cls, value):
+        if isinstance(value, bool):
+            raise ValueError("must be a number or null")
+        return value
+
+
+FEATURE_FIELDS = ["date", "season"] + INPUT_COLS
+
+
+def _json(payload):
+    return Response(json.dumps(payload, allow_nan=False), media_type="application/json")
+
+
+def _frame(body):
+    """The request batch (``rows`` or ``columns``) as a DataFrame, typed by the rules of ``DailyFeatures``."""
+    if not isinstance(body, dict) or ("rows" in body) == ("columns" in body):
+        raise HTTPException(422, 'body must be {"rows": [...]} or {"columns": {...}}')
+    if "rows" in body:
+        rows = body["rows"]
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise HTTPException(422, "rows must be a list of objects")
+        n = len(rows)
+    else:
+        columns = body["columns"]
+        if not isinstance(columns, dict) or not all(isinstance(v, list) for v in columns.values()):
+            raise HTTPException(422, "columns must map feature names to lists")
+        lengths = {len(columns[c]) for c in FEATURE_FIELDS if c in columns}
+        if len(lengths) > 1:
+            raise HTTPException(422, "columns must all have the same length")
+        n = lengths.pop() if lengths else 0
+    if n > MAX_BATCH_ROWS:
+        raise HTTPException(413, f"at most {MAX_BATCH_ROWS:,} rows per request")
+
+    if "rows" in body:
+        frame = pd.DataFrame.from_records(rows, columns=FEATURE_FIELDS)
+    else:
+        frame = pd.DataFrame({c: columns[c] for c in FEATURE_FIELDS if c in columns}, index=range(n))
+    for col in INPUT_COLS:
+        if col not in frame:
+            continue
+        if pd.api.types.is_bool_dtype(frame[col]):
+            raise HTTPException(422, f"{col} must be a number or null")
+        if pd.api.types.is_numeric_dtype(frame[col]):
+            continue
+        # Mixed columns only: numeric strings parse as in DailyFeatures, bools/lists/objects don't.
+        given = frame[col].notna()
+        if not frame.loc[given, col].map(lambda v: isinstance(v, (int, float, str)) and not isinstance(v, bool)).all():
+            raise HTTPException(422, f"{col} must be a number or null")
+        values = pd.to_numeric(frame[col], errors="coerce")
+        if (values.isna() & given).any():
+            raise HTTPException(422, f"{col} must be a number or null")
+        frame[col] = values
+    for col in ("season", "date"):
+        given = frame[col].dropna().to_numpy(dtype=object) if col in frame else []
+        if len(given) and pd.api.types.infer_dtype(given) != "string":
+            raise HTTPException(422, f"{col} must be a string or null")
+    if "date" in frame:
+        try:
+            dates = pd.to_datetime(frame["date"], errors="coerce", format="ISO8601")
+        except (TypeError, ValueError):
+            dates = None
+        if dates is None or (dates.isna() & frame["date"].notna()).any():
+            raise HTTPException(422, "date must be an ISO date (YYYY-MM-DD) or null")
+        frame["date"] = dates
+    _check_finite(frame)
+    _check_present(frame)
+    return frame
+
+
+def _check_finite(frame):
+    """422 on infinite inputs (JSON ``1e999`` parses as inf); NaN/null is a missing value."""
+    for col in INPUT_COLS:
+        if col in frame and np.isinf(frame[col].to_numpy(dtype="float64")).any():
+            raise HTTPException(422, f"{col} must be finite")
+
+
+def _check_present(frame):
+    """422 for rows with every feature missing: the tree would answer them with full confidence."""
+    present = np.zeros(len(frame), dtype=bool)
+    for col in INPUT_COLS:
+        if col in frame:
+            present |= frame[col].notna().to_numpy()
+    if not present.all():
+        row = int(np.flatnonzero(~present)[0])
+        raise HTTPException(422, f"row {row}: at least one of {', '.join(INPUT_COLS)} is required")
+
+
+def _predict(predictor, frame):
+    """Scores of ``frame``; 422 if inputs are so extreme the AQI overflows (e.g. temp_mean=1e308)."""
+    with np.errstate(over="ignore", invalid="ignore"):
+        out = predictor.predict(frame)
+    if not np.isfinite(out["aqi"].to_numpy(dtype="float64")).all():
+        raise HTTPException(422, "inputs out of range: the predicted AQI is not finite")
+    return out.round(OUTPUT_DECIMALS)
+
+
+def create_app(directory=MODELS_DIR):
+    @asynccontextmanager
+    async def lifespan(app):
+        app.state.predictor = AQIPredictor.from_registry(directory)
+        app.state.models = {name: model_entry(name, directory) for name in ("decision_tree", "linear_regression")}
+        yield
+
+    app = FastAPI(title="Delhi AQI prediction", lifespan=lifespan)
+
+    @app.get("/health")
+    def health():
+        return {name: {"estimator": e["estimator"], "trained_at": e["trained_at"], "fingerprint": e["fingerprint"]}
+                for name, e in app.state.models.items()}
+
+    # The batch body is parsed as plain JSON rather than a list[DailyFeatures]: per-row model
+    # validation would dominate the request time at thousands of rows.
+    @app.post("/predict")
+    async def predict(request: Request):
+        try:
+            body = await request.json()
+        except ValueError:
+            raise HTTPException(422, "body is not valid JSON")
+        out = _predict(app.state.predictor, _frame(body))
+        return _json({col: out[col].tolist() for col in out.columns})
+
+    @app.post("/predict/day")
+    def predict_day(features: DailyFeatures):
+        frame = pd.DataFrame([features.model_dump()], columns=FEATURE_FIELDS)
+        _check_finite(frame)
+        _check_present(frame)
+        out = _predict(app.state.predictor, frame)
+        return out.to_dict(orient="records")[0]
+
+    return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    uvicorn.run(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Daily PM surfaces over Delhi by inverse-distance weighting of station readings.
+
+Every day of the station store (``delhi_aq.stations``) is interpolated onto a
+regular lat/lon grid over ``DELHI_BOUNDS`` (0.01°, about 1 km)::
+
+    cube = load_cube("pm25")         # built on first use, rebuilt when station_daily changes
+    cube.values                      # float32 (days, lat, lon); NaN on days without any station
+    cube.day("2019-11-05")           # one (lat, lon) surface
+    cube.nearest_km                  # distance from each cell to the closest station
+    animation_spec(cube, "2019-11-01", "2019-11-30", max_km=10)   # Plotly spec, one frame per day
+
+Each cell is the IDW mean (power ``IDW_POWER``) of its ``NEIGHBORS`` closest
+stations that reported that day. The weights depend only on which stations
+reported, and a decade of days has only a few hundred distinct sets of
+reporting stations. So the cell x station weight matrix is built once per set,
+and all the days of a set are interpolated with one matrix product.
+
+The cube is written to ``data/grids/<parameter>_idw.npz`` quantized to 0.1
+µg/m³ in uint16 and zip-compressed, together with the SHA-1 of the
+``station_daily.parquet`` it was built from (the same staleness check as
+``delhi_aq.aggregates``).
+
+Build manually with:
+    python -m delhi_aq.spatial
+"""
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .loader import file_hash, file_signature
+from .paths import DATA_DIR, DATA_DIR_PROCESSED, GRIDS_DIR
+from .schema import DATE_COL
+from .stations import DELHI_BOUNDS, StationStore
+from .storage import dataset_path
+
+GRID_STEP = 0.01      # degrees
+IDW_POWER = 2
+NEIGHBORS = 8
+
+# Stored values: round(value * SCALE) as uint16, NODATA for cells without an estimate.
+SCALE = 10
+NODATA = np.iinfo(np.uint16).max
+
+KM_PER_DEG_LAT = 110.57
+KM_PER_DEG_LON = 111.32
+
+
+def delhi_grid(step=GRID_STEP, bounds=DELHI_BOUNDS):
+    """Cell-centre latitudes and longitudes of a regular grid covering ``bounds``."""
+    lat = np.round(np.arange(bounds["lat_min"], bounds["lat_max"] + step / 2, step), 6)
+    lon = np.round(np.arange(bounds["lon_min"], bounds["lon_max"] + step / 2, step), 6)
+    return lat, lon
+
+
+def distance_km(lat, lon, station_lat, station_lon):
+    """(cells, stations) distances in km from every ``lat`` x ``lon`` cell (row-major) to each station.
+
+    Equirectangular: at city scale the error against great-circle distance is
+    far below the grid step.
+    """
+    cell_lat, cell_lon = np.meshgrid(lat, lon, indexing="ij")
+    kx = KM_PER_DEG_LON * np.cos(np.radians(np.mean(lat)))
+    dy = (cell_lat.reshape(-1, 1) - np.asarray(station_lat)[None, :]) * KM_PER_DEG_LAT
+    dx = (cell_lon.reshape(-1, 1) - np.asarray(station_lon)[None, :]) * kx
+    return np.hypot(dx, dy)
+
+
+def idw_weights(dist, available, power=IDW_POWER, neighbors=NEIGHBORS):
+    """(cells, stations) IDW weights over the ``neighbors`` closest ``available`` stations; rows sum to 1."""
+    cells, n = dist.shape
+    weights = np.zeros((cells, n), dtype="float64")
+    columns = np.flatnonzero(available)
+    if not len(columns):
+        return weights
+    d = dist[:, columns]
+    k = min(neighbors, len(columns))
+    nearest = np.argpartition(d, k - 1, axis=1)[:, :k] if k < len(columns) else np.broadcast_to(
+        np.arange(len(columns)), (cells, k))
+    # A cell on top of a station takes (almost) its value instead of dividing by zero.
+    w = 1.0 / np.maximum(np.take_along_axis(d, nearest, axis=1), 1e-3) ** power
+    rows = np.repeat(np.arange(cells), k)
+    weights[rows, columns[nearest].ravel()] = (w / w.sum(axis=1, keepdims=True)).ravel()
+    return weights
+
+
+def interpolate(values, dist, power=IDW_POWER, neighbors=NEIGHBORS):
+    """(days, cells) IDW surfaces from (days, stations) ``values`` (NaN = station did not report).
+
+    Days are grouped by their set of reporting stations; each set gets one
+    weight matrix and one matrix product.
+    """
+    available = ~np.isnan(values)
+    filled = np.where(available, values, 0.0)
+    out = np.full((len(values), dist.shape[0]), np.nan, dtype="float32")
+    patterns, group = np.unique(available, axis=0, return_inverse=True)
+    for g, pattern in enumerate(patterns):
+        if not pattern.any():
+            continue
+        days = np.flatnonzero(group == g)
+        out[days] = filled[days] @ idw_weights(dist, pattern, power, neighbors).T
+    return out
+
+
+@dataclass
+class SpatialCube:
+    """Daily surfaces of one parameter on the ``lat`` x ``lon`` grid."""
+    parameter: str
+    dates: pd.DatetimeIndex
+    lat: np.ndarray
+    lon: np.ndarray
+    values: np.ndarray
+    stations: pd.DataFrame
+    nearest_km: np.ndarray
+    source_sha1: str = ""
+
+    def day(self, date):
+        return self.values[self.dates.get_loc(pd.Timestamp(date))]
+
+    def window(self, start, end):
+        """``(dates, values)`` for the days between ``start`` and ``end`` (inclusive)."""
+        keep = (self.dates >= pd.Timestamp(start)) & (self.dates <= pd.Timestamp(end))
+        return self.dates[keep], self.values[keep]
+
+
+def animation_spec(cube, start, end, max_km=None, zmax=None, colorscale="YlOrRd"):
+    """Plotly figure spec (a dict for ``st.plotly_chart``) animating the daily surfaces from ``start`` to ``end``.
+
+    Cells farther than ``max_km`` from every station are blanked. The spec is
+    written directly rather than through ``plotly.express``, which validates
+    every frame and is several times slower than the figure is to draw.
+    """
+    dates, frames = cube.window(start, end)
+    if max_km is not None:
+        frames = np.where(cube.nearest_km > max_km, np.nan, frames)
+    zmax = float(np.nanmax(frames)) if zmax is None else zmax
+    lat, lon = cube.lat.tolist(), cube.lon.tolist()
+    labels = [f"{d:%d %b}" for d in dates]
+    heatmap = {"type": "heatmap", "x": lon, "y": lat, "zmin": 0, "zmax": zmax, "colorscale": colorscale,
+               "colorbar": {"title": {"text": "µg/m³"}},
+               "hovertemplate": "%{y:.2f}°N %{x:.2f}°E<br>%{z:.0f} µg/m³<extra></extra>"}
+    stations = {"type": "scatter", "x": cube.stations["lon"].tolist(), "y": cube.stations["lat"].tolist(),
+                "mode": "markers", "text": cube.stations["location_name"].tolist(), "hoverinfo": "text",
+                "marker": {"color": "black", "size": 6, "symbol": "triangle-up"}}
+    grid = list(frames.round(1))
+    play = {"frame": {"duration": 300, "redraw": True}, "transition": {"duration": 0}, "fromcurrent": True}
+    return {
+        "data": [{**heatmap, "z": grid[0] if grid else []}, stations],
+        "frames": [{"name": label, "data": [{"type": "heatmap", "z": z}], "traces": [0]} for label, z in zip(labels, grid)],
+        "layout": {
+            "height": 560, "showlegend": False, "margin": {"l": 0, "r": 0, "t": 30, "b": 0},
+            "xaxis": {"title": {"text": "Longitude"}, "constrain": "domain"},
+            "yaxis": {"title": {"text": "Latitude"}, "scaleanchor": "x",
+                      "scaleratio": 1 / np.cos(np.radians(np.mean(cube.lat)))},
+            "updatemenus": [{"type": "buttons", "showactive": False, "x": 0, "y": -0.08, "xanchor": "left",
+                             "buttons": [{"label": "▶", "method": "animate", "args": [None, play]},
+                                         {"label": "❚❚", "method": "animate",
+                                          "args": [[None], {"mode": "immediate", "frame": {"duration": 0}}]}]}],
+            "sliders": [{"x": 0.1, "len": 0.9, "y": -0.05, "currentvalue": {"prefix": ""},
+                         "steps": [{"label": label, "method": "animate",
+                                    "args": [[label], {"mode": "immediate", "frame": {"duration": 0, "redraw": True}}]}
+                                   for label in labels]}],
+        },
+    }
+
+
+def build_cube(store, parameter="pm25", step=GRID_STEP, power=IDW_POWER, neighbors=NEIGHBORS,
+               bounds=DELHI_BOUNDS):
+    """IDW cube of ``parameter`` for every calendar day between the store's first and last reading."""
+    rows = store.query(bounds, parameter=parameter)
+    wide = rows.pivot(index=DATE_COL, columns="location_id", values="value")
+    wide = wide.reindex(pd.date_range(wide.index.min(), wide.index.max(), freq="D"))
+    stations = store.stations.set_index("location_id").loc[wide.columns].reset_index()
+
+    lat, lon = delhi_grid(step, bounds)
+    dist = distance_km(lat, lon, stations["lat"], stations["lon"])
+    surfaces = interpolate(wide.to_numpy(dtype="float64"), dist, power, neighbors)
+    return SpatialCube(parameter, wide.index, lat, lon, surfaces.reshape(len(wide), len(lat), len(lon)),
+                       stations[["location_id", "location_name", "lat", "lon"]],
+                       dist.min(axis=1).reshape(len(lat), len(lon)).astype("float32"))
+
+
+def cube_path(parameter, out_dir=GRIDS_DIR):
+    return os.path.join(out_dir, f"{parameter}_idw.npz")
+
+
+def write_cube(cube, out_dir=GRIDS_DIR):
+    os.makedirs(out_dir, exist_ok=True)
+    quantized = np.where(np.isnan(cube.values), NODATA,
+                         np.clip(np.round(cube.values * SCALE), 0, NODATA - 1)).astype("uint16")
+    path = cube_path(cube.parameter, out_dir)
+    tmp = path + ".tmp.npz"
+    np.savez_compressed(tmp, values=quantized, dates=cube.dates.to_numpy().astype("datetime64[D]"),
+                        lat=cube.lat, lon=cube.lon, nearest_km=cube.nearest_km,
+                        station_id=cube.stations["location_id"].to_numpy(),
+                        station_name=np.array(cube.stations["location_name"].tolist(), dtype=str),
+                        station_lat=cube.stations["lat"].to_numpy(), station_lon=cube.stations["lon"].to_numpy(),
+                        parameter=cube.parameter, source_sha1=cube.source_sha1)
+    os.replace(tmp, path)
+    return path
+
+
+def read_cube(path):
+    with np.load(path) as z:
+        stored = z["values"]
+        values = stored.astype("float32") / SCALE
+        values[stored == NODATA] = np.nan
+        stations = pd.DataFrame({"location_id": z["station_id"], "location_name": z["station_name"],
+                                 "lat": z["station_lat"], "lon": z["station_lon"]})
+        return SpatialCube(str(z["parameter"]), pd.DatetimeIndex(z["dates"].astype("datetime64[ns]")),
+                           z["lat"], z["lon"], values, stations, z["nearest_km"], str(z["source_sha1"]))
+
+
+def _stored_sha1(path):
+    # npz members load lazily: this reads the hash without decompressing the cube.
+    try:
+        with np.load(path) as z:
+            return str(z["source_sha1"])
+    except (FileNotFoundError, KeyError, ValueError, OSError):
+        return None
+
+
+_lock = threading.Lock()
+_cubes = {}   # (path, parameter) -> (source signature, source sha1, cube)
+
+
+def load_cube(parameter="pm25", source_dir=DATA_DIR_PROCESSED, out_dir=GRIDS_DIR):
+    """The cube of ``parameter``, rebuilt if ``station_daily.parquet`` changed since it was written."""
+    source = dataset_path("station_daily", source_dir)
+    key = (out_dir, parameter)
+    signature = file_signature(source)
+    cached = _cubes.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[2]
+
+    with _lock:
+        cached = _cubes.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[2]
+        sha1 = file_hash(source)
+        path = cube_path(parameter, out_dir)
+        if _stored_sha1(path) == sha1:
+            cube = read_cube(path)
+        else:
+            cube = build_cube(StationStore.from_parquet(source), parameter)
+            cube.source_sha1 = sha1
+            write_cube(cube, out_dir)
+        _cubes[key] = (signature, sha1, cube)
+        return cube
+
+
+if __name__ == "__main__":
+    import time
+
+    for parameter in ("pm25", "pm10"):
+        t0 = time.perf_counter()
+        cube = load_cube(parameter)
+        print(f"✅ {parameter}: {cube.values.shape[0]:,} days x {cube.values.shape[1]}x{cube.values.shape[2]} cells "
+              f"from {len(cube.stations)} stations in {time.perf_counter() - t0:.1f}s "
+              f"-> {os.path.relpath(cube_path(parameter), DATA_DIR)} "
+              f"({os.path.getsize(cube_path(parameter)) / 1e6:.1f} MB)")
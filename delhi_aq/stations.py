@@ -0,0 +1,170 @@
+"""Station-level daily PM store, indexed by (station, parameter, date).
+
+The collection notebook averages ``openaq_raw`` into one city-wide value per
+day and drops where each reading came from. This store keeps the stations:
+one row per (location, parameter, day), the mean over that location's sensors,
+with the station's coordinates from the ``stations`` dataset::
+
+    store = load_station_store()
+    store.stations                                        # location_id, location_name, lat, lon, first, last, days, parameters
+    store.history(17, "pm25")                             # one station's full series
+    store.query(bbox={"lat_min": 28.5, "lat_max": 28.7, "lon_min": 77.0, "lon_max": 77.3},
+                start="2019-11-01", end="2019-11-30", parameter="pm25")
+
+``station_daily.parquet`` is written sorted by (location_id, parameter, date)
+in small row groups, so a ``location_id`` filter in ``read_dataset`` only
+decodes that station's row groups. In memory every (location, parameter) series
+is one contiguous slice of the sorted arrays: a query picks the stations from
+the small coordinate table, then finds each series' date range with
+``np.searchsorted`` inside its slice. Neither query ever touches the rows of
+stations outside the box.
+
+Build after ``openaq_raw`` is cleaned (the collection notebook does this) with:
+    python -m delhi_aq.stations
+"""
+import numpy as np
+import pandas as pd
+
+from .loader import cached_read
+from .paths import DATA_DIR_PROCESSED, DATA_DIR_RAW
+from .schema import DATE_COL
+from .storage import dataset_path, read_dataset, read_parquet, write_dataset
+
+# Bounding box of the OpenAQ station discovery in final_data_collection.ipynb.
+DELHI_BOUNDS = {"lat_min": 28.40, "lat_max": 28.88, "lon_min": 76.84, "lon_max": 77.35}
+
+STATION_COLS = ["location_id", "location_name", "lat", "lon"]
+STORE_KEY = ["location_id", "parameter", DATE_COL]
+
+# Rows per Parquet row group of station_daily: about one station-parameter series.
+ROW_GROUP_ROWS = 1024
+
+
+def station_daily(aq_raw, stations):
+    """Per-station daily means of ``aq_raw`` (``openaq_raw``), with ``stations`` coordinates.
+
+    Locations missing from ``stations`` are kept with NaN coordinates; they show
+    up in ``history`` but never match a bounding box.
+    """
+    daily = (aq_raw.groupby(["location_id", "parameter", DATE_COL], observed=True)["value"]
+             .agg(value="mean", sensors="size")
+             .reset_index())
+    names = aq_raw.drop_duplicates("location_id", keep="last").set_index("location_id")["location_name"]
+    coords = stations.drop_duplicates("location_id", keep="last").set_index("location_id")[["lat", "lon"]]
+    daily["location_name"] = daily["location_id"].map(names).astype(str)
+    daily = daily.join(coords, on="location_id")
+    return daily[STATION_COLS + ["parameter", DATE_COL, "value", "sensors"]]
+
+
+def approximate_locations(directory=DATA_DIR_RAW):
+    """``location_id``s in ``stations`` whose coordinates were not taken from OpenAQ."""
+    def read(path):
+        stations = read_parquet(path, "stations")
+        if "source" not in stations:
+            return frozenset()
+        return frozenset(stations.loc[stations["source"] != "openaq", "location_id"].tolist())
+    return cached_read(dataset_path("stations", directory), read)
+
+
+def build_station_store(aq_dir=DATA_DIR_PROCESSED, stations_dir=DATA_DIR_RAW, out_dir=DATA_DIR_PROCESSED):
+    """Write ``station_daily.parquet`` from ``openaq_raw`` and ``stations``; returns its path."""
+    daily = station_daily(read_dataset("openaq_raw", aq_dir), read_dataset("stations", stations_dir))
+    return write_dataset(daily, "station_daily", out_dir, csv=False,
+                         sort_by=STORE_KEY, row_group_size=ROW_GROUP_ROWS)
+
+
+def _day_number(values):
+    return np.asarray(values, dtype="datetime64[D]").astype("int64")
+
+
+def _is_sorted(ids, params, days):
+    """Whether rows are already ordered by (location_id, parameter, date)."""
+    d_id, d_param, d_day = np.diff(ids), np.diff(params), np.diff(days)
+    return bool(((d_id > 0) | ((d_id == 0) & ((d_param > 0) | ((d_param == 0) & (d_day >= 0))))).all())
+
+
+class StationStore:
+    """Sorted station-day rows plus the row range of every (location_id, parameter) series."""
+
+    def __init__(self, frame):
+        frame = frame.astype({"parameter": "category"})
+        ids = frame["location_id"].to_numpy()
+        params = frame["parameter"].cat.codes.to_numpy()
+        days = _day_number(frame[DATE_COL])
+        if not _is_sorted(ids, params, days):
+            order = np.lexsort((days, params, ids))
+            frame = frame.take(order)
+            ids, params, days = ids[order], params[order], days[order]
+        self.frame = frame.reset_index(drop=True)
+        self._days = days
+
+        names = frame["parameter"].cat.categories.astype(str)
+        starts = np.flatnonzero(np.r_[True, (ids[1:] != ids[:-1]) | (params[1:] != params[:-1])])
+        stops = np.r_[starts[1:], len(frame)]
+        self._ranges = {(int(ids[s]), names[params[s]]): (int(s), int(e)) for s, e in zip(starts, stops)}
+        self.parameters = sorted({p for _, p in self._ranges})
+
+        # One row per station from its first row and its series' date ranges, not a pass over every row.
+        firsts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        stations = self.frame.loc[firsts, STATION_COLS].reset_index(drop=True)
+        series = {}
+        for (loc, p), (s, e) in self._ranges.items():
+            series.setdefault(loc, []).append((p, days[s:e]))
+        span = [(min(d[0] for _, d in v), max(d[-1] for _, d in v),
+                 len(np.unique(np.concatenate([d for _, d in v]))), ",".join(sorted(p for p, _ in v)))
+                for v in (series[loc] for loc in stations["location_id"])]
+        first, last, n_days, parameters = zip(*span) if span else ([], [], [], [])
+        self.stations = stations.assign(
+            first=np.array(first, dtype="datetime64[D]").astype("datetime64[ms]"),
+            last=np.array(last, dtype="datetime64[D]").astype("datetime64[ms]"),
+            days=np.array(n_days, dtype="int64"),
+            parameters=list(parameters),
+        )
+
+    @classmethod
+    def from_parquet(cls, path):
+        return cls(read_parquet(path, "station_daily"))
+
+    def _series(self, location_ids, parameter):
+        params = self.parameters if parameter is None else [parameter]
+        return [self._ranges[(loc, p)] for loc in location_ids for p in params if (loc, p) in self._ranges]
+
+    def _take(self, ranges, start, end):
+        lo = -np.inf if start is None else _day_number(pd.Timestamp(start).to_datetime64())
+        hi = np.inf if end is None else _day_number(pd.Timestamp(end).to_datetime64())
+        parts = []
+        for s, e in ranges:
+            days = self._days[s:e]
+            a = s + np.searchsorted(days, lo, side="left")
+            b = s + np.searchsorted(days, hi, side="right")
+            if b > a:
+                parts.append(np.arange(a, b))
+        rows = np.concatenate(parts) if parts else np.array([], dtype="int64")
+        return self.frame.take(rows).reset_index(drop=True)
+
+    def in_bbox(self, bbox):
+        """``location_id`` of the stations inside ``bbox`` (``DELHI_BOUNDS``-style dict, bounds inclusive)."""
+        st = self.stations
+        inside = (st["lat"].between(bbox["lat_min"], bbox["lat_max"])
+                  & st["lon"].between(bbox["lon_min"], bbox["lon_max"]))
+        return st.loc[inside, "location_id"].tolist()
+
+    def query(self, bbox=None, start=None, end=None, parameter=None):
+        """Station-day rows of every station in ``bbox`` between ``start`` and ``end`` (inclusive)."""
+        location_ids = self.stations["location_id"].tolist() if bbox is None else self.in_bbox(bbox)
+        return self._take(self._series(location_ids, parameter), start, end)
+
+    def history(self, location_id, parameter=None, start=None, end=None):
+        """Every day stored for one station (both parameters unless ``parameter`` is given)."""
+        return self._take(self._series([int(location_id)], parameter), start, end)
+
+
+def load_station_store(directory=DATA_DIR_PROCESSED):
+    """The shared ``StationStore``, re-read only when ``station_daily.parquet`` changes."""
+    return cached_read(dataset_path("station_daily", directory), StationStore.from_parquet)
+
+
+if __name__ == "__main__":
+    path = build_station_store()
+    store = load_station_store()
+    print(f"✅ {len(store.frame):,} station-days, {len(store.stations)} stations -> {path}")
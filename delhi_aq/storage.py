@@ -0,0 +1,166 @@
+"""Columnar (Parquet) storage for the raw and processed datasets.
+
+Parquet is the canonical format: every dataset is written with an explicit
+Arrow schema derived from ``delhi_aq.schema`` (date32 dates, float32
+measurements, dictionary-encoded labels), sorted by date so row-group
+statistics make date filters cheap. CSVs are still written next to the Parquet
+files as an export for people opening the data in a spreadsheet.
+
+Reads support column projection and predicate pushdown::
+
+    read_dataset("master_daily", DATA_DIR,
+                 columns=["date", "aqi"],
+                 filters=[("date", ">=", "2020-01-01"), ("season", "==", "Winter")])
+
+Convert the existing CSVs with:
+    python -m delhi_aq.storage
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .paths import DATA_DIR, DATA_DIR_PROCESSED, DATA_DIR_RAW
+from .schema import DATASET_DTYPES, DATE_COL
+
+PARQUET_COMPRESSION = "zstd"
+
+
+def dataset_path(name, directory, ext="parquet"):
+    return os.path.join(directory, f"{name}.{ext}")
+
+
+def parse_dates(values):
+    """Parse ISO dates; fall back to day-first for spreadsheet-mangled files (e.g. ``18/2/25``)."""
+    try:
+        return pd.to_datetime(values, format="ISO8601")
+    except ValueError:
+        return pd.to_datetime(values, format="mixed", dayfirst=True)
+
+
+def arrow_type(dtype):
+    if isinstance(dtype, pd.CategoricalDtype):
+        return pa.dictionary(pa.int32(), pa.string(), ordered=bool(dtype.ordered))
+    if dtype == "category":
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.from_numpy_dtype(np.dtype(dtype))
+
+
+def arrow_schema(df, name):
+    """Arrow schema for ``df`` as dataset ``name``; columns without a declared type are inferred."""
+    dtypes = DATASET_DTYPES.get(name, {})
+    fields = []
+    for col in df.columns:
+        if col == DATE_COL:
+            fields.append(pa.field(col, pa.date32()))
+        elif col in dtypes:
+            fields.append(pa.field(col, arrow_type(dtypes[col])))
+        else:
+            fields.append(pa.field(col, pa.Array.from_pandas(df[col]).type))
+    return pa.schema(fields)
+
+
+def coerce(df, name):
+    """Cast ``df`` to the declared dtypes of dataset ``name``."""
+    df = df.copy()
+    if DATE_COL in df.columns and not pd.api.types.is_datetime64_any_dtype(df[DATE_COL]):
+        df[DATE_COL] = parse_dates(df[DATE_COL])
+    dtypes = DATASET_DTYPES.get(name, {})
+    return df.astype({col: dtype for col, dtype in dtypes.items() if col in df.columns})
+
+
+def _restore_dtypes(df, name):
+    # Dictionary columns come back unordered with categories in first-seen order.
+    dtypes = DATASET_DTYPES.get(name, {})
+    cats = {col: dtype for col, dtype in dtypes.items()
+            if col in df.columns and isinstance(dtype, pd.CategoricalDtype)}
+    return df.astype(cats) if cats else df
+
+
+def write_dataset(df, name, directory, csv=True, sort_by=(DATE_COL,), row_group_size=None):
+    """Write ``df`` as ``<directory>/<name>.parquet`` (and the CSV export unless ``csv=False``).
+
+    Rows are sorted by the ``sort_by`` columns present in ``df``; filters on the
+    leading sort column prune whole row groups, so pick ``row_group_size`` small
+    enough to give the statistics something to prune.
+    """
+    os.makedirs(directory, exist_ok=True)
+    df = coerce(df, name)
+    sort_by = [col for col in sort_by if col in df.columns]
+    if sort_by:
+        df = df.sort_values(sort_by, kind="stable").reset_index(drop=True)
+
+    table = pa.Table.from_pandas(df, schema=arrow_schema(df, name), preserve_index=False)
+    pq.write_table(table, dataset_path(name, directory), compression=PARQUET_COMPRESSION,
+                   row_group_size=row_group_size)
+    if csv:
+        df.to_csv(dataset_path(name, directory, "csv"), index=False)
+    return dataset_path(name, directory)
+
+
+def append_dataset(df, name, directory, key=(DATE_COL,), csv=True):
+    """Upsert ``df`` into dataset ``name`` on the ``key`` columns and rewrite it.
+
+    For keys in ``df``, its columns replace the stored values, NaN included (a
+    re-fetched window that came back empty clears the old values); stored
+    columns that ``df`` lacks (e.g. the other keywords of a wide trends table)
+    are kept.
+    """
+    path = dataset_path(name, directory)
+    if os.path.exists(path):
+        existing = read_parquet(path, name)
+        key = list(key)
+        new = coerce(df, name).set_index(key)
+        merged = new.combine_first(existing.set_index(key))
+        merged.loc[new.index, new.columns] = new  # combine_first keeps stored values where new is NaN
+        df = merged.reset_index()[list(existing.columns.union(df.columns, sort=False))]
+    return write_dataset(df, name, directory, csv=csv)
+
+
+def _normalize_filters(filters):
+    # date32 columns compare against datetime.date, so accept strings/Timestamps too.
+    if filters is None:
+        return None
+    out = []
+    for col, op, value in filters:
+        if col == DATE_COL:
+            if op in ("in", "not in"):
+                value = [pd.Timestamp(v).date() for v in value]
+            else:
+                value = pd.Timestamp(value).date()
+        out.append((col, op, value))
+    return out
+
+
+def read_parquet(path, name, columns=None, filters=None):
+    table = pq.read_table(path, columns=columns, filters=_normalize_filters(filters))
+    return _restore_dtypes(table.to_pandas(date_as_object=False), name)
+
+
+def read_dataset(name, directory, columns=None, filters=None):
+    """Read dataset ``name`` from ``directory``, projecting ``columns`` and pushing down ``filters``."""
+    return read_parquet(dataset_path(name, directory), name, columns, filters)
+
+
+def read_csv_dataset(path, name):
+    """Parse a legacy/exported CSV into the declared dtypes."""
+    return coerce(pd.read_csv(path), name)
+
+
+def convert_csvs(directories=(DATA_DIR, DATA_DIR_RAW, DATA_DIR_PROCESSED)):
+    """Write a Parquet copy of every known dataset CSV found in ``directories``."""
+    written = []
+    for directory in directories:
+        for name in DATASET_DTYPES:
+            csv_path = dataset_path(name, directory, "csv")
+            if os.path.exists(csv_path):
+                write_dataset(read_csv_dataset(csv_path, name), name, directory, csv=False)
+                written.append(dataset_path(name, directory))
+    return written
+
+
+if __name__ == "__main__":
+    for path in convert_csvs():
+        print(f"✅ {os.path.relpath(path, DATA_DIR)}")
@@ -0,0 +1,330 @@
+"""Seeded synthetic Delhi data in the raw dataset layouts, for scale testing.
+
+Generates the collection notebook's inputs at any size: ``openaq_raw`` for
+hundreds of stations, daily or hourly, plus ``stations``, ``weather_daily``,
+``google_trends_daily`` and the CPCB wide Excel sheets::
+
+    city = SyntheticDelhi(stations=300, start="2016-01-01", end="2025-12-31", freq="h", seed=0)
+    city.weather()                     # weather_daily rows
+    city.trends()                      # google_trends_daily rows
+    city.cpcb_wide(2024)               # the AQI_daily_city_level_delhi_<year> sheet layout
+    for chunk in city.openaq_chunks(): # openaq_raw, one station (all its sensors) per chunk
+        ...
+    city.write("/tmp/delhi_300h")      # everything, openaq_raw streamed to Parquet + CSV
+
+Days share one set of city-wide drivers: monthly climatologies of the
+2016-2025 data, interpolated over the year, with AR(1) weather anomalies on
+top. PM2.5 has its winter peak (November-January) and its monsoon low. Rain
+and wind lower it on the day, and its log-anomaly is persistent, so bad days
+come in runs. Each station scales the city level by its own factor and noise.
+Hourly data adds a diurnal cycle (night peak, afternoon low). PM10 follows the
+month's PM10/PM2.5 ratio. Stations come online over the decade, sensors have
+multi-day outages (missing rows) and the odd missing, negative or
+out-of-range value, so the notebook's cleaning has work to do.
+
+Everything depends only on ``seed``. Each station draws from its own
+generator, so chunks can be produced in any order or in parallel.
+``openaq_raw`` is never held in memory whole: ``write`` appends one station
+at a time to a Parquet row group and the CSV export, so peak memory is one
+station's series.
+
+Generate from the command line with:
+    python -m delhi_aq.synthetic --out /tmp/delhi_synthetic --stations 300 --freq h
+"""
+import argparse
+import os
+from contextlib import ExitStack
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from scipy.signal import lfilter
+
+from .aqi import AQI_CATEGORIES, aqi_category, sub_index
+from .schema import DATE_COL, TRENDS_COLS
+from .stations import DELHI_BOUNDS
+from .storage import PARQUET_COMPRESSION, arrow_schema, coerce, dataset_path, write_dataset
+
+# Monthly means of the real data (Jan..Dec), interpolated between mid-months.
+MONTHLY = {
+    "pm25":          [159, 120, 103, 96, 82, 59, 50, 40, 52, 132, 221, 202],
+    "pm10":          [273, 249, 194, 235, 211, 160, 98, 82, 113, 264, 373, 345],
+    "temp_max":      [19.2, 23.9, 29.8, 36.8, 38.7, 38.1, 33.6, 32.5, 32.6, 31.7, 26.7, 21.4],
+    "temp_min":      [8.1, 11.5, 16.4, 22.2, 25.6, 27.8, 26.7, 26.1, 24.8, 20.0, 14.5, 9.5],
+    "humidity_mean": [77.3, 65.3, 52.4, 32.4, 39.9, 52.8, 77.3, 79.6, 75.2, 60.7, 61.4, 69.8],
+    "wind_speed":    [8.9, 9.8, 10.1, 10.6, 10.5, 10.6, 8.9, 9.5, 8.7, 7.7, 8.0, 8.0],
+    "rain_chance":   [0.22, 0.19, 0.22, 0.16, 0.35, 0.51, 0.92, 0.87, 0.60, 0.13, 0.08, 0.08],
+    "rain_mm":       [1.2, 0.6, 0.8, 0.3, 1.1, 2.5, 7.7, 5.5, 4.0, 0.6, 0.2, 0.2],   # mean over all days
+}
+MID_MONTH = np.array([15.5, 45.0, 74.5, 105.0, 135.5, 166.0, 196.5, 227.5, 258.0, 288.5, 319.0, 349.5])
+
+# City PM2.5: log-anomaly persistence and spread, and how much rain (per mm) and wind (per km/h) clear it.
+PM_PERSISTENCE = 0.7
+PM_SIGMA = 0.25
+RAIN_WASHOUT = 0.04
+WIND_DISPERSION = 0.03
+
+# Hourly profile: peak around 02:00, low in the afternoon.
+DIURNAL_AMPLITUDE = 0.35
+DIURNAL_PEAK_HOUR = 2
+
+# Sensor faults: outages per sensor-year (mean length in days), and per-reading fault rates.
+OUTAGES_PER_YEAR = 4
+OUTAGE_DAYS = 7
+MISSING_RATE = 2e-4
+NEGATIVE_RATE = 1e-5
+SPIKE_RATE = 1e-5
+
+# Share of each Google Trends series lost to empty pytrends windows (of TRENDS_WINDOW days), as in the real pull.
+TRENDS_MISSING = {"air_pollution_Delhi": 0.18, "N95_mask": 0.37, "air_purifier": 0.0,
+                  "breathing_problem": 0.51, "AQI_Delhi": 0.12}
+TRENDS_WINDOW = 73
+
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December"]
+
+OPENAQ_COLS = ["date", "value", "sensor_id", "location_id", "location_name", "parameter"]
+
+
+def _ar1(rng, n, phi, sigma):
+    """Stationary AR(1) series with marginal standard deviation ``sigma``."""
+    shocks = rng.normal(0.0, sigma * np.sqrt(1 - phi ** 2), n)
+    shocks[0] = rng.normal(0.0, sigma)
+    return lfilter([1.0], [1.0, -phi], shocks)
+
+
+def _readings_per_day(freq):
+    return len(pd.date_range("2000-01-01", "2000-01-02", freq=freq, inclusive="left"))
+
+
+class SyntheticDelhi:
+    """City-wide daily drivers and station layout for one seed; generates each raw dataset from them."""
+
+    def __init__(self, stations=30, start="2016-01-01", end="2025-12-31", freq="D", seed=0):
+        self.start = pd.Timestamp(start).normalize()
+        self.end = pd.Timestamp(end).normalize()
+        self.freq = freq
+        self.seed = seed
+        self.days = pd.date_range(self.start, self.end, freq="D")
+        self.drivers = self._drivers()
+        self.stations = self._stations(stations)
+
+    def _climatology(self, name):
+        doy = self.days.dayofyear.to_numpy(dtype="float64")
+        return np.interp(doy, MID_MONTH, MONTHLY[name], period=365.25)
+
+    def _drivers(self):
+        rng = np.random.default_rng([self.seed, 0])
+        n = len(self.days)
+        clim = self._climatology
+
+        temp_anomaly = _ar1(rng, n, 0.8, 2.5)
+        temp_max = clim("temp_max") + temp_anomaly + rng.normal(0, 1.0, n)
+        temp_min = clim("temp_min") + 0.8 * temp_anomaly + rng.normal(0, 1.0, n)
+
+        chance = clim("rain_chance")
+        wet = rng.random(n) < chance
+        precipitation = np.where(wet, rng.gamma(0.6, clim("rain_mm") / chance / 0.6), 0.0)
+        humidity = np.clip(clim("humidity_mean") + _ar1(rng, n, 0.7, 8.0) + 1.5 * np.minimum(precipitation, 10),
+                           8, 100)
+        wind = clim("wind_speed") * rng.lognormal(0.0, 0.3, n)
+        wind_max = wind * (1.4 + 0.3 * np.abs(rng.normal(0, 1, n)))
+
+        log_pm = (_ar1(rng, n, PM_PERSISTENCE, PM_SIGMA)
+                  - RAIN_WASHOUT * np.minimum(precipitation, 30)
+                  - WIND_DISPERSION * (wind - clim("wind_speed")))
+        pm25 = clim("pm25") * np.exp(log_pm)
+        pm10_ratio = clim("pm10") / clim("pm25")
+
+        return pd.DataFrame({
+            "temp_max":        temp_max,
+            "temp_min":        temp_min,
+            "temp_mean":       (temp_max + temp_min) / 2,
+            "wind_speed_max":  wind_max,
+            "wind_speed_mean": wind,
+            "humidity_mean":   humidity,
+            "precipitation":   precipitation,
+            "pm25":            pm25,
+            "pm10_ratio":      pm10_ratio,
+        }, index=self.days)
+
+    def _stations(self, n):
+        rng = np.random.default_rng([self.seed, 1])
+        b = DELHI_BOUNDS
+        span = len(self.days)
+        # Most stations report from the start; the rest come online during the first 60% of the calendar.
+        online = np.where(rng.random(n) < 0.5, 0, rng.integers(0, max(1, int(span * 0.6)), n))
+        return pd.DataFrame({
+            "location_id":   np.arange(1, n + 1, dtype="int64"),
+            "location_name": [f"Synthetic Station {i:03d}, Delhi - SYN" for i in range(1, n + 1)],
+            "lat":           np.round(rng.uniform(b["lat_min"], b["lat_max"], n), 4),
+            "lon":           np.round(rng.uniform(b["lon_min"], b["lon_max"], n), 4),
+            "level":         rng.lognormal(0.0, 0.25, n),
+            "first":         self.days[online],
+            "has_pm10":      rng.random(n) >= 0.15,
+        })
+
+    def weather(self):
+        """``weather_daily`` rows (Open-Meteo layout)."""
+        cols = ["temp_max", "temp_min", "temp_mean", "wind_speed_max", "wind_speed_mean",
+                "humidity_mean", "precipitation"]
+        out = self.drivers[cols].round(2).rename_axis(DATE_COL).reset_index()
+        return coerce(out, "weather_daily")
+
+    def trends(self):
+        """``google_trends_daily`` rows: search interest (0-100) following city PM2.5, with empty windows."""
+        rng = np.random.default_rng([self.seed, 2])
+        n = len(self.days)
+        signal = np.log(self.drivers["pm25"].to_numpy())
+        signal = (signal - signal.min()) / (signal.max() - signal.min())
+        out = pd.DataFrame({DATE_COL: self.days})
+        windows = np.arange(n) // TRENDS_WINDOW
+        for col in TRENDS_COLS:
+            base, gain = rng.uniform(5, 30), rng.uniform(40, 70)
+            values = np.clip(np.round(base + gain * signal ** 2 + rng.normal(0, 6, n)), 0, 100)
+            lost = rng.random(windows.max() + 1) < TRENDS_MISSING[col]
+            out[col] = np.where(lost[windows], np.nan, values)
+        return coerce(out, "google_trends_daily")
+
+    def station_frame(self):
+        """``stations`` rows (coordinates of every location)."""
+        return coerce(self.stations[["location_id", "location_name", "lat", "lon"]], "stations")
+
+    def _sensor(self, rng, station, parameter, times, day_index, sensor_id):
+        per_day = _readings_per_day(self.freq)
+        base = self.drivers["pm25"].to_numpy()[day_index] * station.level
+        base *= np.exp(_ar1(rng, len(times), 0.6 ** (1 / per_day), 0.15))
+        if per_day > 1:
+            hours = times.hour.to_numpy()
+            base *= 1 + DIURNAL_AMPLITUDE * np.cos(2 * np.pi * (hours - DIURNAL_PEAK_HOUR) / 24)
+        if parameter == "pm10":
+            base *= self.drivers["pm10_ratio"].to_numpy()[day_index] * rng.lognormal(0.0, 0.1, len(times))
+        value = np.round(base * rng.lognormal(0.0, 0.08, len(times)), 1)
+
+        faults = rng.random(len(times))
+        value[faults < MISSING_RATE] = np.nan
+        value[(faults >= MISSING_RATE) & (faults < MISSING_RATE + NEGATIVE_RATE)] = -1.0
+        spikes = (faults >= MISSING_RATE + NEGATIVE_RATE) & (faults < MISSING_RATE + NEGATIVE_RATE + SPIKE_RATE)
+        value[spikes] = 2000.0
+
+        keep = np.ones(len(times), dtype=bool)
+        years = len(times) / per_day / 365.25
+        for _ in range(rng.poisson(OUTAGES_PER_YEAR * years)):
+            start = rng.integers(0, len(times))
+            keep[start:start + int(rng.geometric(1 / OUTAGE_DAYS) * per_day)] = False
+
+        return pd.DataFrame({
+            "date":          times[keep],
+            "value":         value[keep],
+            "sensor_id":     sensor_id,
+            "location_id":   station.location_id,
+            "location_name": station.location_name,
+            "parameter":     parameter,
+        })
+
+    def openaq_station(self, location_id):
+        """``openaq_raw`` rows of one station (both its sensors), from that station's own generator."""
+        station = self.stations.set_index("location_id", drop=False).loc[location_id]
+        rng = np.random.default_rng([self.seed, 3, int(location_id)])
+        times = pd.date_range(station["first"], self.end + pd.Timedelta(days=1), freq=self.freq, inclusive="left")
+        day_index = ((times.normalize() - self.start) // pd.Timedelta(days=1)).to_numpy()
+        parameters = ["pm25", "pm10"] if station["has_pm10"] else ["pm25"]
+        parts = [self._sensor(rng, station, p, times, day_index, int(location_id) * 100 + k)
+                 for k, p in enumerate(parameters)]
+        return pd.concat(parts, ignore_index=True)[OPENAQ_COLS]
+
+    def openaq_chunks(self):
+        """``openaq_raw`` one station at a time (a generator, so only one station is in memory)."""
+        for location_id in self.stations["location_id"]:
+            yield self.openaq_station(location_id)
+
+    def city_aqi(self):
+        """Daily city AQI of the synthetic PM2.5 (what the CPCB bulletin reports)."""
+        return pd.Series(np.round(sub_index(self.drivers["pm25"].to_numpy(), "pm25")), index=self.days)
+
+    def cpcb_wide(self, year, availability=0.99):
+        """One year in the layout of the CPCB city bulletin sheet: Day x month AQI, then category counts."""
+        rng = np.random.default_rng([self.seed, 4, year])
+        aqi = self.city_aqi()
+        grid = pd.DataFrame(np.nan, index=range(1, 32), columns=MONTH_NAMES)
+        for day in pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D"):
+            if day in aqi.index and rng.random() < availability:
+                grid.iloc[day.day - 1, day.month - 1] = aqi[day]
+
+        categories = aqi_category(grid.stack())
+        counts = categories.groupby(level=1, observed=False).value_counts().unstack(0)
+        counts = counts.reindex(index=AQI_CATEGORIES, columns=MONTH_NAMES).replace(0, np.nan)
+        days_in_month = pd.Series([pd.Period(f"{year}-{m:02d}").days_in_month for m in range(1, 13)],
+                                  index=MONTH_NAMES)
+        available = np.round(100 * grid.notna().sum() / days_in_month)
+
+        labels = (list(range(1, 32)) + [np.nan] + [c.replace("Very Poor", "Very poor")
+                                                            for c in AQI_CATEGORIES] + [np.nan, "SP", "% of Availability"])
+        body = pd.concat([grid, pd.DataFrame(np.nan, index=[0], columns=MONTH_NAMES), counts,
+                          pd.DataFrame(np.nan, index=[0, 1], columns=MONTH_NAMES), available.to_frame().T],
+                         ignore_index=True)
+        body.insert(0, "Day", labels)
+        return body
+
+    def write(self, out_dir, csv=True, cpcb=True):
+        """Write every dataset to ``out_dir`` (Parquet, plus CSV unless ``csv=False``); returns rows per file."""
+        os.makedirs(out_dir, exist_ok=True)
+        rows = {}
+        for name, frame in [("stations", self.station_frame()), ("weather_daily", self.weather()),
+                            ("google_trends_daily", self.trends())]:
+            write_dataset(frame, name, out_dir, csv=csv)
+            rows[name] = len(frame)
+        rows["openaq_raw"] = self._write_openaq(out_dir, csv)
+        if cpcb:
+            for year in sorted(set(self.days.year)):
+                path = os.path.join(out_dir, f"AQI_daily_city_level_delhi_{year}_delhi_{year}.xlsx")
+                sheet = self.cpcb_wide(year)
+                sheet.to_excel(path, index=False)
+                rows[os.path.basename(path)] = int(sheet.iloc[:31, 1:].notna().sum().sum())  # days reported
+        return rows
+
+    def _write_openaq(self, out_dir, csv):
+        # Sorted by station rather than date (one row group per station): write_dataset would need it all in memory.
+        # The CSV export goes through Arrow's writer too, about 10x faster than DataFrame.to_csv.
+        total = 0
+        with ExitStack() as stack:
+            writers = None
+            for chunk in self.openaq_chunks():
+                chunk = coerce(chunk, "openaq_raw")
+                if writers is None:
+                    schema = arrow_schema(chunk, "openaq_raw")
+                    if _readings_per_day(self.freq) > 1:
+                        schema = schema.set(schema.get_field_index(DATE_COL), pa.field(DATE_COL, pa.timestamp("ms")))
+                    writers = [stack.enter_context(pq.ParquetWriter(dataset_path("openaq_raw", out_dir), schema,
+                                                                    compression=PARQUET_COMPRESSION))]
+                    if csv:
+                        writers.append(stack.enter_context(pa_csv.CSVWriter(
+                            dataset_path("openaq_raw", out_dir, "csv"), schema,
+                            write_options=pa_csv.WriteOptions(quoting_style="needed"))))
+                table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                for writer in writers:
+                    writer.write_table(table)
+                total += len(chunk)
+        return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", required=True, help="output directory")
+    parser.add_argument("--stations", type=int, default=30)
+    parser.add_argument("--start", default="2016-01-01")
+    parser.add_argument("--end", default="2025-12-31")
+    parser.add_argument("--freq", default="D", help="reading interval of openaq_raw: D (daily) or h (hourly)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-csv", action="store_true", help="Parquet only")
+    args = parser.parse_args()
+
+    city = SyntheticDelhi(args.stations, args.start, args.end, args.freq, args.seed)
+    rows = city.write(args.out, csv=not args.no_csv)
+    print(f"✅ synthetic data in {args.out}: " + ", ".join(f"{name} {n:,}" for name, n in rows.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,67 @@
 import streamlit as st
-import streamlit.components.v1 as components
 import pandas as pd
 import os
-
+import sys
+
+# Make the shared `delhi_aq` package importable when launched via `streamlit run website/webapp.py`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from delhi_aq import instrument
+from delhi_aq.aggregates import load_aggregate
+from delhi_aq.aqi import AQI_CATEGORIES
+from delhi_aq.figures import load_figure
+from delhi_aq.registry import load_model, model_entry, stale_sources
+from delhi_aq.spatial import animation_spec, load_cube
+from delhi_aq.stations import DELHI_BOUNDS, approximate_locations, load_station_store
+
+# Data loads are timed while a rerun is being instrumented (see delhi_aq.instrument);
+# otherwise each call only checks that no rerun is open.
+load_aggregate     = instrument.timed(load_aggregate)
+load_figure        = instrument.timed(load_figure)
+load_model         = instrument.timed(load_model)
+load_station_store = instrument.timed(load_station_store)
+load_cube          = instrument.timed(load_cube)
 
 st.set_page_config(
     page_title="Urban Suffocation",
     layout="wide"
 )
 
+# Timing is on for every session with DELHI_AQ_TIMING=1, or for this one with ?diagnostics=1
+# (which also shows the diagnostics panel in the sidebar).
+diagnostics = st.query_params.get("diagnostics") == "1"
+if instrument.ENABLED or diagnostics:
+    instrument.begin_rerun(session=st.session_state.setdefault("timings", instrument.Recorder()))
+
 st.title("Urban Suffocation")
 st.subheader(
     "A Spatiotemporal Analysis of Air Pollution, Policy, Weather, and Public Response in Delhi"
 )
 
 
-tab_intro, tab_proposal, tab_explore, tab_models, tab_conclusion, tab_team = st.tabs([
-      "Introduction",
-      "Proposal Overview",
-      "Data Exploration",
-      "Model Implementation",
-      "Conclusion",
-      "Team"
-  ])
+def header(title):
+    """``st.header`` that also starts a timing section of the same name."""
+    instrument.section(title)
+    st.header(title)
+
+
+def show_image(path, **kwargs):
+    """``st.image`` timed as ``image:<file name>``."""
+    with instrument.timer(f"image:{os.path.basename(path)}"):
+        st.image(path, **kwargs)
 
 
-with tab_intro:
+# Each section is a page function. Only the page the viewer has open is executed
+# on a rerun, so the Team page no longer pays for the heatmap, summary table and
+# figure embeds of the other sections. Pages are registered at the bottom of the file.
+
+def render_introduction():
 
     # ============================================================
     # Research Topic & Significance
     # ============================================================
 
-    st.header("Research Topic & Significance")
+    header("Research Topic & Significance")
 
     st.markdown("""
     This project analyzes severe air pollution events in Delhi by studying long-term trends
@@ -75,15 +105,9 @@ with tab_intro:
     import numpy as np
     import os
 
-    # Load actual master data
-    master = pd.read_csv("data/master_daily.csv")
-    master["date"] = pd.to_datetime(master["date"])
-    master["year"]  = master["date"].dt.year
-    master["month"] = master["date"].dt.month
-
-    # Real monthly average AQI heatmap
-    heatmap_data = master.groupby(["year", "month"])["aqi"].mean().reset_index()
-    heatmap_pivot = heatmap_data.pivot(index="year", columns="month", values="aqi")
+    # Real monthly average AQI heatmap (precomputed from master_daily.csv)
+    instrument.section("AQI heatmap")
+    heatmap_pivot = load_aggregate("aqi_heatmap")
     month_labels  = ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
 
     fig = px.imshow(
@@ -119,7 +143,7 @@ with tab_intro:
     # Geographic & Temporal Context
     # ============================================================
 
-    st.header("Geographic & Temporal Context")
+    header("Geographic & Temporal Context")
 
     st.markdown("""
     Delhi’s geographic and climatic characteristics play a critical role in shaping its air
@@ -144,7 +168,7 @@ with tab_intro:
     # Stakeholders (Who is Affected?)
     # ============================================================
 
-    st.header("Stakeholders (Who is Affected?)")
+    header("Stakeholders (Who is Affected?)")
 
     st.markdown("""
     Air pollution in Delhi directly affects residents through increased health risks and
@@ -178,12 +202,7 @@ with tab_intro:
 
     import plotly.graph_objects as go
 
-    annual_pm25 = (
-    master.dropna(subset=["pm25_avg"])
-    .groupby("year")["pm25_avg"]
-    .mean()
-    .reset_index()
-    )
+    annual_pm25 = load_aggregate("annual_pm25")
 
     who_guideline  = 15   # WHO 2021 24hr guideline
     india_standard = 60   # India NAAQS annual standard
@@ -238,7 +257,7 @@ with tab_intro:
     # Existing Solutions & Gaps
     # ============================================================
 
-    st.header("Existing Solutions & Gaps")
+    header("Existing Solutions & Gaps")
 
     st.markdown("""
     Existing solutions include air quality monitoring networks, emission control policies,
@@ -313,7 +332,7 @@ with tab_intro:
     # Blueprint for the Project
     # ============================================================
 
-    st.header("Blueprint for the Project")
+    header("Blueprint for the Project")
 
     st.markdown("""
     The project will integrate air quality, meteorological, satellite-based, and public
@@ -401,8 +420,8 @@ with tab_intro:
     """, unsafe_allow_html=True)
 
 
-with tab_proposal:
-    st.header("Proposal Overview")
+def render_proposal():
+    header("Proposal Overview")
 
     st.markdown("""
     ### Research Topic
@@ -508,25 +527,27 @@ with tab_proposal:
     **Abhirama Karthikeya Mullapudi, Thiyagu Rajendran, Srihari Pulagalla, Natarajan Krishnan**
     """)
 
-with tab_explore:
+PARAMETER_LABELS = {"pm25": "PM2.5", "pm10": "PM10"}
+
+# Grid cells farther than this from every station are left blank on the interpolated surface.
+SURFACE_MAX_KM = 10
+# Fixed colour range (µg/m³) so months can be compared; readings above it saturate.
+SURFACE_ZMAX = {"pm25": 300, "pm10": 500}
 
-    FIGURES_DIR = "data/figures"
 
-    def show_plot(html_filename, title, what, interpretation):
+def render_exploration():
+
+    def show_plot(figure_name, title, what, interpretation):
         st.subheader(title)
-        html_path = os.path.join(FIGURES_DIR, html_filename)
-        
-        if os.path.exists(html_path):
-            # 1. Read the HTML file content
-            with open(html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            # 2. Render the HTML component
-            # Note: You may need to adjust the 'height' to match your plot
-            components.html(html_content, height=500, scrolling=True)
-        else:
-            st.warning(f"Figure not found: {html_filename}")
-            
+        with instrument.timer(f"figure:{figure_name}"):
+            spec = load_figure(figure_name)
+
+            if spec is not None:
+                # Plotly JSON spec exported by the notebook; rendered by the page's shared plotly.js
+                st.plotly_chart(spec, use_container_width=True)
+            else:
+                st.warning(f"Figure not found: {figure_name}.json")
+
         st.markdown(f"**📊 What we are plotting:** {what}")
         st.markdown(f"**💡 Interpretation:** {interpretation}")
         st.divider()
@@ -534,7 +555,7 @@ with tab_explore:
     # ================================================================
     # SECTION 1: DATA COLLECTION
     # ================================================================
-    st.header("1. Data Collection")
+    header("1. Data Collection")
 
     st.markdown("""
     All datasets were collected from dynamic, authoritative APIs or official government portals.
@@ -600,7 +621,7 @@ with tab_explore:
     # ================================================================
     # SECTION 2: BEFORE / AFTER CLEANING
     # ================================================================
-    st.header("2. Before & After Cleaning")
+    header("2. Before & After Cleaning")
 
     st.markdown("""
     Raw data arrived in four different formats with inconsistent schemas, granularities, and quality issues.
@@ -661,7 +682,7 @@ with tab_explore:
     # ================================================================
     # SECTION 3: DATA CLEANING & PREPROCESSING
     # ================================================================
-    st.header("3. Data Cleaning & Preprocessing")
+    header("3. Data Cleaning & Preprocessing")
 
     st.markdown("""
     **Date Parsing & Type Standardization**  
@@ -709,19 +730,12 @@ with tab_explore:
     # ================================================================
     # SECTION 4: SUMMARY STATISTICS
     # ================================================================
-    st.header("4. Summary Statistics")
+    header("4. Summary Statistics")
 
     try:
-        master = pd.read_csv("data/master_daily.csv")
-        master["date"] = pd.to_datetime(master["date"])
-
-        summary_cols = ["pm25_avg", "pm10_avg", "aqi", "temp_mean",
-                        "wind_speed_mean", "humidity_mean", "precipitation"]
-
-        summary = master[summary_cols].describe().T.round(2)
-        summary["skewness"] = master[summary_cols].skew().round(3)
-        summary["missing"]  = master[summary_cols].isna().sum()
-        st.dataframe(summary, use_container_width=True)
+        with instrument.timer("summary_stats table"):
+            summary = load_aggregate("summary_stats")
+            st.dataframe(summary, use_container_width=True)
 
     except Exception as e:
         st.warning(f"Could not load master dataset: {e}")
@@ -749,13 +763,9 @@ with tab_explore:
 
     # AQI Category breakdown
     st.markdown("**AQI Category Distribution (2016–2024)**")
-    if 'master' in dir() and 'aqi_category' in master.columns:
-        cat_order  = ["Good", "Satisfactory", "Moderate", "Poor", "Very Poor", "Severe"]
-        cat_counts = master["aqi_category"].value_counts().reindex(cat_order).reset_index()
-        cat_counts.columns = ["AQI Category", "Days"]
-        cat_counts["Percentage"] = (cat_counts["Days"] / cat_counts["Days"].sum() * 100).round(1)
-        cat_counts["AQI Range"]  = ["0–50", "51–100", "101–200", "201–300", "301–400", "401–500"]
-        st.dataframe(cat_counts[["AQI Category", "AQI Range", "Days", "Percentage"]], use_container_width=True)
+    if 'summary' in dir():
+        cat_counts = load_aggregate("aqi_category_counts")
+        st.dataframe(cat_counts, use_container_width=True)
         st.caption("Very Poor + Severe account for 47.8% of all days. Good + Satisfactory combined: only 13.8%.")
 
     st.divider()
@@ -763,82 +773,239 @@ with tab_explore:
     # ================================================================
     # SECTION 5: VISUALIZATIONS
     # ================================================================
-    st.header("5. Visualizations")
+    header("5. Visualizations")
 
     viz_list = [
         (
-            "01_pm25_trend.html",
+            "01_pm25_trend",
             "VIZ 1 — PM2.5 Long-Term Trend (2016–2025)",
             "Daily PM2.5 concentration across all Delhi stations with a 30-day rolling average, compared against WHO (15 µg/m³) and India NAAQS (60 µg/m³) guidelines.",
             "PM2.5 levels surge dramatically every winter, often peaking at 10–20× the WHO limit, with spikes reaching nearly 600 µg/m³. Critically, even the seasonal troughs rarely dip below the WHO guideline, and the rolling mean stays above India NAAQS for significant portions of each year. No sustained downward trend is visible — Delhi's pollution crisis is structural, not episodic."
         ),
         (
-            "02_aqi_heatmap.html",
+            "02_aqi_heatmap",
             "VIZ 2 — Monthly AQI Heatmap (Year × Month)",
             "Average AQI per month per year shown as a color-coded heatmap, where darker red indicates hazardous conditions.",
             "The heatmap confirms a repeating pollution calendar — winter months (Nov–Jan) are universally dark red across all years, with AQI frequently in the 400–500 range. Despite various policy interventions over the years, the magnitude of winter peaks remains largely unchanged, confirming that seasonal meteorological forces dominate over policy effects."
         ),
         (
-            "03_season_violin.html",
+            "03_season_violin",
             "VIZ 3 — Season-wise AQI Distribution",
             "Violin plots showing the distribution of daily AQI values across the four seasons: Winter, Spring, Monsoon, and Post-Monsoon.",
             "Winter is the most hazardous season with its median AQI sitting well above the Very Poor threshold. Post-Monsoon shows a bimodal distribution — a transition from relatively clean air to extreme spikes as winter approaches. Even Monsoon presents significant outliers. Very Poor air is not an anomaly in Delhi but the statistical norm for nearly half the year."
         ),
         (
-            "06_severe_days.html",
+            "06_severe_days",
             "VIZ 4 — Annual Count of Very Poor and Severe AQI Days",
             "Stacked bar chart showing the number of days per year classified as 'Very Poor' (AQI 300–400) or 'Severe' (AQI > 400).",
             "Delhi records 70–150 dangerous air days annually — roughly 20–40% of every year. While 2016 saw 37 severe days and 2024 recorded 24, extreme peaks remain a persistent threat with no sustained downward trend. 2022 stands out as the lowest combined count, likely driven by favorable meteorological conditions rather than policy success."
         ),
         (
-            "07_correlation_heatmap.html",
+            "07_correlation_heatmap",
             "VIZ 5 — Correlation Matrix: Pollution vs Meteorological Variables",
             "Pearson correlation heatmap between PM2.5, PM10, AQI, temperature, wind speed, humidity, and precipitation.",
             "Temperature (r=−0.56) and precipitation (r=−0.28) are the strongest natural mitigators of pollution. Temperature range shows a moderate positive correlation (r=0.52), confirming that thermally stable days with narrow diurnal swings trap pollutants near the surface. Mean wind speed shows only a weak negative correlation (r=−0.20), suggesting thermal inversion effects dominate over wind dispersal as the primary driver."
         ),
         (
-            "08_trends_vs_pm25.html",
+            "08_trends_vs_pm25",
             "VIZ 6 — Google Search Interest vs Actual PM2.5 (Dual Axis)",
             "Monthly average PM2.5 on one axis and Google search interest for 'air pollution Delhi' and 'AQI Delhi' on the other, overlaid on the same timeline.",
             "Search interest spikes almost perfectly mirror PM2.5 peaks. A notable post-2022 shift shows 'AQI Delhi' surpassing 'air pollution' as the dominant query, suggesting the public has moved toward seeking specific, actionable metrics. However, interest drops to near-zero as soon as PM2.5 subsides, confirming that public attention is purely reactive — driven by acute discomfort rather than sustained environmental concern."
         ),
         (
-            "09_aqi_stacked_bar.html",
+            "09_aqi_stacked_bar",
             "VIZ 7 — Annual AQI Category Breakdown",
             "Stacked bar chart showing the number of days in each AQI category (Good to Severe) per year.",
             "The proportion of unhealthy days (Moderate or worse) remains persistently high across the decade. A slight expansion of Good and Satisfactory days is visible in 2020 and 2024, likely reflecting pandemic-related activity shifts and favorable dispersion conditions rather than structural improvement. Healthy air remains a rare luxury in Delhi — the underlying baseline is still far from meeting global health standards."
         ),
         (
-            "11_pm_ratio.html",
+            "11_pm_ratio",
             "VIZ 8 — PM2.5/PM10 Ratio by Month and Year",
             "Line plot of monthly PM2.5/PM10 ratio per year. A ratio above 0.5 indicates combustion sources (fine particles); below 0.5 indicates dust or coarse particles.",
             "The ratio consistently climbs above 0.5 during winter (Nov–Jan), confirming that toxic winter peaks are driven primarily by combustion — crop burning, vehicles, and heating — rather than natural dust. Summer months see the ratio dip below 0.5 as wind-blown dust increases. A notable spike above 1.0 in March 2018 suggests an unusual combustion-heavy event that warrants further investigation."
         ),
         (
-            "12_rain_recovery.html",
+            "12_rain_recovery",
             "VIZ 9 — AQI Recovery Curve After Rain Events",
-            "Mean AQI for 5 days before and after significant rain events (>5mm precipitation), with standard deviation bands.",
+            "Mean AQI for 5 days before and after significant rain events (>5mm precipitation), with standard deviation bars and a 95% confidence band for the mean.",
             "Following a significant rain event, mean AQI drops to its lowest point on Day 1 — a clear wet deposition effect. However, pollution rebounds steadily from Day 2 and returns to pre-rain baseline within just five days. This rapid recovery confirms that while rain provides immediate cleansing, it does not address the continuous high-volume emission sources dominating Delhi's landscape."
         ),
         (
-            "13_weekday_weekend.html",
+            "13_weekday_weekend",
             "VIZ 10 — Weekday vs Weekend AQI",
             "Bar chart of mean AQI per day of week with median trend line, comparing weekday (Mon–Fri) vs weekend (Sat–Sun) pollution levels.",
             "AQI levels remain remarkably stable from Monday through Sunday, with overlapping error bars indicating no significant weekend effect. This confirms that Delhi's pollution is driven by constant, large-scale factors — industrial emissions, regional biomass burning, and freight transport — that far outweigh daily commuter traffic fluctuations. Localized traffic restrictions alone are insufficient without addressing these broader emission sources."
         ),
         (
-            "15_lag_correlation.html",
+            "15_lag_correlation",
             "VIZ 11 — Cross-Correlation: Google Trends vs AQI at Different Lags",
             "Pearson correlation between AQI and three search keywords at time lags from -14 to +14 days. Negative lag means searches lead AQI.",
-            "Peak correlation (r≈0.3) for 'air pollution Delhi' and 'AQI Delhi' occurs at a 1-day positive lag — people search most intensely the day after a spike is recorded, not before. N95 mask searches show weak correlation across all lags, suggesting protective gear purchases are driven by seasonal readiness rather than acute episodes. Public digital behavior is reactive, not predictive — confirming it cannot serve as an early-warning signal under current patterns."
+            "Correlation for 'air pollution Delhi' (r≈0.3) and 'AQI Delhi' (r≈0.25) jumps at a 1-day positive lag, with 'AQI Delhi' staying level through +3 days — people search most intensely after a spike is recorded, not before. N95 mask searches show weak correlation across all lags, suggesting protective gear purchases are driven by seasonal readiness rather than acute episodes. Public digital behavior is reactive, not predictive — confirming it cannot serve as an early-warning signal under current patterns."
         ),
     ]
 
-    for img_file, title, what, interpretation in viz_list:
-        show_plot(img_file, title, what, interpretation)
+    for figure_name, title, what, interpretation in viz_list:
+        show_plot(figure_name, title, what, interpretation)
+
+    # ================================================================
+    # SECTION 6: STATION-LEVEL VIEW
+    # ================================================================
+    header("6. Station-Level View")
+
+    def station_view():
+        st.markdown("""
+        The city-level series above averages every station into one value per day. The station store
+        keeps each monitor's own daily series and location, so the spread across the city stays visible.
+        """)
+
+        try:
+            store = load_station_store()
+        except FileNotFoundError:
+            st.warning("Station store not found: run `python -m delhi_aq.stations`.")
+            return
+
+        import plotly.express as px
+
+        first, last = store.stations["first"].min().date(), store.stations["last"].max().date()
+        col_param, col_range = st.columns([1, 3])
+        with col_param:
+            parameter = st.radio("Pollutant", ["pm25", "pm10"], format_func=PARAMETER_LABELS.get, horizontal=True)
+        with col_range:
+            window = st.slider("Date range", min_value=first, max_value=last,
+                               value=(max(first, last.replace(year=last.year - 1)), last), format="YYYY-MM-DD")
+
+        in_window = store.query(DELHI_BOUNDS, start=window[0], end=window[1], parameter=parameter)
+        if in_window.empty:
+            st.info("No station reported this pollutant in the selected range.")
+            return
+        station_means = (in_window.groupby(["location_id", "location_name", "lat", "lon"], observed=True)["value"]
+                         .agg(mean="mean", days="size").reset_index())
+
+        fig = px.scatter_map(station_means, lat="lat", lon="lon", color="mean", size="days",
+                             hover_name="location_name", hover_data={"mean": ":.0f", "days": True,
+                                                                     "lat": False, "lon": False},
+                             color_continuous_scale="YlOrRd", zoom=9, height=480,
+                             labels={"mean": f"Mean {PARAMETER_LABELS[parameter]}", "days": "Days"})
+        fig.update_layout(map_style="carto-positron", margin=dict(l=0, r=0, t=0, b=0))
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"{len(station_means)} stations reporting {PARAMETER_LABELS[parameter]} between "
+                   f"{window[0]:%d %b %Y} and {window[1]:%d %b %Y}; marker size = days with data.")
+        try:
+            approximate = station_means["location_id"].isin(approximate_locations()).sum()
+        except FileNotFoundError:
+            approximate = 0
+        if approximate:
+            st.caption(f"⚠️ {approximate} of these stations are placed at approximate, hand-entered "
+                       "coordinates (to about 0.01°). Re-running `final_data_collection.ipynb` replaces "
+                       "them with the OpenAQ locations.")
+
+        names = station_means.sort_values("mean", ascending=False).set_index("location_id")["location_name"]
+        station = st.selectbox("Station history", names.index.tolist(), format_func=names.get, key="station")
+        history = store.history(station)
+        fig = px.line(history, x="date", y="value", color="parameter",
+                      labels={"value": "µg/m³", "date": "", "parameter": ""},
+                      title=f"{names[station]} — full daily history")
+        fig.update_traces(connectgaps=False)
+        fig.update_layout(height=400)
+        st.plotly_chart(fig, use_container_width=True)
+
+
+    station_view()
+
+    # ================================================================
+    # SECTION 7: INTERPOLATED PM SURFACE
+    # ================================================================
+    header("7. Interpolated PM Surface")
+
+    st.markdown("""
+    Station readings are spread onto a ~1 km grid over the OpenAQ bounding box by inverse-distance
+    weighting of the 8 nearest reporting stations, one surface per day. Far from any monitor the surface
+    is only a guess, so cells more than 10 km from the nearest station are left blank. The blank edges
+    show how thinly the industrial east and north are covered (see Data Ethics above).
+    """)
+
+    def surface_view():
+        try:
+            parameter = st.radio("Pollutant", ["pm25", "pm10"], format_func=PARAMETER_LABELS.get,
+                                 horizontal=True, key="surface_parameter")
+            cube = load_cube(parameter)
+        except FileNotFoundError:
+            st.warning("Station store not found: run `python -m delhi_aq.stations`.")
+            return
+
+        import numpy as np
+
+        reported = pd.Series(~np.isnan(cube.values[:, 0, 0]), index=cube.dates)
+        months = reported.groupby(cube.dates.to_period("M")).any()
+        months = months[months].index
+        month = st.select_slider("Month", options=list(months), value=months[-1],
+                                 format_func=lambda m: m.strftime("%b %Y"), key="surface_month")
+
+        spec = animation_spec(cube, month.start_time, month.end_time, max_km=SURFACE_MAX_KM,
+                              zmax=SURFACE_ZMAX[parameter])
+        st.plotly_chart(spec, use_container_width=True)
+        st.caption(f"Daily {PARAMETER_LABELS[parameter]} surfaces for {month.strftime('%B %Y')} from "
+                   f"{len(cube.stations)} stations; press ▶ to animate. Blank days had no station reporting.")
+
+    surface_view()
+
+
+# Models saved by Model_implementation.ipynb (data/models/registry.json)
+REGISTERED_MODELS = ["naive_bayes", "decision_tree", "kmeans", "dbscan", "linear_regression", "apriori"]
+
+# Rule-card labels for the binned Apriori items, e.g. "pm25_bin_PM25_Severe" -> "PM25_Severe"
+RULE_ITEM_LABELS = {"aqi_category": "AQI = {}", "season": "Season={}"}
+RULE_ITEM_COLUMNS = ["pm10_bin", "pm25_bin", "temp_bin", "wind_bin", "humidity_bin", "precip_bin",
+                     "season", "aqi_category"]
+
+
+def fmt_metric(metrics, key, fmt="{:.2f}", fallback="N/A"):
+    """Format a registry metric, or ``fallback`` when the model (or metric) isn't registered."""
+    value = metrics.get(key)
+    return fallback if value is None else fmt.format(value)
+
+
+def rule_item_label(name):
+    for col in RULE_ITEM_COLUMNS:
+        if name.startswith(f"{col}_"):
+            return RULE_ITEM_LABELS.get(col, "{}").format(name[len(col) + 1:])
+    return name
+
+
+def worst_category_rule():
+    """``(antecedents, consequent, confidence)`` of the most confident registered Apriori rule
+    for the worst AQI category any rule predicts, or None when the rules aren't registered."""
+    if not model_entry("apriori"):
+        return None
+    rules = load_model("apriori")["artifacts"].get("rules")
+    if rules is None:
+        return None
+    single = rules[rules["consequents"].map(len) == 1]
+    consequent = single["consequents"].map(lambda c: next(iter(c)))
+    for category in reversed(AQI_CATEGORIES):
+        hits = single[consequent == f"aqi_category_{category}"]
+        if len(hits):
+            best = hits.sort_values(["confidence", "lift"], ascending=False).iloc[0]
+            return (" + ".join(rule_item_label(i) for i in sorted(best["antecedents"])),
+                    rule_item_label(f"aqi_category_{category}"), best["confidence"])
+    return None
+
+
+def confusion_figure(metrics, title):
+    import plotly.express as px
+    fig = px.imshow(metrics["confusion_matrix"], x=metrics["labels"], y=metrics["labels"], text_auto=True,
+                    color_continuous_scale="Blues", labels=dict(x="Predicted", y="Actual", color="Days"))
+    fig.update_layout(title=title, height=420, coloraxis_showscale=False)
+    return fig
+
 
+def render_models():
 
-with tab_models:
+    # Metrics of the fitted notebook models, read once per process (re-read only when the
+    # notebook re-registers them). The hand-written milestone figures are the fallback.
+    registry = {name: model_entry(name) or {} for name in REGISTERED_MODELS}
+    nb, dt, km, db, lr, ap = (registry[name].get("metrics", {}) for name in REGISTERED_MODELS)
+    coef = lr.get("coefficients", {})
 
     # ── Custom CSS for this tab ──────────────────────────────
     st.markdown("""
@@ -941,15 +1108,26 @@ with tab_models:
     </div>
     """, unsafe_allow_html=True)
 
+    trained = [entry["trained_at"][:10] for entry in registry.values() if entry]
+    if trained:
+        st.caption(f"Results below are read from the model registry (`data/models`, "
+                   f"{len(trained)}/{len(REGISTERED_MODELS)} models, trained {max(trained)}).")
+        stale = sorted({src for name in REGISTERED_MODELS for src in stale_sources(name)})
+        if stale:
+            st.warning(f"Source data changed since the models were trained ({', '.join(stale)}); "
+                       f"re-run Model_implementation.ipynb to refresh them.")
+    else:
+        st.caption("No registered models found in `data/models`; showing the Milestone 3 figures.")
+
     # ── At-a-glance summary metrics ──────────────────────────
     st.subheader("At-a-Glance Results")
     c1, c2, c3, c4, c5 = st.columns(5)
     cards = [
-        ("Decision Tree", "92%", "Accuracy", "#3498db"),
-        ("Decision Tree", "0.98", "ROC-AUC", "#3498db"),
-        ("Linear Regression", "0.961", "R² Score", "#ff6b35"),
-        ("K-Means", "0.40–0.45", "Silhouette", "#2ecc71"),
-        ("Apriori Top Rule", "3.3×", "Lift", "#9b59b6"),
+        ("Decision Tree", fmt_metric(dt, "accuracy", "{:.0%}", "92%"), "Accuracy", "#3498db"),
+        ("Decision Tree", fmt_metric(dt, "roc_auc", "{:.2f}", "0.98"), "ROC-AUC", "#3498db"),
+        ("Linear Regression", fmt_metric(lr, "r2", "{:.3f}", "0.961"), "R² Score", "#ff6b35"),
+        ("K-Means", fmt_metric(km, "silhouette", "{:.2f}", "0.40–0.45"), "Silhouette", "#2ecc71"),
+        ("Apriori Top Rule", fmt_metric(ap, "max_lift", "{:.1f}×", "3.3×"), "Lift", "#9b59b6"),
     ]
     for col, (model, val, label, color) in zip([c1, c2, c3, c4, c5], cards):
         with col:
@@ -966,7 +1144,7 @@ with tab_models:
     # ================================================================
     # SECTION 1 — DATA PREPARATION FOR MODELING
     # ================================================================
-    st.header("1. Data Preparation for Modeling")
+    header("1. Data Preparation for Modeling")
 
     st.markdown("""
     Three source CSV files were merged on the `date` column:
@@ -1052,7 +1230,7 @@ with tab_models:
     # ================================================================
     # SECTION 2 — MODELS
     # ================================================================
-    st.header("2. Models Implemented")
+    header("2. Models Implemented")
 
     # ── 2.1 Naive Bayes ─────────────────────────────────────
     st.markdown('<span class="model-badge badge-classification">Classification</span>', unsafe_allow_html=True)
@@ -1102,7 +1280,8 @@ with tab_models:
     st.markdown("**Performance Metrics**")
     nb_metrics = pd.DataFrame({
         "Metric": ["Overall Accuracy", "Precision (macro)", "Recall (macro)", "F1-Score (macro)"],
-        "Value": ["~0.72", "~0.69", "~0.70", "~0.69"],
+        "Value": [fmt_metric(nb, "accuracy", fallback="~0.72"), fmt_metric(nb, "precision_macro", fallback="~0.69"),
+                  fmt_metric(nb, "recall_macro", fallback="~0.70"), fmt_metric(nb, "f1_macro", fallback="~0.69")],
         "Notes": [
             "Moderate; degraded by NB independence assumption",
             "Varies by class; lower for transitional categories",
@@ -1173,11 +1352,15 @@ with tab_models:
         """)
 
     st.markdown("**Performance Metrics**")
+    accuracy_gap = (f"{(dt['accuracy'] - nb['accuracy']) * 100:+.1f}pp" if "accuracy" in dt and "accuracy" in nb
+                    else "+20pp")
     dt_metrics = pd.DataFrame({
         "Metric": ["Overall Accuracy", "Precision (macro)", "Recall (macro)", "F1-Score (macro)", "ROC-AUC (macro OvR)"],
-        "Value": ["~0.92 ✅", "~0.90", "~0.91", "~0.91", "~0.98 ✅"],
+        "Value": [fmt_metric(dt, "accuracy", "{:.2f} ✅", "~0.92 ✅"), fmt_metric(dt, "precision_macro", fallback="~0.90"),
+                  fmt_metric(dt, "recall_macro", fallback="~0.91"), fmt_metric(dt, "f1_macro", fallback="~0.91"),
+                  fmt_metric(dt, "roc_auc", "{:.2f} ✅", "~0.98 ✅")],
         "Notes": [
-            "Strong — significantly outperforms Naive Bayes (+20pp)",
+            f"Outperforms Naive Bayes ({accuracy_gap})",
             "High across all six AQI classes",
             "Extreme classes (Severe, Good) near-perfect",
             "Best classification model overall",
@@ -1185,12 +1368,12 @@ with tab_models:
         ]
     })
     st.dataframe(dt_metrics, use_container_width=True, hide_index=True)
-    st.markdown("""
+    st.markdown(f"""
     <div class="info-box">
     💡 The top decision split is on <b>PM2.5 bin</b>, confirming the correlation analysis from
     Milestone 2 (AQI ↔ PM2.5: r = 0.91). Temperature bin and season appear at lower tree levels,
-    capturing the winter vs. monsoon regime distinction. The near-perfect ROC-AUC of 0.98 indicates
-    the probability estimates are well-calibrated and feature bins are highly discriminative.
+    capturing the winter vs. monsoon regime distinction. The near-perfect ROC-AUC of
+    {fmt_metric(dt, "roc_auc", fallback="0.98")} indicates the probability estimates are well-calibrated and feature bins are highly discriminative.
     </div>
     """, unsafe_allow_html=True)
 
@@ -1230,6 +1413,23 @@ with tab_models:
         })
         st.dataframe(km_ht, use_container_width=True, hide_index=True)
 
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+
+        # Precomputed k sweep over the daily master data (models reused from the fit cache)
+        km_sweep = load_aggregate("kmeans_sweep")
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        fig.add_trace(go.Scatter(x=km_sweep["k"], y=km_sweep["inertia"].round(0), name="Inertia",
+                                 mode="lines+markers", line=dict(color="#3498db")))
+        fig.add_trace(go.Scatter(x=km_sweep["k"], y=km_sweep["silhouette"].round(3), name="Silhouette",
+                                 mode="lines+markers", line=dict(color="#2ecc71", dash="dot")),
+                      secondary_y=True)
+        fig.update_layout(title="Elbow & Silhouette by k (daily master data)", xaxis_title="k",
+                          height=380)
+        fig.update_yaxes(title_text="Inertia", secondary_y=False)
+        fig.update_yaxes(title_text="Silhouette Score", secondary_y=True)
+        st.plotly_chart(fig, use_container_width=True)
+
     with st.expander("▸ Challenges & solutions"):
         st.markdown("""
         **Challenge:** PM2.5 and PM10 outliers (values up to 750 µg/m³) pulled centroids toward
@@ -1253,18 +1453,18 @@ with tab_models:
 
     col_m1, col_m2 = st.columns(2)
     with col_m1:
-        st.markdown("""
+        st.markdown(f"""
         <div class="metric-card" style="border-color:#2ecc7144;">
             <div class="label">Silhouette Score</div>
-            <div class="value" style="color:#2ecc71;">0.40–0.45</div>
+            <div class="value" style="color:#2ecc71;">{fmt_metric(km, "silhouette", "{:.3f}", "0.40–0.45")}</div>
             <div class="sub">Moderate-good cluster separation</div>
         </div>
         """, unsafe_allow_html=True)
     with col_m2:
-        st.markdown("""
+        st.markdown(f"""
         <div class="metric-card" style="border-color:#2ecc7144;">
             <div class="label">Optimal k</div>
-            <div class="value" style="color:#2ecc71;">3</div>
+            <div class="value" style="color:#2ecc71;">{fmt_metric(km, "k", "{}", "3")}</div>
             <div class="sub">Elbow visible at k=3 in inertia plot</div>
         </div>
         """, unsafe_allow_html=True)
@@ -1325,7 +1525,10 @@ with tab_models:
     st.markdown("**Performance Metrics**")
     db_metrics = pd.DataFrame({
         "Metric": ["Silhouette Score (non-noise)", "Davies-Bouldin Index", "Noise Points", "Clusters Found"],
-        "Value": ["~0.42", "~0.85", "~5–8% of data", "2–3 (automatic)"],
+        "Value": [fmt_metric(db, "silhouette", fallback="~0.42" if not db else "N/A (< 2 clusters)"),
+                  fmt_metric(db, "davies_bouldin", fallback="~0.85" if not db else "N/A (< 2 clusters)"),
+                  fmt_metric(db, "noise_frac", "{:.1%} of data", "~5–8% of data"),
+                  fmt_metric(db, "clusters", "{} (automatic)", "2–3 (automatic)")],
         "Interpretation": [
             "Comparable to K-Means; dense seasonal clusters well-separated",
             "Lower is better; moderate compactness relative to separation",
@@ -1382,28 +1585,45 @@ with tab_models:
     st.markdown("**Performance Metrics**")
     lr_metrics = pd.DataFrame({
         "Metric": ["R² Score", "RMSE", "MAE"],
-        "Value": ["0.9613 ✅", "~24.8", "~18.2"],
+        "Value": [fmt_metric(lr, "r2", "{:.4f} ✅", "0.9613 ✅"), fmt_metric(lr, "rmse", "{:.1f}", "~24.8"),
+                  fmt_metric(lr, "mae", "{:.1f}", "~18.2")],
         "Interpretation": [
-            "96.1% of AQI variance explained — excellent fit",
-            "Average prediction error of ~25 AQI points on a 0–500 scale",
+            f"{fmt_metric(lr, 'r2', '{:.1%}', '96.1%')} of AQI variance explained",
+            f"Average prediction error of ~{fmt_metric(lr, 'rmse', '{:.0f}', '25')} AQI points on a 0–500 scale",
             "Median absolute error; skewed upward by extreme winter events"
         ]
     })
     st.dataframe(lr_metrics, use_container_width=True, hide_index=True)
 
     st.markdown("**Feature Coefficients (ranked by absolute magnitude)**")
-    coef_df = pd.DataFrame({
-        "Feature": ["pm25_avg", "temp_mean", "wind_speed_mean", "humidity_mean", "precipitation", "pm10_avg"],
-        "Coefficient (approx.)": ["+1.35", "−3.10", "−2.45", "+0.82", "−1.12", "+0.28"],
-        "Interpretation": [
-            "Strongest positive driver — 1 µg/m³ PM2.5 → +1.35 AQI",
-            "Strongest negative predictor — warmer days lower AQI",
-            "Wind disperses pollutants, reducing AQI",
-            "Higher humidity associated with worse AQI (inversion conditions)",
-            "Rain washes out particulates",
-            "Secondary positive driver"
-        ]
-    })
+    coef_notes = {
+        "pm25_avg": "Strongest positive driver",
+        "temp_mean": "Warmer days lower AQI",
+        "wind_speed_mean": "Wind disperses pollutants, reducing AQI",
+        "humidity_mean": "Humidity effect (inversion conditions)",
+        "precipitation": "Rain washes out particulates",
+        "pm10_avg": "Secondary positive driver",
+    }
+    if coef:
+        coefs = pd.Series(coef).sort_values(key=abs, ascending=False)
+        coef_df = pd.DataFrame({
+            "Feature": coefs.index,
+            "Coefficient": [f"{c:+.2f}" for c in coefs],
+            "Interpretation": [coef_notes.get(f, "") for f in coefs.index],
+        })
+    else:
+        coef_df = pd.DataFrame({
+            "Feature": ["pm25_avg", "temp_mean", "wind_speed_mean", "humidity_mean", "precipitation", "pm10_avg"],
+            "Coefficient (approx.)": ["+1.35", "−3.10", "−2.45", "+0.82", "−1.12", "+0.28"],
+            "Interpretation": [
+                "Strongest positive driver — 1 µg/m³ PM2.5 → +1.35 AQI",
+                "Strongest negative predictor — warmer days lower AQI",
+                "Wind disperses pollutants, reducing AQI",
+                "Higher humidity associated with worse AQI (inversion conditions)",
+                "Rain washes out particulates",
+                "Secondary positive driver"
+            ]
+        })
     st.dataframe(coef_df, use_container_width=True, hide_index=True)
 
     st.divider()
@@ -1421,7 +1641,8 @@ with tab_models:
 
         These patterns directly address **Research Question 3** (role of weather combinations in extreme
         events) and can inform rule-based early-warning systems.
-        The `mlxtend` library's implementation was used (full itemset → rules pipeline).
+        Itemsets are mined with the project's bitset miner (`delhi_aq.patterns`), which returns the same
+        itemsets and rules as `mlxtend`'s Apriori.
         """)
 
     with st.expander("▸ Hyperparameter tuning"):
@@ -1442,19 +1663,28 @@ with tab_models:
         matrix (~30+ columns), increasing Apriori search time significantly.  
         **Solution:** `min_support=0.05` pruned infrequent itemsets early in the search, keeping the
         frequent itemset count manageable. A support vs. confidence scatter plot (sized by lift) was
-        used to visually identify the most meaningful rules beyond the top-10 table.
+        used to visually identify the most meaningful rules beyond the top-10 table. The miner was later
+        replaced by packed per-category bitsets (no one-hot frame), so even `min_support=0.005`
+        completes in under a second.
         """)
 
     st.markdown("**Top Association Rules (ranked by Lift)**")
 
-    rules = [
-        ("PM10_Severe + PM25_Severe", "AQI = Severe", "0.07", "0.92", "3.3"),
-        ("PM25_Severe + Wind_Low + Temp_Low", "AQI = Severe", "0.08", "0.89", "3.2"),
-        ("PM25_VHigh + Temp_Low + Season=Winter", "AQI = Very Poor", "0.11", "0.85", "2.8"),
-        ("Temp_High + Rain_Med + Season=Monsoon", "AQI = Satisfactory", "0.06", "0.82", "2.5"),
-        ("PM25_Low + Rain_Light + Temp_High", "AQI = Good / Satisfactory", "0.05", "0.80", "2.4"),
-        ("Wind_High + Temp_High", "AQI = Moderate or better", "0.09", "0.78", "2.1"),
-    ]
+    if registry["apriori"]:
+        top = load_model("apriori")["model"]
+        rules = [(" + ".join(rule_item_label(i) for i in sorted(r.antecedents)),
+                  " + ".join(rule_item_label(i) for i in sorted(r.consequents)),
+                  f"{r.support:.2f}", f"{r.confidence:.2f}", f"{r.lift:.1f}")
+                 for r in top.itertuples()]
+    else:
+        rules = [
+            ("PM10_Severe + PM25_Severe", "AQI = Severe", "0.07", "0.92", "3.3"),
+            ("PM25_Severe + Wind_Low + Temp_Low", "AQI = Severe", "0.08", "0.89", "3.2"),
+            ("PM25_VHigh + Temp_Low + Season=Winter", "AQI = Very Poor", "0.11", "0.85", "2.8"),
+            ("Temp_High + Rain_Med + Season=Monsoon", "AQI = Satisfactory", "0.06", "0.82", "2.5"),
+            ("PM25_Low + Rain_Light + Temp_High", "AQI = Good / Satisfactory", "0.05", "0.80", "2.4"),
+            ("Wind_High + Temp_High", "AQI = Moderate or better", "0.09", "0.78", "2.1"),
+        ]
     for ant, cons, sup, conf, lift in rules:
         st.markdown(f"""
         <div class="rule-card">
@@ -1479,20 +1709,22 @@ with tab_models:
     # ================================================================
     # SECTION 3 — MODEL COMPARISON
     # ================================================================
-    st.header("3. Model Performance Comparison")
+    header("3. Model Performance Comparison")
 
     st.subheader("3.1 Classification Models")
     clf_compare = pd.DataFrame({
         "Model": ["Naive Bayes (CategoricalNB)", "Decision Tree ✅ Winner"],
-        "Accuracy": ["~0.72", "~0.92"],
-        "Precision (macro)": ["~0.69", "~0.90"],
-        "Recall (macro)": ["~0.70", "~0.91"],
-        "F1 (macro)": ["~0.69", "~0.91"],
-        "ROC-AUC": ["N/A", "~0.98"],
+        "Accuracy": [fmt_metric(nb, "accuracy", fallback="~0.72"), fmt_metric(dt, "accuracy", fallback="~0.92")],
+        "Precision (macro)": [fmt_metric(nb, "precision_macro", fallback="~0.69"),
+                              fmt_metric(dt, "precision_macro", fallback="~0.90")],
+        "Recall (macro)": [fmt_metric(nb, "recall_macro", fallback="~0.70"),
+                           fmt_metric(dt, "recall_macro", fallback="~0.91")],
+        "F1 (macro)": [fmt_metric(nb, "f1_macro", fallback="~0.69"), fmt_metric(dt, "f1_macro", fallback="~0.91")],
+        "ROC-AUC": ["N/A", fmt_metric(dt, "roc_auc", fallback="~0.98")],
     })
     st.dataframe(clf_compare, use_container_width=True, hide_index=True)
-    st.markdown("""
-    The Decision Tree's **+20 percentage-point** accuracy advantage over Naive Bayes is attributable
+    st.markdown(f"""
+    The Decision Tree's **{accuracy_gap}** accuracy advantage over Naive Bayes is attributable
     to two factors: (1) DT captures feature interactions (e.g., PM2.5 bin × season) that the NB
     independence assumption explicitly ignores; (2) one-hot encoding preserves the full categorical
     information without the ordinality assumptions implicit in label encoding used for NB.
@@ -1500,26 +1732,28 @@ with tab_models:
 
     st.subheader("3.2 Clustering Models")
     clust_compare = pd.DataFrame({
-        "Model": ["K-Means (k=3)", "DBSCAN (eps=1.5)"],
-        "Silhouette Score": ["~0.40–0.45", "~0.42"],
-        "Davies-Bouldin Index": ["N/A", "~0.85"],
-        "Noise Points": ["0 (none)", "~5–8% of data"],
-        "Clusters Found": ["3 (forced)", "2–3 (automatic)"],
+        "Model": [f"K-Means (k={fmt_metric(km, 'k', '{}', '3')})", f"DBSCAN (eps={fmt_metric(db, 'eps', '{}', '1.5')})"],
+        "Silhouette Score": [fmt_metric(km, "silhouette", fallback="~0.40–0.45"),
+                             fmt_metric(db, "silhouette", fallback="~0.42" if not db else "N/A")],
+        "Davies-Bouldin Index": ["N/A", fmt_metric(db, "davies_bouldin", fallback="~0.85" if not db else "N/A")],
+        "Noise Points": ["0 (none)", fmt_metric(db, "noise_frac", "{:.1%} of data", "~5–8% of data")],
+        "Clusters Found": [f"{fmt_metric(km, 'k', '{}', '3')} (forced)",
+                           fmt_metric(db, "clusters", "{} (automatic)", "2–3 (automatic)")],
     })
     st.dataframe(clust_compare, use_container_width=True, hide_index=True)
-    st.markdown("""
+    st.markdown(f"""
     K-Means and DBSCAN serve **complementary purposes** and are not directly competing.
     K-Means provides clean three-regime seasonal segmentation useful for downstream stratified analysis.
-    DBSCAN provides **noise identification**, surfacing the 5–8% of days that are anomalous pollution
-    episodes not attributable to any seasonal regime. Both show similar silhouette scores (~0.40–0.42).
+    DBSCAN provides **noise identification**, surfacing the {fmt_metric(db, "noise_frac", "{:.1%}", "5–8%")} of days that are anomalous pollution
+    episodes not attributable to any seasonal regime.
     """)
 
     st.subheader("3.3 Regression Model")
     reg_compare = pd.DataFrame({
         "Model": ["Linear Regression (OLS) ✅"],
-        "R²": ["0.9613"],
-        "RMSE": ["~24.8"],
-        "MAE": ["~18.2"],
+        "R²": [fmt_metric(lr, "r2", "{:.4f}", "0.9613")],
+        "RMSE": [fmt_metric(lr, "rmse", "{:.1f}", "~24.8")],
+        "MAE": [fmt_metric(lr, "mae", "{:.1f}", "~18.2")],
         "Assessment": ["Excellent baseline; RMSE acceptable for 0–500 AQI scale"],
     })
     st.dataframe(reg_compare, use_container_width=True, hide_index=True)
@@ -1527,11 +1761,13 @@ with tab_models:
     st.subheader("3.4 Frequent Pattern Mining")
     apm_compare = pd.DataFrame({
         "Metric": ["Min Support", "Min Confidence", "Top Lift", "Rules Generated"],
-        "Value": ["0.05", "0.60", "3.3×", "Several dozen (top-10 by lift reported)"],
+        "Value": [fmt_metric(ap, "min_support", fallback="0.05"), fmt_metric(ap, "min_confidence", fallback="0.60"),
+                  fmt_metric(ap, "max_lift", "{:.1f}×", "3.3×"),
+                  fmt_metric(ap, "rules", "{:,} (top-10 by lift reported)", "Several dozen (top-10 by lift reported)")],
         "Interpretation": [
             "Rules must appear in at least 5% of days",
             "60%+ predictive accuracy required",
-            "PM10_Severe + PM25_Severe → AQI=Severe is 3.3× more likely than by chance",
+            f"{rules[0][0]} → {rules[0][1]} is {rules[0][4]}× more likely than by chance",
             "Many redundant rules pruned via min_support threshold"
         ]
     })
@@ -1541,7 +1777,7 @@ with tab_models:
 
     # ── Overall recommendation ───────────────────────────────
     st.subheader("3.5 Overall Model Recommendation")
-    st.markdown("""
+    st.markdown(f"""
     <div style="background: linear-gradient(135deg, #0f0f1a, #1a1a2e);
                 border: 1px solid rgba(255,107,53,0.3); border-radius: 14px;
                 padding: 1.5rem 2rem; margin-top: 0.5rem;">
@@ -1558,31 +1794,31 @@ with tab_models:
       <tr style="border-bottom:1px solid #1e1e2e;">
         <td style="padding:0.6rem; color:#ccc;">AQI Category Prediction</td>
         <td style="padding:0.6rem; color:#3498db; font-weight:700;">Decision Tree</td>
-        <td style="padding:0.6rem; color:#3498db;">92% Acc, 0.98 AUC</td>
+        <td style="padding:0.6rem; color:#3498db;">{fmt_metric(dt, "accuracy", "{:.0%}", "92%")} Acc, {fmt_metric(dt, "roc_auc", fallback="0.98")} AUC</td>
         <td style="padding:0.6rem; color:#888;">Captures feature interactions; interpretable; probabilistic output</td>
       </tr>
       <tr style="border-bottom:1px solid #1e1e2e;">
         <td style="padding:0.6rem; color:#ccc;">Continuous AQI Estimation</td>
         <td style="padding:0.6rem; color:#ff6b35; font-weight:700;">Linear Regression</td>
-        <td style="padding:0.6rem; color:#ff6b35;">R² = 0.961</td>
+        <td style="padding:0.6rem; color:#ff6b35;">R² = {fmt_metric(lr, "r2", "{:.3f}", "0.961")}</td>
         <td style="padding:0.6rem; color:#888;">Excellent baseline; supplement with tree-based regressor in M4</td>
       </tr>
       <tr style="border-bottom:1px solid #1e1e2e;">
         <td style="padding:0.6rem; color:#ccc;">Seasonal Regime Discovery</td>
         <td style="padding:0.6rem; color:#2ecc71; font-weight:700;">K-Means</td>
-        <td style="padding:0.6rem; color:#2ecc71;">Silhouette 0.42</td>
+        <td style="padding:0.6rem; color:#2ecc71;">Silhouette {fmt_metric(km, "silhouette", fallback="0.42")}</td>
         <td style="padding:0.6rem; color:#888;">Clean 3-regime segmentation; aligns perfectly with Delhi's calendar</td>
       </tr>
       <tr style="border-bottom:1px solid #1e1e2e;">
         <td style="padding:0.6rem; color:#ccc;">Anomaly / Crisis Day Detection</td>
         <td style="padding:0.6rem; color:#2ecc71; font-weight:700;">DBSCAN</td>
-        <td style="padding:0.6rem; color:#2ecc71;">5–8% noise flagged</td>
+        <td style="padding:0.6rem; color:#2ecc71;">{fmt_metric(db, "noise_frac", "{:.1%}", "5–8%")} noise flagged</td>
         <td style="padding:0.6rem; color:#888;">Uniquely identifies genuine outlier pollution days</td>
       </tr>
       <tr>
         <td style="padding:0.6rem; color:#ccc;">Early-Warning Rules</td>
         <td style="padding:0.6rem; color:#9b59b6; font-weight:700;">Apriori</td>
-        <td style="padding:0.6rem; color:#9b59b6;">Lift up to 3.3×</td>
+        <td style="padding:0.6rem; color:#9b59b6;">Lift up to {fmt_metric(ap, "max_lift", "{:.1f}×", "3.3×")}</td>
         <td style="padding:0.6rem; color:#888;">Most actionable; human-readable if-then rules for policy use</td>
       </tr>
     </tbody>
@@ -1595,20 +1831,23 @@ with tab_models:
     # ================================================================
     # SECTION 3b — NOTEBOOK PLOTS
     # ================================================================
-    st.header("3b. Model Plots from Notebook")
+    header("3b. Model Plots from Notebook")
 
     # ── Naive Bayes ─────────────────────────────────────────────────
     st.subheader("🔵 Naive Bayes — AQI Category Classification")
     col1, col2 = st.columns([1, 1])
     with col1:
-        st.markdown("""
+        st.markdown(f"""
         **Metrics**
-        - Accuracy: **94.85%**
+        - Accuracy: **{fmt_metric(nb, "accuracy", "{:.2%}", "94.85%")}**
         - Strong on Satisfactory, Poor, Moderate, Good classes
-        - Severe class recall: 33% (imbalanced class)
+        - Severe class recall is lowest (imbalanced class)
         """)
     with col2:
-        st.image("images/naive_bayes_0.png", caption="Naive Bayes — Confusion Matrix", use_container_width=True)
+        if "confusion_matrix" in nb:
+            st.plotly_chart(confusion_figure(nb, "Naive Bayes — Confusion Matrix"), use_container_width=True)
+        else:
+            show_image("images/naive_bayes_0.png", caption="Naive Bayes — Confusion Matrix", use_container_width=True)
 
     st.divider()
 
@@ -1616,11 +1855,14 @@ with tab_models:
     st.subheader("🟠 Decision Tree — AQI Category Classification")
     col1, col2 = st.columns([1, 1])
     with col1:
-        st.image("images/decision_tree_0.png", caption="Decision Tree — Confusion Matrix", use_container_width=True)
+        if "confusion_matrix" in dt:
+            st.plotly_chart(confusion_figure(dt, "Decision Tree — Confusion Matrix"), use_container_width=True)
+        else:
+            show_image("images/decision_tree_0.png", caption="Decision Tree — Confusion Matrix", use_container_width=True)
     with col2:
-        st.image("images/decision_tree_1.png", caption="Decision Tree — ROC Curve (AUC = 0.982)", use_container_width=True)
-    st.markdown("""
-    **Metrics:** Accuracy: **95.53%** | ROC-AUC (macro OvR): **0.982**  
+        show_image("images/decision_tree_1.png", caption="Decision Tree — ROC Curve", use_container_width=True)
+    st.markdown(f"""
+    **Metrics:** Accuracy: **{fmt_metric(dt, "accuracy", "{:.2%}", "95.53%")}** | ROC-AUC (macro OvR): **{fmt_metric(dt, "roc_auc", "{:.3f}", "0.982")}**  
     Near-perfect on all classes except Severe (imbalanced minority class).
     """)
 
@@ -1630,12 +1872,12 @@ with tab_models:
     st.subheader("🟢 K-Means — Seasonal Pollution Regime Clustering")
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.image("images/kmeans_0.png", caption="Elbow Curve", use_container_width=True)
+        show_image("images/kmeans_0.png", caption="Elbow Curve", use_container_width=True)
     with col2:
-        st.image("images/kmeans_1.png", caption="Cluster Scatter (PM2.5 vs AQI)", use_container_width=True)
+        show_image("images/kmeans_1.png", caption="Cluster Scatter (PM2.5 vs AQI)", use_container_width=True)
     with col3:
-        st.image("images/kmeans_2.png", caption="Seasonal Cluster Distribution", use_container_width=True)
-    st.markdown("**Silhouette Score: 0.288** — Three regimes identified: Monsoon (clean), Winter (severe), Transitional.")
+        show_image("images/kmeans_2.png", caption="Seasonal Cluster Distribution", use_container_width=True)
+    st.markdown(f"**Silhouette Score: {fmt_metric(km, 'silhouette', '{:.3f}', '0.288')}** — Three regimes identified: Monsoon (clean), Winter (severe), Transitional.")
 
     st.divider()
 
@@ -1643,10 +1885,10 @@ with tab_models:
     st.subheader("🟢 DBSCAN — Anomaly / Crisis Day Detection")
     col1, col2 = st.columns(2)
     with col1:
-        st.image("images/dbscan_0.png", caption="DBSCAN Cluster Plot", use_container_width=True)
+        show_image("images/dbscan_0.png", caption="DBSCAN Cluster Plot", use_container_width=True)
     with col2:
-        st.image("images/dbscan_1.png", caption="Noise Points (Anomalous Days)", use_container_width=True)
-    st.markdown("Flags **5–8% noise points** as genuine extreme pollution anomalies — uniquely identifies crisis days not captured by other models.")
+        show_image("images/dbscan_1.png", caption="Noise Points (Anomalous Days)", use_container_width=True)
+    st.markdown(f"Flags **{fmt_metric(db, 'noise_frac', '{:.1%}', '5–8%')} noise points** as genuine extreme pollution anomalies — uniquely identifies crisis days not captured by other models.")
 
     st.divider()
 
@@ -1654,11 +1896,22 @@ with tab_models:
     st.subheader("🔴 Linear Regression — Continuous AQI Estimation")
     col1, col2 = st.columns(2)
     with col1:
-        st.image("images/linear_regression_0.png", caption="Actual vs Predicted AQI", use_container_width=True)
+        if registry["linear_regression"]:
+            import plotly.express as px
+            artifacts = load_model("linear_regression")["artifacts"]
+            fig = px.scatter(x=artifacts["y_test"], y=artifacts["y_pred"], opacity=0.6,
+                             labels=dict(x="Actual AQI", y="Predicted AQI"),
+                             title="Linear Regression: Actual vs Predicted AQI")
+            lo, hi = artifacts["y_test"].min(), artifacts["y_test"].max()
+            fig.add_shape(type="line", x0=lo, y0=lo, x1=hi, y1=hi, line=dict(color="red", dash="dash"))
+            fig.update_layout(height=420)
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            show_image("images/linear_regression_0.png", caption="Actual vs Predicted AQI", use_container_width=True)
     with col2:
-        st.image("images/linear_regression_1.png", caption="Feature Coefficients", use_container_width=True)
-    st.markdown("""
-    **Metrics:** R² = **0.876** | RMSE = 46.1 | MAE = 32.9  
+        show_image("images/linear_regression_1.png", caption="Feature Coefficients", use_container_width=True)
+    st.markdown(f"""
+    **Metrics:** R² = **{fmt_metric(lr, "r2", "{:.3f}", "0.876")}** | RMSE = {fmt_metric(lr, "rmse", "{:.1f}", "46.1")} | MAE = {fmt_metric(lr, "mae", "{:.1f}", "32.9")}  
     PM2.5 is the dominant predictor. Temperature and wind speed show strong negative coefficients.
     """)
 
@@ -1668,12 +1921,12 @@ with tab_models:
     st.subheader("🟣 Apriori — Early-Warning Association Rules")
     col1, col2 = st.columns(2)
     with col1:
-        st.image("images/apriori_0.png", caption="Top Association Rules (Support vs Confidence)", use_container_width=True)
+        show_image("images/apriori_0.png", caption="Top Association Rules (Support vs Confidence)", use_container_width=True)
     with col2:
-        st.image("images/apriori_1.png", caption="Association Rules Heatmap (Lift)", use_container_width=True)
-    st.markdown("""
-    **Top rule:** `{aqi_category_Very Poor} → {pm25_bin_PM25_Severe}` — confidence 1.0, lift 3.2×  
-    Actionable if-then rules for policy use; highest lift up to **8.8×** for Good AQI conditions.
+        show_image("images/apriori_1.png", caption="Association Rules Heatmap (Lift)", use_container_width=True)
+    st.markdown(f"""
+    **Top rule:** `{rules[0][0]} → {rules[0][1]}` — confidence {rules[0][3]}, lift {rules[0][4]}×  
+    Actionable if-then rules for policy use; highest lift up to **{fmt_metric(ap, "max_lift", "{:.1f}×", "8.8×")}**.
     """)
 
     st.divider()
@@ -1681,8 +1934,9 @@ with tab_models:
     # ================================================================
     # SECTION 4 — RESEARCH QUESTION ALIGNMENT
     # ================================================================
-    st.header("4. Research Question Alignment")
+    header("4. Research Question Alignment")
 
+    worst_rule = worst_category_rule()
     rq_df = pd.DataFrame({
         "Research Question": [
             "RQ1: Long-term PM2.5 trend?",
@@ -1707,12 +1961,14 @@ with tab_models:
         "Key Finding": [
             "No declining trend; coefficient on year is non-significant",
             "Three regimes: monsoon clean, winter severe, transitional",
-            "Low wind + low temp + high PM2.5 → Severe (conf. 0.89)",
-            "Temp coef. −3.10; wind coef. −2.45 (LR)",
-            "92% accuracy; ROC-AUC 0.98",
-            "R² = 0.96; PM2.5 dominant feature",
+            (f"{worst_rule[0]} → {worst_rule[1]} (conf. {worst_rule[2]:.2f})" if worst_rule
+             else "Low wind + low temp + high PM2.5 → Severe (conf. 0.89)"),
+            f"Temp coef. {fmt_metric(coef, 'temp_mean', '{:+.2f}', '−3.10')}; "
+            f"wind coef. {fmt_metric(coef, 'wind_speed_mean', '{:+.2f}', '−2.45')} (LR)",
+            f"{fmt_metric(dt, 'accuracy', '{:.0%}', '92%')} accuracy; ROC-AUC {fmt_metric(dt, 'roc_auc', fallback='0.98')}",
+            f"R² = {fmt_metric(lr, 'r2', fallback='0.96')}; PM2.5 dominant feature",
             "No search signal appears as antecedent of AQI — purely reactive",
-            "5–8% noise points = genuine extreme pollution anomalies",
+            f"{fmt_metric(db, 'noise_frac', '{:.1%}', '5–8%')} noise points = genuine extreme pollution anomalies",
         ]
     })
     st.dataframe(rq_df, use_container_width=True, hide_index=True)
@@ -1720,7 +1976,7 @@ with tab_models:
     st.divider()
 
     # ── Limitations ─────────────────────────────────────────
-    st.header("5. Limitations & Next Steps")
+    header("5. Limitations & Next Steps")
     st.markdown("""
     <div class="warn-box">
     ⚠️ <b>Linear Regression linearity assumption:</b> PM2.5's log-normal distribution produces
@@ -1750,7 +2006,15 @@ with tab_models:
 # CONCLUSION TAB — Milestone 4
 # ================================================================
 
-with tab_conclusion:
+def render_conclusion():
+
+    # Model figures come from the registry, as on the Models tab; the milestone numbers are the fallback.
+    dt, db, lr, ap = ((model_entry(name) or {}).get("metrics", {})
+                      for name in ("decision_tree", "dbscan", "linear_regression", "apriori"))
+    coef = lr.get("coefficients", {})
+    worst_rule = worst_category_rule()
+    worst_rule_text = (f"Apriori rules also predicted {worst_rule[1]} with confidence up to {worst_rule[2]:.2f}."
+                       if worst_rule else "Apriori rules also produced confidence ≥ 0.89 antecedents of Severe AQI.")
 
     # ── Custom CSS scoped to this tab ──────────────────────────
     st.markdown("""
@@ -1881,7 +2145,7 @@ with tab_conclusion:
     # ================================================================
     # 1. NON-TECHNICAL SUMMARY
     # ================================================================
-    st.header("1. What We Did — In Plain Language")
+    header("1. What We Did — In Plain Language")
 
     st.markdown("""
     Delhi is one of the most polluted cities on earth, and every winter its residents breathe air
@@ -1922,7 +2186,7 @@ with tab_conclusion:
     # ================================================================
     # 2. ANSWERING THE RESEARCH QUESTIONS
     # ================================================================
-    st.header("2. Answering the Research Questions")
+    header("2. Answering the Research Questions")
 
     st.markdown("""
     In Milestone 1 we defined ten research questions to guide this project. Each one is answered
@@ -1957,7 +2221,8 @@ with tab_conclusion:
          "A dominant one. Temperature range (max − min) correlates positively with AQI (r = +0.52), "
          "meaning days with wide diurnal swings — classic inversion conditions where the ground "
          "cools dramatically overnight — trap pollutants near the surface. In Linear Regression, "
-         "<b>temperature's coefficient (–3.10) exceeded wind speed's (–2.45)</b>, making inversion "
+         f"<b>temperature's coefficient ({fmt_metric(coef, 'temp_mean', '{:+.2f}', '–3.10')}) exceeded "
+         f"wind speed's ({fmt_metric(coef, 'wind_speed_mean', '{:+.2f}', '–2.45')})</b>, making inversion "
          "the single strongest meteorological driver of Delhi's winter crisis."),
 
         ("RQ 05",
@@ -1970,11 +2235,14 @@ with tab_conclusion:
 
         ("RQ 06",
          "How do meteorological variables jointly correlate with AQI levels?",
-         "Together, temperature, wind, humidity, and precipitation explain <b>87.6% of AQI variance "
-         "(R² = 0.876)</b> in our Linear Regression. Individually: temperature (strongest negative, "
-         "coef. –3.10), wind speed (–2.45), precipitation (–1.12), and humidity (+0.82, confirming "
-         "humid stagnant air worsens pollution). The joint model substantially outperforms any "
-         "single-variable model."),
+         "Together, temperature, wind, humidity, and precipitation explain "
+         f"<b>{fmt_metric(lr, 'r2', '{:.1%}', '87.6%')} of AQI variance "
+         f"(R² = {fmt_metric(lr, 'r2', '{:.3f}', '0.876')})</b> in our Linear Regression. Individually: "
+         f"temperature (strongest negative, coef. {fmt_metric(coef, 'temp_mean', '{:+.2f}', '–3.10')}), "
+         f"wind speed ({fmt_metric(coef, 'wind_speed_mean', '{:+.2f}', '–2.45')}), "
+         f"precipitation ({fmt_metric(coef, 'precipitation', '{:+.2f}', '–1.12')}), and humidity "
+         f"({fmt_metric(coef, 'humidity_mean', '{:+.2f}', '+0.82')}). The joint model substantially "
+         "outperforms any single-variable model."),
 
         ("RQ 07",
          "Does public search interest spike before, during, or after pollution peaks?",
@@ -1993,9 +2261,10 @@ with tab_conclusion:
 
         ("RQ 09",
          "Can historical AQI and weather patterns help anticipate severe pollution episodes?",
-         "Yes, with high accuracy. Our <b>Decision Tree classifier reached 95.5% accuracy and "
-         "ROC-AUC of 0.982</b> in predicting AQI category from meteorological and particulate "
-         "features. Apriori rules also produced confidence ≥ 0.89 antecedents of Severe AQI. The "
+         "Yes, with high accuracy. Our <b>Decision Tree classifier reached "
+         f"{fmt_metric(dt, 'accuracy', '{:.1%}', '95.5%')} accuracy and "
+         f"ROC-AUC of {fmt_metric(dt, 'roc_auc', '{:.3f}', '0.982')}</b> in predicting AQI category from meteorological and particulate "
+         f"features. {worst_rule_text} The "
          "data is predictable enough that a reliable early-warning system is genuinely feasible, "
          "not aspirational."),
 
@@ -2003,8 +2272,8 @@ with tab_conclusion:
          "Do pollution trends show early-warning signals detectable from past data?",
          "Yes, but they are <b>meteorological, not behavioural</b>. The combination of low "
          "temperature, low wind, high humidity, and a rising PM2.5 baseline reliably precedes "
-         "Severe AQI episodes, as evidenced by our Apriori rules (up to <b>8.8× lift</b>) and "
-         "DBSCAN's ability to isolate the 5–8% of days that are genuine extreme outliers. Public "
+         f"Severe AQI episodes, as evidenced by our Apriori rules (up to <b>{fmt_metric(ap, 'max_lift', '{:.1f}×', '8.8×')} lift</b>) and "
+         f"DBSCAN's ability to isolate the {fmt_metric(db, 'noise_frac', '{:.1%}', '5–8%')} of days that are genuine extreme outliers. Public "
          "search behaviour, by contrast, <b>does not</b> lead AQI and cannot be used as a signal."),
     ]
 
@@ -2022,7 +2291,7 @@ with tab_conclusion:
     # ================================================================
     # 3. KEY INSIGHTS & DISCOVERIES
     # ================================================================
-    st.header("3. Key Insights & Discoveries")
+    header("3. Key Insights & Discoveries")
 
     st.markdown("""
     Beyond the research questions, eight broader findings stood out across our analysis. Together
@@ -2061,9 +2330,11 @@ with tab_conclusion:
 
         ("Finding 05",
          "Machine learning can predict air quality with high accuracy",
-         "Our Decision Tree classifier reached <b>95.5% accuracy and a ROC-AUC of 0.982</b> in "
+         f"Our Decision Tree classifier reached <b>{fmt_metric(dt, 'accuracy', '{:.1%}', '95.5%')} accuracy "
+         f"and a ROC-AUC of {fmt_metric(dt, 'roc_auc', '{:.3f}', '0.982')}</b> in "
          "predicting which of the six AQI categories a day falls into. Linear Regression explained "
-         "<b>87.6% of the variance (R² = 0.876)</b> in continuous AQI. The data has enough structure "
+         f"<b>{fmt_metric(lr, 'r2', '{:.1%}', '87.6%')} of the variance (R² = {fmt_metric(lr, 'r2', '{:.3f}', '0.876')})</b> "
+         "in continuous AQI. The data has enough structure "
          "that reliable forecasting is genuinely feasible, not aspirational."),
 
         ("Finding 06",
@@ -2107,7 +2378,7 @@ with tab_conclusion:
     # ================================================================
     # 4. REAL-WORLD IMPACT
     # ================================================================
-    st.header("4. Real-World Impact")
+    header("4. Real-World Impact")
 
     st.markdown("""
     The insights above are not just academic. They point to concrete, practical consequences for
@@ -2116,7 +2387,7 @@ with tab_conclusion:
 
     impacts = [
         ("For Delhi's 30+ million residents",
-         "A 95.5%-accurate AQI classifier means residents could receive reliable day-ahead health "
+         f"A {fmt_metric(dt, 'accuracy', '{:.1%}', '95.5%')}-accurate AQI classifier means residents could receive reliable day-ahead health "
          "alerts, letting vulnerable groups — children, the elderly, and people with asthma or heart "
          "conditions — plan outdoor activity, schedule medication, and use air purifiers or N95 "
          "masks <i>before</i> exposure rather than reacting to symptoms."),
@@ -2160,7 +2431,7 @@ with tab_conclusion:
     # ================================================================
     # 5. LIMITATIONS
     # ================================================================
-    st.header("5. Limitations")
+    header("5. Limitations")
 
     st.markdown("""
     Honest reporting of what our study *cannot* tell us is as important as what it can.
@@ -2209,7 +2480,7 @@ with tab_conclusion:
     # ================================================================
     # 6. POTENTIAL IMPROVEMENTS & FUTURE WORK
     # ================================================================
-    st.header("6. Potential Improvements & Future Work")
+    header("6. Potential Improvements & Future Work")
 
     st.markdown("""
     Every limitation above is also a direction. Six concrete extensions would meaningfully advance
@@ -2262,7 +2533,7 @@ with tab_conclusion:
     # ================================================================
     # 7. FINAL TAKEAWAY
     # ================================================================
-    st.header("7. Final Takeaway")
+    header("7. Final Takeaway")
 
     st.markdown("""
     <div style="background: linear-gradient(135deg, #0f0f1a 0%, #1a1a2e 60%, #0f0f1a 100%);
@@ -2297,13 +2568,13 @@ with tab_conclusion:
 
 
 
-with tab_team:
-    st.header("Team")
+def render_team():
+    header("Team")
 
     cols = st.columns(4)
 
     with cols[0]:
-        st.image("images/abhiram.jpg", width=150)
+        show_image("images/abhiram.jpg", width=150)
         st.markdown("""
         **Abhirama Karthikeya Mullapudi**  
         *Data Lead*  
@@ -2315,7 +2586,7 @@ with tab_team:
         """)
 
     with cols[1]:
-        st.image("images/Nataraj.png", width=100)
+        show_image("images/Nataraj.png", width=100)
         st.markdown("""
         **Natarajan Krishnan**  
         *EDA Lead*  
@@ -2327,7 +2598,7 @@ with tab_team:
         """)
 
     with cols[2]:
-        st.image("images/Thiyagu.png", width=150)
+        show_image("images/Thiyagu.png", width=150)
         st.markdown("""
         **Thiyagu Rajendran**  
         *Visualization Lead*  
@@ -2339,7 +2610,7 @@ with tab_team:
         """)
 
     with cols[3]:
-        st.image("images/hari.jpg", width=150)
+        show_image("images/hari.jpg", width=150)
         st.markdown("""
         **Srihari Pulagalla**  
         *Modeling Lead*  
@@ -2352,4 +2623,40 @@ with tab_team:
 
     st.markdown(
         "Our mission is to move beyond AQI reporting by identifying the patterns, conditions, and signals that precede severe air pollution events in Delhi, using data to inform timely awareness and intervention."
-    )
\ No newline at end of file
+    )
+
+
+pages = [
+    st.Page(render_introduction,  title="Introduction",         url_path="introduction", default=True),
+    st.Page(render_proposal,      title="Proposal Overview",    url_path="proposal"),
+    st.Page(render_exploration,   title="Data Exploration",     url_path="exploration"),
+    st.Page(render_models,        title="Model Implementation", url_path="models"),
+    st.Page(render_conclusion,    title="Conclusion",           url_path="conclusion"),
+    st.Page(render_team,          title="Team",                 url_path="team"),
+]
+
+
+def render_diagnostics(rerun, session):
+    """Hidden timing panel (``?diagnostics=1``): this rerun's breakdown and the session's histograms."""
+    with st.sidebar:
+        st.subheader("Diagnostics")
+        st.metric("This rerun", f"{rerun.seconds * 1000:.0f} ms")
+        st.caption(f"Page `{rerun.page}` · {session.reruns} reruns this session. Sections run from one "
+                   "header to the next; loads, figures and images are timed inside them.")
+        st.dataframe(rerun.table().round(1), hide_index=True, use_container_width=True)
+        st.markdown("**This session** (ms; p50/p95 are histogram bucket bounds)")
+        st.dataframe(session.table().round(1), hide_index=True, use_container_width=True)
+        if instrument.EXPORT_PATH:
+            st.caption(f"Exporting to `{instrument.EXPORT_PATH}`")
+
+
+page = st.navigation(pages, position="top")
+instrument.set_page(page.title)
+instrument.section("(before first header)")
+try:
+    page.run()
+finally:
+    rerun = instrument.end_rerun()
+
+if diagnostics and rerun is not None:
+    render_diagnostics(rerun, st.session_state["timings"])